@@ -0,0 +1,263 @@
+"""
+Análisis fuera de línea de partidos grabados (recorder.py).
+
+Todo se calcula con NumPy vectorizado sobre las columnas completas de cada partido, y los
+partidos se reparten entre procesos:
+
+    - mapa de calor del puck (solo con el juego en RUNNING)
+    - distribución de velocidades de tiro (velocidad relativa en el contacto con el jugador,
+      y conteo por las bandas de elasticidad de on_player_puck_collision)
+    - posesión por mitad del partido (último jugador que tocó el puck) y territorio
+    - rebotes por región del muro (lados rectos contra arcos de las esquinas)
+    - ángulo de entrada del puck a la portería
+
+Uso (desde src/):
+    python analytics.py                               # todos los partidos de ../recordings
+    python analytics.py ../recordings/mesa1 --workers 4
+    python analytics.py --save stats.json --heatmap calor.png
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from recorder import EV_GOAL, EV_PLAYER, EV_WALL, Recording
+
+log = logging.getLogger(__name__)
+
+RUNNING = 0                     # GameState.RUNNING (sin importar pygame en los procesos)
+HEAT_BINS = (64, 32)            # celdas del mapa de calor (x, y) sobre el rect del rink
+SPEED_EDGES = np.arange(0, 2050, 50, dtype=np.float64)       # px/s
+ANGLE_EDGES = np.arange(-90, 100, 10, dtype=np.float64)      # grados respecto a la normal
+ELASTICITY_BANDS = (100, 200)   # cortes de rel_vel en Game.on_player_puck_collision
+SHOT_DELAY = 2                  # frames después del contacto para medir la salida del puck
+
+
+def find_recordings(root):
+    """Directorios de partido (con meta.json) debajo de root, a cualquier profundidad."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if "meta.json" in filenames:
+            found.append(dirpath)
+            dirnames.clear()
+    return sorted(found)
+
+
+def match_stats(path):
+    """Estadísticas de un partido (arrays pequeños, se pueden sumar entre partidos)."""
+    rec = Recording(path)
+    n = len(rec)
+    left, top, width, height = rec.meta["rink"]
+    regions = rec.wall_regions
+    n_players = rec.n_players
+
+    state = np.asarray(rec["state"][:n])
+    puck = np.asarray(rec["puck"][:n], dtype=np.float64)
+    running = state == RUNNING
+    events = np.asarray(rec.events)
+    events = events[events["frame"] < n]
+    kind = events["kind"]
+
+    # --- Mapa de calor ---
+    heat, _, _ = np.histogram2d(puck[running, 0], puck[running, 1], bins=HEAT_BINS,
+                                range=((left, left + width), (top, top + height)))
+
+    # --- Tiros: contactos con jugadores ---
+    contacts = events[kind == EV_PLAYER]
+    rel_vel = contacts["value"].astype(np.float64)
+    after = np.minimum(contacts["frame"].astype(np.int64) + SHOT_DELAY, n - 1)
+    shot_speed = np.hypot(puck[after, 2], puck[after, 3]) if n else np.zeros(0)
+    bands = np.bincount(np.searchsorted(ELASTICITY_BANDS, rel_vel, side="right"),
+                        minlength=len(ELASTICITY_BANDS) + 1)
+    contact_hist = np.histogram(rel_vel, bins=SPEED_EDGES)[0]
+    shot_hist = np.histogram(shot_speed, bins=SPEED_EDGES)[0]
+    touches_by_player = np.bincount(np.clip(contacts["a"], 0, None), minlength=n_players)[:n_players]
+
+    # --- Posesión: último jugador que tocó el puck, propagado hacia adelante ---
+    touch = np.full(n, -1, dtype=np.int16)
+    touch[contacts["frame"]] = contacts["a"]
+    last = np.where(touch >= 0, np.arange(n), 0)
+    np.maximum.accumulate(last, out=last)
+    owner = touch[last]
+    # Mitades por tiempo jugado (frames en RUNNING), no por tiempo de reloj
+    played = np.cumsum(running)
+    half = (played > played[-1] / 2).astype(np.int8) if n else np.zeros(0, np.int8)
+    possession = np.zeros((2, n_players), dtype=np.int64)
+    territory = np.zeros((2, 2), dtype=np.int64)      # [mitad, lado izquierdo/derecho]
+    side = (puck[:, 0] >= left + width / 2).astype(np.int8)
+    for h in (0, 1):
+        in_half = running & (half == h)
+        held = owner[in_half]
+        possession[h] = np.bincount(held[held >= 0], minlength=n_players)[:n_players]
+        territory[h] = np.bincount(side[in_half], minlength=2)
+
+    # --- Rebotes por región del muro ---
+    walls = events[kind == EV_WALL]["a"]
+    per_wall = np.bincount(walls, minlength=len(regions))[:len(regions)]
+    rebounds = {}
+    for name, count in zip(regions, per_wall):
+        rebounds[name] = rebounds.get(name, 0) + int(count)
+    corner = np.array([r.startswith("corner") for r in regions])
+    straight_vs_corner = (int(per_wall[~corner].sum()), int(per_wall[corner].sum()))
+
+    # --- Ángulo de entrada a la portería ---
+    goals = events[kind == EV_GOAL]
+    # Velocidad justo antes del gol (en el frame del gol el puck ya puede estar frenado)
+    before = np.clip(goals["frame"].astype(np.int64) - 1, 0, max(n - 1, 0))
+    if n and len(goals):
+        vx, vy = puck[before, 2], puck[before, 3]
+        angles = np.degrees(np.arctan2(vy, np.abs(vx)))
+    else:
+        angles = np.zeros(0)
+    angle_hist = np.histogram(angles, bins=ANGLE_EDGES)[0]
+    goals_by_team = np.bincount(goals["a"], minlength=3)[1:3]
+
+    return {
+        "matches": 1,
+        "frames": n,
+        "running_frames": int(running.sum()),
+        "heat": heat,
+        "contact_hist": contact_hist,
+        "shot_hist": shot_hist,
+        "elasticity_bands": bands,
+        "touches_by_player": touches_by_player,
+        "possession": possession,
+        "territory": territory,
+        "rebounds": rebounds,
+        "straight_vs_corner": np.array(straight_vs_corner),
+        "angle_hist": angle_hist,
+        "goals_by_team": goals_by_team,
+        # Percentiles: se guardan las muestras (son pocas por partido)
+        "contact_speeds": rel_vel,
+        "shot_speeds": shot_speed,
+        "entry_angles": angles,
+    }
+
+
+def merge(total, stats):
+    """Suma las estadísticas de un partido al total (in place)."""
+    if total is None:
+        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in stats.items()}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            for name, count in value.items():
+                total[key][name] = total[key].get(name, 0) + count
+        elif key in ("contact_speeds", "shot_speeds", "entry_angles"):
+            total[key] = np.concatenate([total[key], value])
+        elif isinstance(value, np.ndarray) and total[key].shape != value.shape:
+            # Partidos con distinta cantidad de jugadores: se suman los comunes
+            merged = np.zeros(np.maximum(total[key].shape, value.shape), dtype=total[key].dtype)
+            merged[tuple(slice(0, s) for s in total[key].shape)] += total[key]
+            merged[tuple(slice(0, s) for s in value.shape)] += value
+            total[key] = merged
+        else:
+            total[key] = total[key] + value
+    return total
+
+
+def analyze(paths, workers=None):
+    """Estadísticas sumadas de varios partidos, repartidos en 'workers' procesos."""
+    total = None
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            total = merge(total, match_stats(path))
+        return total
+    chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(match_stats, paths, chunksize=chunksize):
+            total = merge(total, stats)
+    return total
+
+
+def percentiles(values, qs=(50, 90, 99)):
+    if len(values) == 0:
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+def summary(total):
+    """Resumen serializable (JSON) de las estadísticas sumadas."""
+    possession = total["possession"]
+    share = possession / np.maximum(possession.sum(axis=1, keepdims=True), 1)
+    straight, corner = (int(v) for v in total["straight_vs_corner"])
+    bands = total["elasticity_bands"]
+    return {
+        "matches": total["matches"],
+        "frames": int(total["frames"]),
+        "running_frames": int(total["running_frames"]),
+        "goals_by_team": total["goals_by_team"].tolist(),
+        "contacts": int(len(total["contact_speeds"])),
+        "contact_speed": percentiles(total["contact_speeds"]),
+        "shot_speed": percentiles(total["shot_speeds"]),
+        "elasticity_bands": {
+            f"<{ELASTICITY_BANDS[0]}": int(bands[0]),
+            f"{ELASTICITY_BANDS[0]}-{ELASTICITY_BANDS[1]}": int(bands[1]),
+            f">={ELASTICITY_BANDS[1]}": int(bands[2]),
+        },
+        "touches_by_player": total["touches_by_player"].tolist(),
+        "possession_by_half": share.round(3).tolist(),
+        "territory_by_half": total["territory"].tolist(),
+        "rebounds": {"straight": straight, "corner": corner, "by_region": total["rebounds"]},
+        "entry_angle": percentiles(np.abs(total["entry_angles"])),
+        "histograms": {
+            "speed_edges": SPEED_EDGES.tolist(),
+            "contact_speed": total["contact_hist"].tolist(),
+            "shot_speed": total["shot_hist"].tolist(),
+            "angle_edges": ANGLE_EDGES.tolist(),
+            "entry_angle": total["angle_hist"].tolist(),
+        },
+    }
+
+
+def save_heatmap(heat, path, scale=16):
+    """PNG del mapa de calor (negro → rojo → amarillo), escalado 'scale' veces."""
+    import pygame
+    norm = np.log1p(heat) / max(np.log1p(heat).max(), 1e-9)
+    rgb = np.zeros(heat.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = np.clip(norm * 2, 0, 1) * 255
+    rgb[..., 1] = np.clip(norm * 2 - 1, 0, 1) * 255
+    rgb = np.repeat(np.repeat(rgb, scale, axis=0), scale, axis=1)
+    pygame.image.save(pygame.surfarray.make_surface(rgb), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estadísticas de partidos grabados")
+    parser.add_argument("root", nargs="?", default="../recordings",
+                        help="directorio con partidos (se busca meta.json recursivamente)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos (por defecto uno por núcleo; 1 = sin pool)")
+    parser.add_argument("--save", metavar="RUTA", help="guardar el resumen en JSON")
+    parser.add_argument("--heatmap", metavar="PNG", help="guardar el mapa de calor del puck")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    paths = find_recordings(args.root)
+    if not paths:
+        parser.error(f"no hay grabaciones en {args.root}")
+    start = time.perf_counter()
+    total = analyze(paths, args.workers)
+    elapsed = time.perf_counter() - start
+    result = summary(total)
+
+    print(f"{result['matches']} partidos, {result['frames']} frames en {elapsed:.2f} s")
+    print(f"goles por equipo      {result['goals_by_team']}")
+    print(f"contactos             {result['contacts']}  velocidad relativa {result['contact_speed']}")
+    print(f"velocidad de tiro     {result['shot_speed']}")
+    print(f"bandas de elasticidad {result['elasticity_bands']}")
+    print(f"posesión por mitad    {result['possession_by_half']}")
+    print(f"rebotes rectos/arcos  {result['rebounds']['straight']} / {result['rebounds']['corner']}")
+    print(f"ángulo de entrada     {result['entry_angle']}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.heatmap:
+        save_heatmap(total["heat"], args.heatmap)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+class AssetCache:
+    """
+    Imágenes compartidas por todo el proceso.
+    preload() decodifica los PNG en hilos (pygame.image.load libera el GIL) mientras el hilo
+    principal arma la física y la red; image() hace convert/scale en el hilo principal y cachea.
+    """
+    def __init__(self, workers=None):
+        if workers is None:
+            # Con un solo núcleo los hilos solo compiten por la CPU: carga secuencial
+            workers = max(0, min(4, (os.cpu_count() or 1) - 1))
+        self.workers = workers     # 0 = carga secuencial (para comparar en startup_bench.py)
+        self._pool = None
+        self._pending = {}         # ruta -> Future con la superficie decodificada
+        self._images = {}          # (ruta, tamaño, alpha) -> Surface lista para blit
+
+    def preload(self, paths):
+        if not self.workers:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="assets")
+        for path in paths:
+            if path not in self._pending:
+                self._pending[path] = self._pool.submit(pygame.image.load, path)
+
+    def _raw(self, path):
+        future = self._pending.get(path)
+        if future is None:
+            return pygame.image.load(path)
+        return future.result()
+
+    def image(self, path, size=None, alpha=False):
+        """Superficie convertida al formato de la pantalla (y escalada si se pide)."""
+        key = (path, size, alpha)
+        surf = self._images.get(key)
+        if surf is None:
+            raw = self._raw(path)
+            surf = raw.convert_alpha() if alpha else raw.convert()
+            if size is not None:
+                surf = pygame.transform.scale(surf, size)
+            self._images[key] = surf
+        return surf
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# Caché única del proceso (la comparten todas las mesas y objetos)
+ASSETS = AssetCache()
@@ -0,0 +1,356 @@
+"""
+Benchmarks de las rutas calientes del juego (sin ventana, driver dummy de SDL).
+
+Uso (desde src/):
+    python benchmark.py                         # correr todo
+    python benchmark.py -k puck                 # solo los que contienen "puck"
+    python benchmark.py --save base.json        # guardar baseline
+    python benchmark.py --compare base.json     # comparar contra un baseline
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+import pygame
+import pymunk
+
+from latency import MarkerSample
+from mocap import FakeMessage
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Registra una función setup(ctx) -> callable a medir."""
+    def wrap(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return wrap
+
+
+def sample_payloads(n=256, seed=1234):
+    """Payloads con el formato de mocap/all (posiciones en metros dentro del Robotat)."""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(n):
+        identifier = ("65", "69", "12")[i % 3]   # dos jugadores + un marker ajeno
+        payloads.append(json.dumps({
+            "identifier": identifier,
+            "payload": {"pose": {
+                "position": {"x": rng.uniform(-0.85, 0.85), "y": rng.uniform(-1.5, 1.4),
+                             "z": rng.uniform(0.0, 0.05)},
+                "orientation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0},
+            }},
+        }).encode("utf-8"))
+    return payloads
+
+
+def load_payloads(path):
+    """Un payload JSON por línea (p. ej. grabado con mosquitto_sub -t mocap/all)."""
+    with open(path, "rb") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+# ------------------------------------------------------
+# CONTEXTO COMPARTIDO
+# ------------------------------------------------------
+class Context:
+    def __init__(self, payloads_path=None):
+        pygame.init()
+        self.screen = pygame.display.set_mode((1920, 1080))
+
+        from game import Game
+        from ui_manager import GameState
+        self.GameState = GameState
+        self.game = Game(self.screen, use_mqtt=False)
+        self.game.ingest.wait_ready()
+        self.payloads = load_payloads(payloads_path) if payloads_path else sample_payloads()
+
+    def reset_running(self):
+        """Estado de juego reproducible: partido corriendo, puck en movimiento."""
+        game = self.game
+        game.initial_check_done = True
+        game.ui.state = self.GameState.RUNNING
+        game.ui.timer = 120
+        game.scoreboard.set_time(120)
+        game.pending_goal_team = None
+        game.puck.body.position = (game.rink.rect.centerx - 200, game.rink.rect.centery + 80)
+        game.puck.body.velocity = (650, -420)
+        game.players[0].body.position = (500, 610)
+        game.players[1].body.position = (1400, 610)
+        for player, (x, y) in zip(game.players, ((520, 640), (1380, 580))):
+            player.input.push(x, y, MarkerSample(0, None, 0.0, 0.0))
+
+
+@benchmark("puck.keep_inside_rink")
+def _(ctx):
+    game = ctx.game
+    corner = game.rink.walls[10].a     # segmento dentro de la esquina superior izquierda
+    def run():
+        game.puck.body.position = (corner[0] + 10, corner[1] + 10)
+        game.puck.body.velocity = (-300, -300)
+        game.puck.keep_inside_rink(game.rink)
+    return run
+
+
+@benchmark("puck.limit_speed")
+def _(ctx):
+    puck = ctx.game.puck
+    def run():
+        puck.body.velocity = (900, 700)
+        puck.limit_speed()
+    return run
+
+
+@benchmark("player.update")
+def _(ctx):
+    game = ctx.game
+    player = game.players[0]
+    rink = game.rink
+    def run():
+        player.body.position = (500, 610)
+        player.update(1 / 60, rink, 530, 650)
+    return run
+
+
+@benchmark("game.update")
+def _(ctx):
+    game = ctx.game
+    def run():
+        ctx.reset_running()
+        game.update(1 / 60)
+    return run
+
+
+@benchmark("game.update[walls=solver]")
+def _(ctx):
+    game = ctx.game
+    def run():
+        game.set_wall_mode("solver")
+        ctx.reset_running()
+        game.update(1 / 60)
+        game.set_wall_mode("python")
+    return run
+
+
+@benchmark("scoreboard.draw")
+def _(ctx):
+    game = ctx.game
+    game.scoreboard.set_score(7, 12)
+    game.scoreboard.set_time(83.5)
+    def run():
+        game.scoreboard.draw(game.screen, pos=game.scoreboard_pos, scale=game.scoreboard_scale,
+                             lit_only=True)
+    return run
+
+
+def _ui_benchmark(state_name, setup_ui):
+    @benchmark(f"ui.draw[{state_name}]")
+    def _(ctx):
+        ui = ctx.game.ui
+        state = getattr(ctx.GameState, state_name)
+        def run():
+            setup_ui(ui)
+            ui.state = state
+            ui.draw(continue_timer=4.2)
+        return run
+
+
+_ui_benchmark("RUNNING", lambda ui: None)
+_ui_benchmark("PAUSED", lambda ui: None)
+_ui_benchmark("RESET_WARNING", lambda ui: setattr(ui, "warning_active", True)
+              or setattr(ui, "warning_type", "center"))
+_ui_benchmark("FINISHED", lambda ui: setattr(ui, "result_text", "PLAYER 1 WINS"))
+
+
+@benchmark("game.draw_ready_go[ready]")
+def _(ctx):
+    # El READY/GO lo dibuja Game.draw_ready_go (ui.draw no dibuja nada en READY_GO);
+    # READY? cambia de brillo en cada frame durante el primer medio segundo
+    game = ctx.game
+    state = {"timer": 0.0}
+    def run():
+        state["timer"] = (state["timer"] + 1 / 60) % 0.5
+        game.draw_ready_go("ready", state["timer"])
+    return run
+
+
+@benchmark("game.draw_ready_go[go]")
+def _(ctx):
+    game = ctx.game
+    def run():
+        game.draw_ready_go("go", 0.0)
+    return run
+
+
+@benchmark("map_to_screen_from_marker")
+def _(ctx):
+    game = ctx.game
+    def run():
+        game.ingest.map_to_screen_from_marker(312.5, -845.0)
+    return run
+
+
+@benchmark("mqtt_on_message")
+def _(ctx):
+    game = ctx.game
+    messages = [FakeMessage(p) for p in ctx.payloads]
+    state = {"i": 0}
+    def run():
+        i = state["i"]
+        game.ingest.mqtt_on_message(None, None, messages[i])
+        state["i"] = (i + 1) % len(messages)
+    return run
+
+
+@benchmark("game.draw")
+def _(ctx):
+    game = ctx.game
+    def run():
+        ctx.game.ui.state = ctx.GameState.RUNNING
+        game.draw()
+    return run
+
+
+# ------------------------------------------------------
+# MEDICIÓN
+# ------------------------------------------------------
+def measure(fn, repeats=15, min_sample_time=0.02):
+    """
+    Calibra el número de llamadas por muestra y devuelve tiempos por llamada (s).
+    El GC se desactiva durante cada muestra, como en timeit.
+    """
+    for _ in range(3):   # calentamiento
+        fn()
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_sample_time:
+            break
+        loops *= 2
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return samples, loops
+
+
+def summarize(samples, loops):
+    q = statistics.quantiles(samples, n=4) if len(samples) > 1 else [samples[0]] * 3
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "iqr_us": (q[2] - q[0]) * 1e6,
+        "loops": loops,
+        "repeats": len(samples),
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=False).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "pymunk": pymunk.version,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def run_all(ctx, pattern=None, repeats=15):
+    results = {}
+    for name, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        fn = setup(ctx)
+        samples, loops = measure(fn, repeats=repeats)
+        results[name] = summarize(samples, loops)
+        r = results[name]
+        print(f"{name:<32}{r['median_us']:>11.2f} µs  (min {r['min_us']:.2f}, "
+              f"IQR {r['iqr_us']:.2f}, {loops}x{repeats})")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Imprime la variación contra el baseline; devuelve los nombres que empeoraron."""
+    regressions = []
+    print(f"\nComparación contra {baseline['env'].get('commit') or 'baseline'} "
+          f"(umbral {threshold:.0%}):")
+    for name, r in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"  {name:<32} (nuevo)")
+            continue
+        change = r["median_us"] / base["median_us"] - 1
+        # Solo cuenta como regresión si supera el umbral y el ruido medido
+        noise = (r["iqr_us"] + base["iqr_us"]) / base["median_us"]
+        flag = ""
+        if change > max(threshold, noise):
+            flag = "  <-- REGRESIÓN"
+            regressions.append(name)
+        elif change < -max(threshold, noise):
+            flag = "  (mejora)"
+        print(f"  {name:<32}{base['median_us']:>10.2f} → {r['median_us']:>10.2f} µs "
+              f"({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de Air Hockey 2D")
+    parser.add_argument("-k", dest="pattern", help="solo benchmarks cuyo nombre contenga esto")
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--payloads", help="archivo con payloads mocap grabados (uno por línea)")
+    parser.add_argument("--save", metavar="JSON", help="guardar resultados como baseline")
+    parser.add_argument("--compare", metavar="JSON", help="comparar contra un baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="variación mínima para marcar una regresión (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    ctx = Context(args.payloads)
+    results = run_all(ctx, args.pattern, args.repeats)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"env": environment(), "results": results}, f, indent=2)
+        print(f"\nBaseline guardado en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            raise SystemExit(1)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
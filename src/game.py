@@ -5,26 +5,99 @@ from scoreboard import Scoreboard
 from rink import Rink
 from puck import Puck
 from player import Player
-from goal import Goal
+from goal import Goal, GoalCrossing
 from ui_manager import UIManager, GameState
-import json
-import paho.mqtt.client as mqtt
 import threading
-import numpy as np
-import cv2
+import queue
+import time
+import logging
+from pipeline import FrameState, TripleBuffer, LoopStats
+from layers import Layer, LayerStack
+from profiler import FrameProfiler
+from latency import LatencyTracker
+from memory_control import FrameGC, AllocationTracker
+from mocap import MocapIngest
+from input_providers import MocapProvider
+from physics_profiles import DEFAULT_PROFILE, get_profile
+from quality import LEVELS, FrameGovernor
+from scenes import SceneScheduler
+from assets import ASSETS
+from startup import StartupTimer
+
+log = logging.getLogger(__name__)
+
+# Imágenes que se decodifican en paralelo al arrancar (ver assets.py)
+GAME_ASSETS = [
+    "../assets/fondo.png",
+    "../assets/puck.png",
+    "../assets/player1.png",
+    "../assets/player2.png",
+    "../assets/warning_middlemarker.png",
+    "../assets/warning_player1.png",
+    "../assets/warning_player2.png",
+]
 
 class Game:
-    def __init__(self, screen: pygame.Surface): 
+    def __init__(self, screen: pygame.Surface, pipelined=False, sim_hz=120, profile_csv=None,
+                 use_mqtt=True, latency_log=None, metrics_port=None, metrics_host="127.0.0.1",
+                 metrics_snapshot=None, gc_control=True, track_alloc=False, inputs=None,
+                 startup=None, ingest=None, homography=None, teams=None, props=None,
+                 walls="python", physics=DEFAULT_PROFILE, ingest_process=False, governor=False):
         self.screen = screen
         self.clock = pygame.time.Clock()
 
+        # Arranque: PNGs decodificándose en hilos mientras se arma el resto
+        self.startup = startup or StartupTimer()
+        ASSETS.preload(GAME_ASSETS)
+
+        # Perfilador por fases (HUD con debug, CSV al salir si se pide)
+        self.profiler = FrameProfiler("sim" if pipelined else "frame")
+        self.profile_csv = profile_csv
+
+        # GC fuera de los frames y, opcionalmente, asignaciones por fase (tracemalloc)
+        self.frame_gc = FrameGC() if gc_control else None
+        self.track_alloc = track_alloc
+        self.frame_deadline = 0.0
+
+        # Latencia marker → fotón por etapa (resumen por partido en latency_log)
+        self.latency = LatencyTracker(latency_log)
+        self.profiler.hud_extra = self.latency.hud_lines
+
+        # Contadores operativos (solo se incrementan; los lee metrics.py en otro hilo)
+        self.goals_total = [0, 0]
+        # Perfil de física: ajustes del Space y subpasos por frame (ver physics_profiles.py)
+        self.physics_profile = get_profile(physics)
+        self.base_physics = self.physics_profile     # al que vuelve el gobernador
+        self.substeps = self.physics_profile.substeps_for(1 / 60)   # los del último frame
+        self.physics_time = None   # perf_counter() del final del último paso de física
+        # Los jugadores siguen a sus muestras con este retraso (1.5 períodos de mocap a 120 Hz,
+        # para absorber el jitter de llegada); ver Player.path
+        self.input_delay = 0.0125
+
+        # Paredes: "python" = pymunk las ignora y Puck.keep_inside_rink refleja una vez por frame;
+        # "solver" = pymunk resuelve el contacto en cada subpaso (keep_inside_rink queda de respaldo)
+        self.walls = walls
+
+        # Modo pipelined: simulación en su propio hilo a cadencia fija y render desacoplado
+        self.pipelined = pipelined
+        self.sim_hz = sim_hz
+
+        # Fuentes de entrada por jugador (por defecto los markers 65 y 69 del Robotat)
+        if inputs is None:
+            inputs = [MocapProvider("65"), MocapProvider("69")]
+        # Objetos rastreados que no son jugadores (p. ej. un puck físico con marker)
+        self.props = dict(props or {})
+        # Homografía y broker en segundo plano (use_mqtt=False: solo homografía).
+        # Con varias mesas, MultiTable pasa un ingest compartido y la homografía de esta mesa.
+        # ingest_process=True: MQTT, JSON y homografía en otro proceso (ver mocap_process.py)
+        self.start_ingest(inputs, connect=use_mqtt, ingest=ingest, homography=homography,
+                          process=ingest_process)
+        self.startup.mark("init")
+
         # Espacio físico
         self.space = pymunk.Space()
         self.space.gravity = (0, 0)
-
-        # Fondo
-        self.background = pygame.image.load("../assets/fondo.png").convert()
-        self.background = pygame.transform.scale(self.background, screen.get_size())
+        self.physics_profile.apply(self.space)
 
         # Scoreboard
         self.scoreboard = Scoreboard(led_size=15, spacing=3)
@@ -34,15 +107,13 @@ class Game:
         self.puck = Puck(self.space, self.rink.rect.centerx + 0, self.rink.rect.centery - 0, radius=15,
                         asset_path="../assets/puck.png")
         self.puck.shape.collision_type = 1
+        self.puck.rest_speed = self.physics_profile.idle_speed
+
+        # Un jugador por entrada (por defecto alternando equipos: 1v1, 2v2, ...)
+        if teams is None:
+            teams = [1 + i % 2 for i in range(len(inputs))]
+        self.players = self.create_players(teams)
 
-        self.players = [
-            Player(self.space, 400, 610, asset_path="../assets/player1.png"),
-            Player(self.space, 1500, 610, asset_path="../assets/player2.png")
-        ]
-        
-        self.new_data_p1 = False
-        self.new_data_p2 = False
-        
         # Crear porterías (sensores)
         goal1_x = self.rink.rect.left
         goal1_y = self.rink.rect.centery - 50
@@ -51,37 +122,101 @@ class Game:
         goal2_x = self.rink.rect.right
         goal2_y = self.rink.rect.centery - 50
         self.goal2 = Goal(self.space, goal2_x - 8, goal2_y, 10, 100, team=1)
+        # Fuera de esta franja de x el puck no puede tocar ninguna portería (ver check_goal_line)
+        self.goal_reach = (self.goal1.right + self.puck.radius, self.goal2.left - self.puck.radius)
+        self.sensor_hit = None     # equipo cuyo sensor tocó el puck en el paso en curso
+        self.last_goal = None      # GoalCrossing del último gol
 
         # Configurar colisiones
         self.setup_collisions()
-        
-        # Leer markers
-        self.start_marker_thread()
+        self.attach_inputs(inputs)
+        self.startup.mark("physics")
+
+        # Fondo (se guarda el original para reescalar si cambia la resolución)
+        self.background_src = ASSETS.image("../assets/fondo.png")
+        self.background = ASSETS.image("../assets/fondo.png", screen.get_size())
+
         # --- UI ---
         self.ui = UIManager(screen)
-        self.debug = True
+        self.debug = False
+
+        # Nivel de calidad (quality.py): el gobernador lo baja si el frame no entra en 16.7 ms
+        self.quality = LEVELS[0]
+        self.governor = FrameGovernor(self.apply_quality) if governor else None
+        self.scoreboard_cache = None
+        self.scoreboard_next = 0.0
+        self._scoreboard_rect = None
+        self.partial_rects = None    # rects de los sprites del último frame parcial
+
+        # Capas estáticas precompuestas (fondo, LEDs apagados, geometría de debug)
+        self.setup_layers()
+        self.startup.mark("assets")
+
+        # Métricas en vivo (endpoint Prometheus y/o snapshot JSON periódico)
+        # metrics.py (http.server) solo se importa si se pide
+        self.metrics = None
+        self.metrics_server = None
+        self.metrics_writer = None
+        if metrics_port is not None or metrics_snapshot:
+            from metrics import MetricsCollector, MetricsServer, SnapshotWriter
+            self.metrics = MetricsCollector(self)
+            if metrics_port is not None:
+                self.metrics_server = MetricsServer(self.metrics, metrics_host, metrics_port).start()
+            if metrics_snapshot:
+                self.metrics_writer = SnapshotWriter(self.metrics, metrics_snapshot).start()
+
+        # Publicación del estado para espectadores/robots (state_publisher.StatePublisher)
+        self.publisher = None
+        # Grabación columnar del partido (recorder.MatchRecorder)
+        self.recorder = None
 
         # Variables auxiliares
         self.continue_timer = 0
         self.center_radius = 80  # radio para el warning
         self.pending_goal_team = None
-        
-        
-        
+        self.initial_check_done = False
+        self.ready_go_stage = "ready"
+        self.ready_go_timer = 0
+
+        # Una escena por GameState (READY/GO incluido), manejadas por el loop principal
+        self.scenes = SceneScheduler(self)
+
+    # ------------------------------------------------------
+    def create_players(self, teams):
+        """Player por entrada, en el orden de 'teams'; compañeros repartidos en vertical."""
+        players = [None] * len(teams)
+        for team, x, asset in ((1, 400, "../assets/player1.png"), (2, 1500, "../assets/player2.png")):
+            members = [i for i, t in enumerate(teams) if t == team]
+            for j, i in enumerate(members):
+                y = 610 + (j - (len(members) - 1) / 2) * 200
+                players[i] = Player(self.space, x, y, asset_path=asset, team=team)
+        return players
+
     # ------------------------------------------------------
     def setup_collisions(self):
         """Configura todos los handlers de colisión."""
         # ---- Goles ----
+        # El sensor solo anota quién tocó; el gol lo confirma check_goal_line después del paso
         handler1 = self.space.add_collision_handler(1, self.goal1.shape.collision_type)
-        handler1.begin = lambda arbiter, space, data: self.goal_scored(self.goal1.team) or True
+        handler1.begin = lambda arbiter, space, data: self.on_goal_sensor(self.goal1.team)
 
         handler2 = self.space.add_collision_handler(1, self.goal2.shape.collision_type)
-        handler2.begin = lambda arbiter, space, data: self.goal_scored(self.goal2.team) or True
+        handler2.begin = lambda arbiter, space, data: self.on_goal_sensor(self.goal2.team)
 
         # ---- Puck vs Player ----
+        player_index = {p.shape: i for i, p in enumerate(self.players)}
+
         def on_player_puck_collision(arbiter, space, data):
             player_shape, puck_shape = arbiter.shapes
-            rel_vel = (puck_shape.body.velocity - player_shape.body.velocity).length
+            pvx, pvy = puck_shape.body.velocity
+            qvx, qvy = player_shape.body.velocity
+            dvx, dvy = pvx - qvx, pvy - qvy
+            rel_vel = math.sqrt(dvx * dvx + dvy * dvy)
+
+            if self.recorder is not None and arbiter.is_first_contact:
+                index = player_index.get(player_shape, player_index.get(puck_shape, -1))
+                x, y = self.puck.body.position
+                self.recorder.contact_player(index, rel_vel, x, y)
 
             if rel_vel < 100:  # impacto leve
                 arbiter.elasticity = 0
@@ -95,13 +230,158 @@ class Game:
         handler = self.space.add_collision_handler(1, 2)  # 1=puck, 2=player
         handler.pre_solve = on_player_puck_collision
         
-        handler_ghost = self.space.add_collision_handler(1, 99)  # puck vs player fantasma
-        handler_ghost.pre_solve = lambda arbiter, space, data: False  # False = ignora la colisión
+        # ---- Puck vs paredes ----
+        self.wall_index = {wall: i for i, wall in enumerate(self.rink.walls)}
+        self.wall_handler = self.space.add_collision_handler(1, 99)
+        self.set_wall_mode(self.walls)
+
+    # ------------------------------------------------------
+    def set_wall_mode(self, mode):
+        """Cambia quién resuelve los rebotes del puck contra las paredes (ver __init__)."""
+        if mode == "python":
+            self.wall_handler.pre_solve = lambda arbiter, space, data: False  # ignora la colisión
+        elif mode == "solver":
+            self.wall_handler.pre_solve = self.on_puck_wall
+        else:
+            raise ValueError(f"modo de paredes desconocido: {mode}")
+        self.walls = mode
+        # Con el solver queda una penetración de ~collision_slop: tolerarla en la red de seguridad
+        self.wall_slack = 2.0 if mode == "solver" else 0.0
+
+    # ------------------------------------------------------
+    def set_physics_profile(self, profile):
+        """Cambia el perfil en caliente (el spatial hash solo se aplica al crear el Space)."""
+        profile = get_profile(profile)
+        profile._replace(spatial_hash=None).apply(self.space)
+        self.physics_profile = profile
+        self.puck.rest_speed = profile.idle_speed
+        if self.puck.body.is_sleeping:
+            self.puck.body.activate()
+
+    # ------------------------------------------------------
+    def on_puck_wall(self, arbiter, space, data):
+        """Contacto puck-pared resuelto por pymunk (se llama en cada subpaso mientras se tocan)."""
+        arbiter.elasticity = self.rink.restitution
+        if self.recorder is not None and arbiter.is_first_contact:
+            wall = self.wall_index.get(arbiter.shapes[1], -1)
+            x, y = self.puck.body.position
+            vx, vy = self.puck.body.velocity
+            self.recorder.contact_wall(wall, math.sqrt(vx * vx + vy * vy), x, y)
+        return True
+
+    # ------------------------------------------------------
+    def setup_layers(self):
+        """Registra las capas estáticas; se recomponen solo si cambia resolución o debug."""
+        self.scoreboard_pos = (525, 70)
+        self.scoreboard_scale = 0.45
+
+        self.layers = LayerStack()
+        self.layers.add(Layer("background", self.draw_background_layer))
+        self.layers.add(Layer("scoreboard", lambda surf: self.scoreboard.draw_static(
+            surf, pos=self.scoreboard_pos, scale=self.scoreboard_scale)))
+        self.layers.add(Layer("debug", self.draw_debug_layer, enabled=self.show_debug))
+
+    # ------------------------------------------------------
+    def draw_background_layer(self, surf):
+        if self.background.get_size() != surf.get_size():
+            self.background = pygame.transform.scale(self.background_src, surf.get_size())
+        surf.blit(self.background, (0, 0))
+
+    # ------------------------------------------------------
+    def draw_debug_layer(self, surf):
+        """Geometría estática de debug: paredes del rink y sensores de gol."""
+        self.rink.draw_debug(surf)
+        self.goal1.draw_debug(surf)
+        self.goal2.draw_debug(surf)
+
+    # ------------------------------------------------------
+    def scoreboard_rect(self):
+        """Zona de pantalla del marcador (bounding rect de sus LEDs apagados)."""
+        size = self.screen.get_size()
+        if self._scoreboard_rect is None or self._scoreboard_rect[0] != size:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            self.scoreboard.draw_static(surf, pos=self.scoreboard_pos, scale=self.scoreboard_scale)
+            self._scoreboard_rect = (size, surf.get_bounding_rect())
+        return self._scoreboard_rect[1]
+
+    # ------------------------------------------------------
+    def draw_scoreboard(self):
+        """LEDs encendidos; con quality.scoreboard_hz salen de una copia que se refresca a esa tasa."""
+        hz = self.quality.scoreboard_hz
+        if hz is None:
+            self.scoreboard.draw(self.screen, pos=self.scoreboard_pos, scale=self.scoreboard_scale,
+                                 lit_only=True)
+            return
+        rect = self.scoreboard_rect()
+        now = time.perf_counter()
+        cache = self.scoreboard_cache
+        if cache is None or cache.get_size() != rect.size or now >= self.scoreboard_next:
+            if cache is None or cache.get_size() != rect.size:
+                cache = self.scoreboard_cache = pygame.Surface(rect.size, pygame.SRCALPHA)
+            cache.fill((0, 0, 0, 0))
+            x, y = self.scoreboard_pos
+            self.scoreboard.draw(cache, pos=(x - rect.x, y - rect.y), scale=self.scoreboard_scale,
+                                 lit_only=True)
+            self.scoreboard_next = now + 1 / hz
+        self.screen.blit(cache, rect)
 
     # ------------------------------------------------------
-    def goal_scored(self, team):
-        """Marca que ocurrió un gol (diferido)."""
+    def draw_scene(self):
+        """Capas estáticas + LEDs encendidos + sprites dinámicos (sin UI ni flip)."""
+        self.layers.draw(self.screen)
+        self.profiler.mark("draw_layers")
+        self.draw_scoreboard()
+
+        self.puck.draw(self.screen)
+        for p in self.players:
+            p.draw(self.screen)
+
+        if self.show_debug():  # hitboxes dinámicas (las estáticas ya están en la capa "debug")
+            self.puck.draw_debug(self.screen)
+            for p in self.players:
+                p.draw_debug(self.screen, self.rink)
+            for provider in self.props.values():
+                sample = provider.latest()
+                if sample is not None:
+                    pygame.draw.circle(self.screen, (255, 220, 0), (int(sample.x), int(sample.y)), 12, 2)
+        self.profiler.mark("draw_sprites")
+
+    # ------------------------------------------------------
+    def on_goal_sensor(self, team):
+        self.sensor_hit = team
+        return True
+
+    # ------------------------------------------------------
+    def check_goal_line(self, x0, y0, x1, y1, t, span):
+        """
+        Gol por barrido: el recorrido del puck en el subpaso [t, t + span] contra cada área de
+        gol. El sensor de pymunk solo ve las posiciones al final de cada paso y, con pocos
+        subpasos y el puck rápido, puede saltearse los 10 px del área; el barrido no.
+        """
+        hit, self.sensor_hit = self.sensor_hit, None
+        if self.pending_goal_team is not None:
+            return
+        radius = self.puck.radius
+        for goal in (self.goal1, self.goal2):
+            u = goal.sweep(x0, y0, x1, y1, radius)
+            if u is not None:
+                self.goal_scored(goal.team, x0 + (x1 - x0) * u, y0 + (y1 - y0) * u, t + u * span)
+                return
+        if hit is not None:
+            # Solapamiento que el barrido no ve como entrada (el puck empezó el paso adentro)
+            self.goal_scored(hit, x1, y1, t + span)
+
+    # ------------------------------------------------------
+    def goal_scored(self, team, x=None, y=None, t=None):
+        """Marca que ocurrió un gol (diferido); x, y, t: punto e instante del cruce."""
+        if x is None:
+            x, y = self.puck.body.position
         self.pending_goal_team = team
+        self.last_goal = GoalCrossing(team, time.perf_counter() if t is None else t, x, y)
+        log.debug("Gol del equipo %d en (%.1f, %.1f)", team, x, y)
+        if self.recorder is not None:
+            vx, vy = self.puck.body.velocity
+            self.recorder.goal(team, x, y, math.sqrt(vx * vx + vy * vy))
 
     # ------------------------------------------------------
     def process_pending_goal(self):
@@ -112,133 +392,69 @@ class Game:
 
             self.trigger_reset_warning()
             self.scoreboard.add_point(team)
+            self.goals_total[team - 1] += 1
             self.reset_puck()
     
     # ------------------------------------------------------
-    # CONTROL CON MARKERS MQTT
-    # ------------------------------------------------------
-    def start_marker_thread(self):
-        """Inicializa el cliente MQTT y la homografía para los markers."""
-        import numpy as np, cv2, threading, json, paho.mqtt.client as mqtt
-
-        # ===============================================================
-        # --- CONFIGURACIÓN MQTT ---
-        # ===============================================================
-        self.BROKER = "192.168.50.200"
-        self.PORT = 1880
-        self.TOPIC = "mocap/all"
-
-        # ===============================================================
-        # --- CONFIGURACIÓN DE PANTALLA ---
-        # ===============================================================
-        self.screen_w, self.screen_h = self.screen.get_size()
-
-        # ===============================================================
-        # --- DEFINIR PLANOS Y HOMOGRAFÍA ---
-        # ===============================================================
-        A = np.array([-853, -1583])  # inferior izquierda en ROBOTAT (Inferior derecha en proyección)
-        B = np.array([854, -1583])   # inferior derecha en ROBOTAT (Superior derecha en proyección)
-
-        C = np.array([854, 1475])    # superior derecha en ROBOTAT (Superior izquierda en proyección)
-        D = np.array([-853, 1475])   # superior izquierda en ROBOTAT (Inferior izquierda en proyección)
-        original = np.array([A, B, C, D, A]) #<-- Primer Plano
-
-        width = 1707
-        height = 3058
-        screen_w, screen_h = self.screen_w, self.screen_h #<-- Tercer Plano
-
-        if width < height and screen_w > screen_h:
-            print("Rotando segundo plano 90° para coincidir con la orientación de la pantalla...")
-            width, height = height, width
-            rect_local = np.array([
-                [-width/2, -height/2],
-                [ width/2, -height/2],
-                [ width/2,  height/2],
-                [-width/2,  height/2]
-            ])
-            R90 = np.array([[0, -1], [1, 0]]) #<-- Primera rotación segundo plano
-            rect_local = rect_local @ R90.T
-        else:
-            rect_local = np.array([
-                [-width/2, -height/2],
-                [ width/2, -height/2],
-                [ width/2,  height/2],
-                [-width/2,  height/2]
-            ])
-
-        center = np.array([4, 41])  #<--- Posición, escala y rotación del segundo plano
-        scale = 1
-        angle_deg = 180
-        theta = np.deg2rad(angle_deg)
-        R = np.array([[np.cos(theta), -np.sin(theta)],
-                      [np.sin(theta),  np.cos(theta)]])
-        rect_transformed = center + scale * (rect_local @ R.T)
-
-        half_w, half_h = screen_w/2, screen_h/2
-        third_plane = np.array([
-            [-half_w, -half_h],
-            [ half_w, -half_h],
-            [ half_w,  half_h],
-            [-half_w,  half_h]
-        ], dtype=np.float32)
-
-        src_points = rect_transformed.astype(np.float32)
-        dst_points = third_plane
-        self.H, _ = cv2.findHomography(src_points, dst_points)
-
-        # ===============================================================
-        # --- ARRANCAR CLIENTE MQTT ---
-        # ===============================================================
-        self.client = mqtt.Client()
-        self.client.on_connect = self.mqtt_on_connect
-        self.client.on_message = self.mqtt_on_message
-        self.client.connect(self.BROKER, self.PORT, keepalive=60)
-        threading.Thread(target=self.client.loop_forever, daemon=True).start()
-
-        print("Hilo MQTT iniciado correctamente.")
-
-    # ------------------------------------------------------
-    def mqtt_on_connect(self, client, userdata, flags, rc):
-        print("Conectado con código:", rc)
-        client.subscribe(self.TOPIC)
-
-    # ------------------------------------------------------
-    def map_to_screen_from_marker(self, x_mm, y_mm):
-        """Transforma coordenadas del plano original a coordenadas de pantalla."""
-        import numpy as np, cv2
-        point = np.array([[x_mm, y_mm]], dtype=np.float32)
-        point_hom = cv2.perspectiveTransform(np.array([point]), self.H)[0][0]
-
-        screen_x = int(point_hom[0] + self.screen_w / 2)
-        screen_y = int(-point_hom[1] + self.screen_h / 2)
-
-        screen_x = max(0, min(self.screen_w - 1, screen_x))
-        screen_y = max(0, min(self.screen_h - 1, screen_y))
-        return screen_x, screen_y
-
-    # ------------------------------------------------------
-    def mqtt_on_message(self, client, userdata, msg):
-        """Procesa las posiciones de los markers y actualiza coordenadas."""
-        import json
-        try:
-            data = json.loads(msg.payload.decode("utf-8"))
-            identifier = data.get("identifier")
-            pos = data["payload"]["pose"]["position"]
-            x_mm, y_mm, z_mm = pos["x"]*1000, pos["y"]*1000, pos["z"]*1000
-
-            x_screen, y_screen = self.map_to_screen_from_marker(x_mm, y_mm)
-
-            if identifier == "65":  # Player 1
-                self.player1_pos = (x_screen, y_screen)
-                self.new_data_p1 = True
-            elif identifier == "69":  # Player 2
-                self.player2_pos = (x_screen, y_screen)
-                self.new_data_p2 = True
-
-        except Exception as e:
-            print("Error al procesar mensaje:", e)
-
-    # ------------------------------------------------------    
+    # FUENTES DE ENTRADA (markers MQTT, mouse, teclado, replay, computadora)
+    # ------------------------------------------------------
+    def start_ingest(self, inputs, connect=True, ingest=None, homography=None, process=False):
+        """Los providers de mocap comparten un MocapIngest (arranca en segundo plano)."""
+        self.ingest = ingest
+        mocap = [p for p in list(inputs) + list(self.props.values()) if isinstance(p, MocapProvider)]
+        if not mocap:
+            return
+        owned = ingest is None
+        if owned:
+            if process:
+                from mocap_process import ProcessIngest
+                ingest_class = ProcessIngest
+            else:
+                ingest_class = MocapIngest
+            self.ingest = ingest_class(self.screen.get_size(), latency=self.latency,
+                                       startup=self.startup)
+        for provider in mocap:
+            self.ingest.register(provider, homography, self.latency)
+        if owned:
+            self.ingest.start(connect)
+
+    # ------------------------------------------------------
+    def attach_inputs(self, inputs):
+        """Asigna un InputProvider a cada jugador."""
+        for index, (player, provider) in enumerate(zip(self.players, inputs)):
+            player.input = provider
+            provider.attach(self, index)
+        log.info("Entradas: %s", ", ".join(repr(p.input) for p in self.players))
+
+    # ------------------------------------------------------
+    def poll_inputs(self):
+        """Lee las fuentes pull (mouse, teclado, replay, computadora) una vez por paso."""
+        now = time.perf_counter()
+        if self.ingest is not None:
+            self.ingest.poll()
+        for player in self.players:
+            if player.input is not None:
+                player.input.poll(self, now)
+
+    # ------------------------------------------------------
+    def feed_motion(self, events):
+        """Entrega a las fuentes de mouse todos los MOUSEMOTION de la tanda, en orden."""
+        now = time.perf_counter()
+        positions = [event.pos for event in events if event.type == pygame.MOUSEMOTION]
+        for player in self.players:
+            if player.input is not None:
+                player.input.motion(positions, now)
+
+    # ------------------------------------------------------
+    def input_target(self, index):
+        """Última posición objetivo del jugador (o su posición actual si aún no hay datos)."""
+        player = self.players[index]
+        sample = player.input.latest() if player.input is not None else None
+        if sample is None:
+            x, y = player.body.position
+            return x, y
+        return sample.x, sample.y
+
     # ------------------------------------------------------
     def trigger_reset_warning(self):
         """Activa el estado de advertencia después de un gol."""
@@ -259,7 +475,11 @@ class Game:
     # ------------------------------------------------------
     def reset_game(self):
         """Reinicia todo el juego tras 'Continue'."""
+        self.latency.end_match(score=[self.scoreboard.team1_score, self.scoreboard.team2_score],
+                               result="reset")
         self.scoreboard.set_score(0, 0)
+        if self.recorder is not None:
+            self.recorder.new_match()
         
         self.ui.timer = 120
         self.scoreboard.set_time(self.ui.timer)
@@ -275,29 +495,25 @@ class Game:
         """Verifica si los jugadores están en su lado correcto al iniciar el juego."""
         cx, cy = self.rink.rect.center
 
-        # Actualizar posiciones desde los markers
-        self.players[0].body.position = self.player1_pos
-        self.players[1].body.position = self.player2_pos
-        for player in self.players:
+        # Actualizar posiciones desde las entradas
+        for i, player in enumerate(self.players):
+            player.body.position = self.input_target(i)
             player.body.velocity = (0, 0)
             player.shape.collision_type = 2  # restaurar colisiones normales
 
-        # --- Verificar distancias ---
-        dist1 = math.hypot(self.players[0].body.position.x - cx, self.players[0].body.position.y - cy)
-        dist2 = math.hypot(self.players[1].body.position.x - cx, self.players[1].body.position.y - cy)
-
         # Si alguno está dentro del área central
-        if dist1 < self.center_radius + 25 or dist2 < self.center_radius + 25:
+        if any(math.hypot(p.body.position.x - cx, p.body.position.y - cy) < self.center_radius + 25
+               for p in self.players):
             self.ui.set_warning("center")
             return False
 
-        # Si player1 está en el lado derecho
-        if self.players[0].body.position.x >= cx:
+        # Si algún jugador del equipo 1 está en el lado derecho
+        if any(p.team == 1 and p.body.position.x >= cx for p in self.players):
             self.ui.set_warning("player1")
             return False
 
-        # Si player2 está en el lado izquierdo
-        if self.players[1].body.position.x < cx:
+        # Si algún jugador del equipo 2 está en el lado izquierdo
+        if any(p.team == 2 and p.body.position.x < cx for p in self.players):
             self.ui.set_warning("player2")
             return False
 
@@ -311,15 +527,11 @@ class Game:
         """Maneja el estado de advertencia cuando se requiere reposicionar jugadores."""
         cx, cy = self.rink.rect.center
 
-        # Tomar posiciones desde los markers
-        px1, py1 = self.player1_pos
-        px2, py2 = self.player2_pos
-
-        # Verificar si ambos están fuera del área central
-        dist1 = math.hypot(px1 - cx, py1 - cy)
-        dist2 = math.hypot(px2 - cx, py2 - cy)
+        # Tomar posiciones desde las entradas
+        targets = [self.input_target(i) for i in range(len(self.players))]
 
-        if dist1 > self.center_radius + 25 and dist2 > self.center_radius + 25:
+        # Verificar si todos están fuera del área central
+        if all(math.hypot(px - cx, py - cy) > self.center_radius + 25 for px, py in targets):
             # Si hay un warning distinto del centro activo, no hacer nada
             if self.ui.warning_active and self.ui.warning_type in ("player1", "player2"):
                 return
@@ -330,9 +542,8 @@ class Game:
             self.reset_puck()
 
             # Actualizar posiciones de jugadores
-            self.players[0].body.position = (px1, py1)
-            self.players[1].body.position = (px2, py2)
-            for player in self.players:
+            for player, target in zip(self.players, targets):
+                player.body.position = target
                 player.body.velocity = (0, 0)
                 player.shape.collision_type = 2
         else:
@@ -376,42 +587,71 @@ class Game:
             self.ui.result_text = "TIE"
         self.ui.state = GameState.FINISHED
         self.continue_timer = 0
+        self.latency.end_match(score=[score1, score2], result=self.ui.result_text)
 
     # ------------------------------------------------------
     def update(self, dt: float):
+        profiler = self.profiler
         self.ui.update_timer(dt)
 
         # Final del tiempo → determinar resultado
         if self.ui.state == GameState.FINISHED and not self.ui.result_text:
             self.finish_game()
+        profiler.mark("timers")
 
         # Procesar goles pendientes
         self.process_pending_goal()
+        profiler.mark("goals")
 
         # Flujo por estado
         if self.ui.state == GameState.RUNNING:
             self.scoreboard.tick(dt)
-            steps = 15
+            steps = self.substeps = self.physics_profile.substeps_for(dt)
             dt_step = dt / steps
-            for _ in range(steps):
+
+            # Cada jugador recorre todas las muestras recibidas durante el frame: su posición
+            # y velocidad se interpolan en el instante de cada subpaso. La ventana empieza donde
+            # terminó la anterior, para que ninguna muestra quede entre dos frames.
+            t1 = time.perf_counter()
+            t0 = self.physics_time
+            if t0 is None or not 0 < t1 - t0 < 4 * dt:
+                t0 = t1 - dt          # primer frame o vuelta de una pausa
+            self.physics_time = t1
+            span = (t1 - t0) / steps
+            players = self.players
+            # --- Latencia: la última muestra de cada jugador entra a la física al armar su
+            # trayectoria (se lee antes que path: nunca se cuenta una que path no vio) ---
+            for i, player in enumerate(players):
+                sample = player.input.latest() if player.input is not None else None
+                if sample is not None:
+                    self.latency.used(i, sample.sample)
+            paths = [player.path(self.rink, t0, t1, self.input_delay) for player in players]
+            profiler.mark("players")
+            puck_body = self.puck.body
+            near_left, near_right = self.goal_reach
+            x1, y1 = puck_body.position
+            for k in range(steps):
+                t = t0 + (k + 1) * span
+                for player, knots in zip(players, paths):
+                    player.follow(knots, t, dt_step)
+                x0, y0 = x1, y1           # solo space.step mueve al puck entre subpasos
                 self.space.step(dt_step)
+                x1, y1 = puck_body.position
+                # Barrido contra las porterías solo cerca de ellas (o si tocó un sensor)
+                if (x0 <= near_left or x1 <= near_left or x0 >= near_right or x1 >= near_right
+                        or self.sensor_hit is not None):
+                    self.check_goal_line(x0, y0, x1, y1, t - span, span)
+            self.latency.physics_done()
+            profiler.mark("physics")
 
             # Limitar velocidad y mantener dentro del rink
             self.puck.limit_speed()
-            self.puck.keep_inside_rink(self.rink)
-
-            # --- Control de jugadores con markers ---
-            # Si hay datos nuevos, solo actualiza las posiciones guardadas
-            if self.new_data_p1:
-                self.new_data_p1 = False
-            if self.new_data_p2:
-                self.new_data_p2 = False
-
-            # Actualizar jugadores con las posiciones más recientes
-            px1, py1 = self.player1_pos
-            px2, py2 = self.player2_pos
-            self.players[0].update(dt, self.rink, px1, py1)
-            self.players[1].update(dt, self.rink, px2, py2)
+            wall = self.puck.keep_inside_rink(self.rink, self.wall_slack)
+            if wall >= 0 and self.recorder is not None and self.walls == "python":
+                x, y = self.puck.body.position
+                vx, vy = self.puck.body.velocity
+                self.recorder.contact_wall(wall, math.sqrt(vx * vx + vy * vy), x, y)
+            profiler.mark("puck")
 
         elif self.ui.state == GameState.RESET_WARNING:
             self.handle_reset_warning()
@@ -423,117 +663,315 @@ class Game:
 
     # ------------------------------------------------------
     def draw(self):
-        self.screen.blit(self.background, (0, 0))
-        self.scoreboard.draw(self.screen, pos=(525, 70), scale=0.45)
-
-        self.puck.draw(self.screen)
-        for p in self.players:
-            p.draw(self.screen)
-            #if self.debug:
-            #    p.draw_debug(self.screen, self.rink) #Los draw debug son las hitboxes
-        
-        #if self.debug:
-            #self.rink.draw_debug(self.screen)
-            #self.puck.draw_debug(self.screen)
-            #self.goal1.draw_debug(self.screen)
-            #self.goal2.draw_debug(self.screen)
+        self.draw_scene()
+        self.latency.draw_done()
 
         #self.ui.draw_timer()
         self.ui.draw(continue_timer=self.continue_timer)
-        pygame.display.flip()
+        if self.show_debug():
+            self.profiler.draw_hud(self.screen)
+        self.profiler.mark("draw_ui")
+
+    # ------------------------------------------------------
+    def draw_partial(self):
+        """
+        Frame de juego (RUNNING, sin debug) redibujando solo lo que cambia: el rect anterior de
+        cada sprite y el marcador se restauran desde la capa estática y se dibujan encima.
+        Devuelve los rects a presentar, o True si hizo falta dibujar todo (primer frame de la
+        escena, nivel nuevo o capas recompuestas).
+        """
+        screen = self.screen
+        sprites = [self.puck] + self.players
+        rects = [sprite.bounds() for sprite in sprites]
+        previous = self.partial_rects
+        self.partial_rects = rects
+        if previous is None or not self.layers.is_current(screen.get_size()):
+            self.draw()
+            return True
+
+        base = self.layers.surface
+        board = self.scoreboard_rect()
+        for rect in previous:
+            screen.blit(base, rect, rect)
+        screen.blit(base, board, board)
+        self.profiler.mark("draw_layers")
+        self.draw_scoreboard()
+        for sprite in sprites:
+            sprite.draw(screen)
+        self.profiler.mark("draw_sprites")
+        self.latency.draw_done()
+        return previous + rects + [board]
+
+    # ------------------------------------------------------
+    def present(self, rects=None):
+        """Flip del frame, o display.update de las zonas cambiadas (medido como fase propia)."""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.startup.first_frame()
+        self.latency.flipped()
+        self.profiler.mark("flip")
+
+    # ------------------------------------------------------
+    def end_profiled_frame(self):
+        if self.publisher is not None:
+            self.publisher.capture()
+        if self.recorder is not None:
+            self.recorder.record_frame()
+        if self.ingest is not None:
+            self.profiler.set_counter("mqtt_msgs", self.ingest.messages)
+            self.ingest.messages = 0
+        self.profiler.end_frame()
+
+        # Ya se presentó el frame: recolectar basura solo si sobra tiempo
+        if self.frame_gc is not None and self.frame_gc.active:
+            self.frame_gc.in_frame = False
+            self.frame_gc.between_frames(self.frame_deadline,
+                                         idle=self.ui.state != GameState.RUNNING)
+
+    # ------------------------------------------------------
+    def handle_key(self, key):
+        """Atajos de teclado (compartidos por el loop serial y el pipelined)."""
+        if key == pygame.K_q:
+            self.scoreboard.add_point(1)
+        if key == pygame.K_w:
+            self.scoreboard.add_point(2)
+        if key == pygame.K_d:
+            self.debug = not self.debug
+        if key == pygame.K_ESCAPE:
+            self.ui.toggle_pause()
+        if key == pygame.K_r:
+            self.reset_game()
+            self.ready_go_stage = "ready"
+            self.ui.state = GameState.FINISHED
+
+    # ------------------------------------------------------
+    def show_debug(self):
+        """Debug activado (D) y permitido por el nivel de calidad."""
+        return self.debug and self.quality.debug
+
+    # ------------------------------------------------------
+    def apply_quality(self, level):
+        """Aplica un nivel de quality.LEVELS (lo llama el FrameGovernor al cambiar)."""
+        self.quality = level
+        self.scoreboard_cache = None
+        self.partial_rects = None
+        profile = get_profile(level.physics) if level.physics else self.base_physics
+        if profile is not self.physics_profile:
+            self.set_physics_profile(profile)
+
+    # ------------------------------------------------------
+    def last_input_time(self):
+        """Instante de llegada de la entrada más reciente (para medir latencia)."""
+        times = [sample.t for sample in (p.input.latest() for p in self.players if p.input is not None)
+                 if sample is not None]
+        return max(times, default=0.0)
 
     # ------------------------------------------------------
     def run(self):
+        if self.pipelined:
+            self.run_pipelined()
+            return
+
         running = True 
-        initial_check_done = False 
-        ready_go_stage = "ready"
+        self.initial_check_done = False
+        self.stats = LoopStats("serial", 1 / 60)
 
-        while running:
-            dt = self.clock.tick(60) / 1000.0 
+        if self.track_alloc:
+            self.profiler.alloc = AllocationTracker(self.profiler.phases)
+        if self.frame_gc is not None:
+            self.frame_gc.start()
 
-            for event in pygame.event.get(): 
+        self.clock.tick()     # que el primer dt no incluya el arranque (READY? se vería cortado)
+        while running:
+            scene = self.scenes.current
+            if scene is not None and scene.is_idle():
+                # Juego detenido: dormir hasta un evento o hasta que la escena pueda cambiar
+                event = pygame.event.wait(int(1000 / scene.idle_hz))
+                events = pygame.event.get()
+                if event.type != pygame.NOEVENT:
+                    events.insert(0, event)
+                dt = self.clock.tick() / 1000.0
+            else:
+                dt = self.clock.tick(60) / 1000.0 
+                events = pygame.event.get()
+            frame_start = time.perf_counter()
+            self.frame_deadline = frame_start + 1 / 60
+            self.stats.sim_tick()
+            self.profiler.begin_frame()
+            if self.frame_gc is not None:
+                self.frame_gc.in_frame = True
+
+            for event in events: 
                 if event.type == pygame.QUIT: 
                     running = False 
 
                 if event.type == pygame.KEYDOWN: 
-                    if event.key == pygame.K_q: 
-                        self.scoreboard.add_point(1) 
-                    if event.key == pygame.K_w: 
-                        self.scoreboard.add_point(2) 
-                    if event.key == pygame.K_d: 
-                        self.debug = not self.debug 
-                    if event.key == pygame.K_ESCAPE: 
-                        self.ui.toggle_pause() 
-                    if event.key == pygame.K_r: 
-                        self.reset_game()
-                        ready_go_stage = "ready"
-                        self.ui.state = GameState.FINISHED
-
-            # --- Pantalla de Victoria / Continue ---
-            if self.ui.state == GameState.FINISHED:
-                
-                self.continue_timer += dt       # Avanza el contador mientras esté en pantalla de victoria
-                
-                action = self.handle_victory_input()
-                if action == "restart":
-                    initial_check_done = False  # volver a verificar posiciones iniciales
-                    ready_go_stage = "ready"
-                elif action == "game_over":
-                    continue                    #running = False si se quiere terminar el game
-                self.draw()
-                pygame.display.flip()
-                continue  # evitar actualizar física en este estado
-
-            # --- Comprobación inicial ---
-            if not initial_check_done:
-                # --- Secuencia READY / GO (solo una vez) ---
-                ready_go_timer = 0
-                clock = pygame.time.Clock()
-
-                while ready_go_stage != "done":
-                    dt_ready = clock.tick(60) / 1000.0
-                    ready_go_timer += dt_ready
-
-                    # Redibuja fondo + jugadores + disco completo en cada frame
-                    self.screen.blit(self.background, (0, 0))
-                    self.scoreboard.draw(self.screen, pos=(525, 70), scale=0.45)
-                    self.puck.draw(self.screen)
-                    for p in self.players:
-                        p.draw(self.screen)
-                        
-                    # Overlay semitransparente
-                    if ready_go_stage == "ready":
-                        self.ui.draw_overlay(alpha=180)
-                        intensity = min(255, int((ready_go_timer / 0.5) * 255))  # sube en 0.5 s
-                        self.ui.draw_center_text("READY?", self.ui.font, color=(intensity, intensity, intensity))
-                        pygame.display.flip()
-
-                        if ready_go_timer > 1.5:
-                            ready_go_stage = "go"
-                            ready_go_timer = 0
-
-                    elif ready_go_stage == "go":
-                        self.ui.draw_overlay(alpha=180)
-                        self.ui.draw_center_text("GO!", self.ui.font, color=(0, 255, 100))
-                        pygame.display.flip()
-
-                        if ready_go_timer > 1.0:
-                            ready_go_stage = "done"
-                            
-                # --- Ahora sí, verificar posiciones ---
-                if self.check_initial_positions():
-                    initial_check_done = True
-                    print("Jugadores listos, inicia el juego.")
-                    self.state = GameState.RUNNING
-                    self.ui.state = GameState.RUNNING
-
-                # siempre dibuja la escena mientras esperan posicionarse
-                self.draw()
-                pygame.display.flip()
-                continue
+                    self.handle_key(event.key)
+            self.feed_motion(events)
+            self.poll_inputs()
+            self.profiler.mark("events")
+
+            # --- Escena del estado actual (READY/GO, juego, pausa, warning, victoria) ---
+            self.scenes.update(dt)
+            scene = self.scenes.scene()    # si update cambió el estado, ya dibuja la nueva
+            drawn = scene.draw()           # las escenas en reposo no redibujan si nada cambió
+            if drawn:
+                self.present(None if drawn is True else drawn)
+            if self.governor is not None and not scene.is_idle():
+                self.governor.frame(time.perf_counter() - frame_start)
+            if scene.gameplay:
+                self.stats.presented(self.last_input_time())
+            self.end_profiled_frame()
+
+        self.stats.report()
+        if self.frame_gc is not None:
+            log.info("GC: %d recolecciones entre frames, %d pausas dentro de frames (máx %.2f ms)",
+                     self.frame_gc.collections, self.frame_gc.pauses_in_frame,
+                     self.frame_gc.max_pause_ms)
+            self.frame_gc.stop()
+        if self.profiler.alloc is not None:
+            self.profiler.alloc.stop()
+            self.profiler.alloc = None
+        if self.profile_csv:
+            self.profiler.export_csv(self.profile_csv)
 
-            # --- Juego normal ---
-            self.update(dt)
-            self.draw()
-            pygame.display.flip()
+    # ------------------------------------------------------
+    # MODO PIPELINED (simulación y render en hilos separados)
+    # ------------------------------------------------------
+    def sim_tick(self, dt: float):
+        """Un paso de la escena actual sin dibujar (modo pipelined y MultiTable)."""
+        self.scenes.update(dt)
+
+    # ------------------------------------------------------
+    def snapshot(self, seq: int, input_time: float) -> FrameState:
+        """Copia inmutable del estado visible del juego."""
+        return FrameState(
+            seq=seq,
+            sim_time=time.perf_counter(),
+            input_time=input_time,
+            puck_pos=self.puck.body.position,
+            player_pos=tuple(p.body.position for p in self.players),
+            team1_score=self.scoreboard.team1_score,
+            team2_score=self.scoreboard.team2_score,
+            time_left=self.scoreboard.time_left,
+            ui_state=self.ui.state,
+            result_text=self.ui.result_text,
+            warning_active=self.ui.warning_active,
+            warning_type=self.ui.warning_type,
+            continue_timer=self.continue_timer,
+            ready_go_stage=self.ready_go_stage if not self.initial_check_done else "done",
+            ready_go_timer=self.ready_go_timer,
+        )
+
+    # ------------------------------------------------------
+    def draw_state(self, state: FrameState):
+        """Dibuja un FrameState publicado por la simulación (no toca pymunk)."""
+        self.layers.draw(self.screen)
+        self.scoreboard.draw(self.screen, pos=self.scoreboard_pos, scale=self.scoreboard_scale,
+                             score=(state.team1_score, state.team2_score),
+                             time_left=state.time_left, lit_only=True)
+
+        self.puck.draw_at(self.screen, *state.puck_pos)
+        for p, (x, y) in zip(self.players, state.player_pos):
+            p.draw_at(self.screen, x, y)
+
+        if state.ready_go_stage in ("ready", "go"):
+            self.draw_ready_go(state.ready_go_stage, state.ready_go_timer)
+        else:
+            self.ui.draw(continue_timer=state.continue_timer, state=state.ui_state,
+                         result_text=state.result_text, warning_active=state.warning_active,
+                         warning_type=state.warning_type)
+
+    # ------------------------------------------------------
+    def draw_ready_go(self, stage, timer):
+        """Overlay de la secuencia READY/GO (READY? aparece en 0.5 s)."""
+        if stage == "ready":
+            intensity = min(255, int((timer / 0.5) * 255))
+            self.ui.draw_ready_go("READY?", color=(intensity, intensity, intensity))
+        elif stage == "go":
+            self.ui.draw_ready_go("GO!", color=(0, 255, 100))
+
+    # ------------------------------------------------------
+    def simulation_loop(self):
+        """Hilo de simulación: cadencia fija, publica un FrameState por paso."""
+        period = 1.0 / self.sim_hz
+        next_step = time.perf_counter()
+        seq = 0
+
+        while self.sim_running:
+            self.sim_stats.sim_tick()
+            self.profiler.begin_frame()
+
+            # Teclas recibidas desde el hilo de render
+            while True:
+                try:
+                    self.handle_key(self.commands.get_nowait())
+                except queue.Empty:
+                    break
+            self.poll_inputs()
+
+            input_time = self.last_input_time()
+            self.sim_tick(period)
+            seq += 1
+            self.frames.publish(self.snapshot(seq, input_time))
+            self.latency.draw_done()   # en este modo "dibujo" = entrega al hilo de render
+            self.end_profiled_frame()
+
+            next_step += period
+            delay = next_step - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.25:
+                next_step = time.perf_counter()   # muy atrasado: no intentar recuperar
+
+    # ------------------------------------------------------
+    def run_pipelined(self):
+        """Loop de render: eventos en el hilo principal, dibuja el estado más reciente."""
+        self.frames = TripleBuffer()
+        self.commands = queue.SimpleQueue()
+        self.sim_stats = LoopStats("pipelined", 1.0 / self.sim_hz)
+        self.render_profiler = FrameProfiler("render")
+        self.sim_running = True
+        self.initial_check_done = False
+
+        sim_thread = threading.Thread(target=self.simulation_loop, daemon=True)
+        sim_thread.start()
+
+        render = self.render_profiler
+        last_seq = -1
+        while self.sim_running:
+            render.begin_frame()
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.sim_running = False
+                if event.type == pygame.KEYDOWN:
+                    self.commands.put(event.key)
+            self.feed_motion(events)     # el hilo de simulación las toma en poll_inputs
+            render.mark("events")
+
+            state = self.frames.latest()
+            if state is not None and state.seq != last_seq:
+                last_seq = state.seq
+                self.draw_state(state)
+                if self.debug:
+                    y = self.profiler.draw_hud(self.screen)
+                    render.draw_hud(self.screen, (10, y + 10))
+                render.mark("draw_ui")
+                pygame.display.flip()
+                self.startup.first_frame()
+                self.latency.flipped()
+                render.mark("flip")
+                self.sim_stats.presented(state.input_time)
+            render.end_frame()
+
+            self.clock.tick(60)
+
+        sim_thread.join(timeout=1.0)
+        self.sim_stats.report()
+        if self.profile_csv:
+            self.profiler.export_csv(self.profile_csv)
+            render.export_csv(self.profile_csv.replace(".csv", "_render.csv"))
 
@@ -0,0 +1,143 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+# Atributos estándar de LogRecord (lo demás se considera campo estructurado)
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita cada clave de mensaje a 'burst' registros por 'interval' segundos.
+    La clave es extra={"key": ...} o, si no hay, (logger, plantilla del mensaje).
+    Los registros suprimidos se cuentan y el siguiente que pasa lleva record.suppressed.
+    Corre en el hilo que hace el log (antes de encolar), así que solo usa dicts y enteros.
+    """
+    def __init__(self, interval=5.0, burst=3):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}   # clave -> [inicio_ventana, emitidos, suprimidos]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "key", None) or (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+    def pending_summaries(self):
+        """[(clave, suprimidos)] aún no reportados (para el cierre)."""
+        with self._lock:
+            items = [(key, w[2]) for key, w in self._windows.items() if w[2]]
+            for w in self._windows.values():
+                w[2] = 0
+        return items
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que nunca bloquea: si la cola está llena descarta y cuenta."""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Sin formatear aquí: el formateo (y el traceback) lo hace el hilo escritor
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea, con los campos de extra={} incluidos."""
+    def format(self, record):
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRS:
+                data[name] = value if isinstance(value, (int, float, str, bool, type(None))) else repr(value)
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f"  (+{suppressed} similares suprimidos)"
+        return text
+
+
+class LogSystem:
+    """Cola acotada + hilo escritor (QueueListener) + límite por clave."""
+    def __init__(self, level=logging.INFO, json_path=None, console=True,
+                 queue_size=10000, interval=5.0, burst=3):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.rate_limit = RateLimitFilter(interval, burst)
+        self.handler.addFilter(self.rate_limit)
+
+        outputs = []
+        if console:
+            stream = logging.StreamHandler()
+            stream.setFormatter(ConsoleFormatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s",
+                                                 "%H:%M:%S"))
+            outputs.append(stream)
+        if json_path:
+            directory = os.path.dirname(json_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.FileHandler(json_path, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter())
+            outputs.append(file_handler)
+
+        self.listener = logging.handlers.QueueListener(self.queue, *outputs,
+                                                       respect_handler_level=True)
+        self.root = logging.getLogger()
+        self.root.setLevel(level)
+        self.root.addHandler(self.handler)
+        self.listener.start()
+
+    def shutdown(self):
+        """Reporta lo suprimido/descartado y vacía la cola."""
+        log = logging.getLogger(__name__)
+        for key, count in self.rate_limit.pending_summaries():
+            log.warning("%d mensajes suprimidos por límite de frecuencia: %s", count, key,
+                        extra={"key": ("summary", key)})
+        if self.handler.dropped:
+            log.warning("%d mensajes descartados (cola de logs llena)", self.handler.dropped)
+        self.listener.stop()
+        self.root.removeHandler(self.handler)
+
+
+def setup_logging(level="INFO", json_path=None, console=True, **kwargs):
+    """Configura el logging del juego; devuelve el LogSystem para cerrarlo al salir."""
+    if isinstance(level, str):
+        level = getattr(logging, level.upper(), logging.INFO)
+    return LogSystem(level=level, json_path=json_path, console=console, **kwargs)
@@ -1,6 +1,17 @@
+from typing import NamedTuple
+
 import pygame
 import pymunk
 
+
+class GoalCrossing(NamedTuple):
+    """Dónde y cuándo el puck entró al área de gol (Game.last_goal)."""
+    team: int
+    t: float               # perf_counter() del instante del cruce dentro del subpaso
+    x: float
+    y: float
+
+
 class Goal:
     def __init__(self, space, x, y, width, height, team: int):
         """
@@ -21,12 +32,41 @@ class Goal:
             (x + width - 1, y + height + 102),
             (x - 1, y + height + 102)
         ]
+        self.left, self.top = vs[0]
+        self.right, self.bottom = vs[2]
         self.shape = pymunk.Poly(self.body, vs)
         self.shape.sensor = True   # <- no bloquea el puck, solo detecta
         self.shape.collision_type = 10 + team  # cada portería tiene un tipo distinto
 
         space.add(self.body, self.shape)
 
+    def sweep(self, x0, y0, x1, y1, radius):
+        """
+        Fracción (0..1) del recorrido (x0, y0) → (x1, y1) en que un círculo de 'radius' empieza
+        a tocar el área de gol, o None si en ese tramo no entra (o ya estaba adentro).
+        El área se agranda en el radio con esquinas rectas (método de las franjas).
+        """
+        enter, leave = 0.0, 1.0
+        for p, d, lo, hi in ((x0, x1 - x0, self.left - radius, self.right + radius),
+                             (y0, y1 - y0, self.top - radius, self.bottom + radius)):
+            if d == 0:
+                if p < lo or p > hi:
+                    return None
+                continue
+            a = (lo - p) / d
+            b = (hi - p) / d
+            if a > b:
+                a, b = b, a
+            if a > enter:
+                enter = a
+            if b < leave:
+                leave = b
+            if enter > leave:
+                return None
+        if enter <= 0.0:
+            return None
+        return enter
+
     def draw_debug(self, screen):
         # Dibujamos solo para debug (azul)
         points = [(v[0], v[1]) for v in self.shape.get_vertices()]
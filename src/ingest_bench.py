@@ -0,0 +1,97 @@
+"""
+Costo del frame según la carga de mocap/all: ingest en un hilo del juego (MocapIngest) contra
+ingest en otro proceso (mocap_process.ProcessIngest).
+
+Un generador entrega payloads de mocap/all (2 markers del juego y 6 ajenos) a la tasa pedida,
+sin broker: en modo "thread" desde un hilo del propio juego, en modo "process" dentro del
+proceso de ingest. Mientras tanto el juego corre frames a 60 fps (poll, update y draw) y se
+mide cuánto tarda cada frame. Con el ingest en otro proceso el tiempo de frame no debería
+crecer con la tasa (si la PC tiene un núcleo libre para el hijo).
+
+Uso (desde src/):
+    python ingest_bench.py
+    python ingest_bench.py --rates 0,2000,8000 --seconds 5
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import statistics
+import threading
+import time
+
+import pygame
+
+
+def run_mode(screen, mode, rate, seconds):
+    from game import Game
+    from input_providers import MocapProvider
+    from mocap import MocapIngest
+    from mocap_process import ProcessIngest, flood
+    from ui_manager import GameState
+
+    size = screen.get_size()
+    ingest = ProcessIngest(size, flood_hz=rate) if mode == "process" else MocapIngest(size)
+    game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[MocapProvider("65"), MocapProvider("69")], ingest=ingest)
+    ingest.start(connect=False)
+    ingest.wait_ready(10)
+    stop = threading.Event()
+    if mode == "thread" and rate > 0:
+        threading.Thread(target=flood, args=(ingest.mqtt_on_message, rate, stop),
+                         daemon=True).start()
+
+    game.initial_check_done = True
+    frame_ms = []
+    period = 1 / 60
+    next_t = time.perf_counter()
+    end = next_t + seconds
+    while next_t < end:
+        game.ui.state = GameState.RUNNING
+        game.ui.timer = 120
+        t = time.perf_counter()
+        game.poll_inputs()
+        game.update(period)
+        game.draw()
+        frame_ms.append((time.perf_counter() - t) * 1000)
+        next_t += period
+        delay = next_t - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    stop.set()
+    game.ingest.poll()
+    received = ingest.total
+    ingest.stop()
+    frame_ms.sort()
+    return {
+        "frame_ms_p50": statistics.median(frame_ms),
+        "frame_ms_p99": frame_ms[int(len(frame_ms) * 0.99)],
+        "frame_ms_max": frame_ms[-1],
+        "msgs_per_s": received / seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de frame contra carga de mocap/all")
+    parser.add_argument("--rates", default="0,1000,4000,10000",
+                        help="mensajes por segundo a probar, separados por coma")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duración de cada corrida")
+    parser.add_argument("--modes", default="thread,process")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    print(f"{os.cpu_count()} núcleos; {args.seconds:g} s por corrida")
+    print(f"{'modo':<9}{'tasa':>7}{'recibidos/s':>13}{'frame p50':>11}{'p99':>8}{'máx':>8}")
+    for mode in args.modes.split(","):
+        for rate in (int(r) for r in args.rates.split(",")):
+            r = run_mode(screen, mode, rate, args.seconds)
+            print(f"{mode:<9}{rate:>7}{r['msgs_per_s']:>13.0f}{r['frame_ms_p50']:>11.2f}"
+                  f"{r['frame_ms_p99']:>8.2f}{r['frame_ms_max']:>8.2f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
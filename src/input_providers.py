@@ -0,0 +1,348 @@
+import collections
+import math
+import time
+from typing import NamedTuple
+
+import pygame
+
+from mocap import DEFAULT_SMOOTHING
+from ui_manager import GameState
+
+
+class InputSample(NamedTuple):
+    """Última posición objetivo de un jugador (coordenadas de pantalla)."""
+    x: float
+    y: float
+    t: float               # perf_counter() en que llegó/se leyó la entrada
+    sample: object = None  # MarkerSample para medir latencia (solo mocap)
+
+
+class InputProvider:
+    """
+    Fuente de posiciones para un Player.
+    latest() nunca bloquea: devuelve la última InputSample o None si aún no hay datos.
+    poll() se llama una vez por paso desde el loop del juego (las fuentes push no lo necesitan).
+    """
+    name = "input"
+
+    def __init__(self):
+        self._latest = None
+
+    def attach(self, game, index):
+        """Se llama al asignar el provider al jugador 'index' del juego."""
+        self.index = index
+
+    def latest(self):
+        return self._latest
+
+    def samples_between(self, t0, t1):
+        """Muestras con t0 < t <= t1 en orden de llegada (para mover al jugador por subpaso)."""
+        sample = self._latest
+        if sample is not None and t0 < sample.t <= t1:
+            return (sample,)
+        return ()
+
+    def poll(self, game, now):
+        pass
+
+    def motion(self, positions, now):
+        """Posiciones de los MOUSEMOTION de una tanda de eventos (solo las usa MouseProvider)."""
+        pass
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+
+# ------------------------------------------------------
+class MocapProvider(InputProvider):
+    """
+    Marker del Robotat; lo alimenta MocapIngest desde el hilo de MQTT.
+    smoothing: parámetros del OneEuroFilter del marker (None = sin filtro).
+    placement: (centro mm, ángulo) de una homografía propia, si no usa la de la mesa.
+    """
+    def __init__(self, identifier, smoothing=DEFAULT_SMOOTHING, placement=None):
+        super().__init__()
+        self.identifier = str(identifier)
+        self.name = f"mocap:{self.identifier}"
+        self.smoothing = smoothing
+        self.placement = placement
+        # Muestras recientes (120 Hz: ~0.5 s) para recorrer todas las del frame, no solo la última
+        self._history = collections.deque(maxlen=64)
+
+    def push(self, x, y, sample):
+        # Una sola asignación: el hilo de juego lee siempre una muestra completa
+        latest = InputSample(x, y, sample.recv, sample)
+        self._history.append(latest)
+        self._latest = latest
+
+    def samples_between(self, t0, t1):
+        # tuple() copia el deque sin soltar el GIL: el hilo de MQTT no lo cambia a la mitad
+        return [s for s in tuple(self._history) if t0 < s.t <= t1]
+
+
+# ------------------------------------------------------
+class MouseProvider(InputProvider):
+    """
+    Posición del mouse (la versión de pruebas locales, antes juego_sin_markers).
+    El loop entrega todos los MOUSEMOTION de cada tanda de eventos (Game.feed_motion), así que
+    un golpe rápido llega a la física con su trayectoria completa y no solo con la última
+    posición del frame. pygame no trae la hora de cada evento: se reparten en partes iguales
+    entre la tanda anterior y esta (a lo sumo max_span s hacia atrás).
+    """
+    name = "mouse"
+
+    def __init__(self, max_span=0.05):
+        super().__init__()
+        self.max_span = max_span
+        self._history = collections.deque(maxlen=128)
+        self._batch_time = None       # perf_counter() de la última tanda de eventos
+
+    def motion(self, positions, now):
+        previous = self._batch_time
+        self._batch_time = now
+        if not positions:
+            return
+        span = 0.0 if previous is None else min(now - previous, self.max_span)
+        n = len(positions)
+        for k, (x, y) in enumerate(positions, 1):
+            self._history.append(InputSample(x, y, now - span * (n - k) / n))
+        self._latest = self._history[-1]
+
+    def samples_between(self, t0, t1):
+        return [s for s in tuple(self._history) if t0 < s.t <= t1]
+
+    def poll(self, game, now):
+        # Sin eventos todavía, o nadie los entrega (p. ej. MultiTable): una posición por paso
+        if self._batch_time is None or self._latest is None:
+            x, y = pygame.mouse.get_pos()
+            self._latest = InputSample(x, y, now)
+            self._history.append(self._latest)
+
+
+# ------------------------------------------------------
+class KeyboardProvider(InputProvider):
+    """
+    Mueve el objetivo con el teclado a velocidad constante.
+    Por defecto flechas; "ijkl" para un segundo jugador (WASD choca con los atajos q/w/d).
+    """
+    KEYSETS = {
+        "arrows": (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT),
+        "ijkl": (pygame.K_i, pygame.K_k, pygame.K_j, pygame.K_l),
+    }
+
+    def __init__(self, keys="arrows", speed=900):
+        super().__init__()
+        self.name = f"keyboard:{keys}"
+        self.keys = self.KEYSETS[keys]
+        self.speed = speed
+        self._last = None
+
+    def attach(self, game, index):
+        super().attach(game, index)
+        x, y = game.players[index].body.position
+        self._latest = InputSample(x, y, time.perf_counter())
+
+    def poll(self, game, now):
+        dt = 0.0 if self._last is None else min(now - self._last, 0.1)
+        self._last = now
+        pressed = pygame.key.get_pressed()
+        up, down, left, right = self.keys
+        dx = pressed[right] - pressed[left]
+        dy = pressed[down] - pressed[up]
+        x, y = self._latest.x, self._latest.y
+        if dx or dy:
+            step = self.speed * dt / math.hypot(dx, dy)
+            rect = game.rink.rect
+            x = max(rect.left, min(rect.right, x + dx * step))
+            y = max(rect.top, min(rect.bottom, y + dy * step))
+        self._latest = InputSample(x, y, now)
+
+
+# ------------------------------------------------------
+class ReplayProvider(InputProvider):
+    """
+    Reproduce un marker grabado (jsonl de mocap/all, ver mocap.load_replay) con su temporización.
+    Usa su propio MocapIngest sin broker para aplicar la misma homografía que en el laboratorio.
+    """
+    def __init__(self, path, identifier=None, loop=True):
+        super().__init__()
+        from mocap import load_replay
+        self.name = f"replay:{path}"
+        self.records = load_replay(path)
+        self.identifier = identifier
+        self.loop = loop
+        self._next = 0
+        self._start = None
+        self._marker = None
+        self._ingest = None
+
+    def attach(self, game, index):
+        super().attach(game, index)
+        from mocap import MocapIngest
+        if self.identifier is None:
+            # Sin identificador: el del marker que controla este jugador en el laboratorio
+            self.identifier = ("65", "69")[index] if index < 2 else str(index)
+        self._marker = MocapProvider(self.identifier)
+        self._ingest = MocapIngest(game.screen.get_size(), latency=game.latency)
+        self._ingest.register(self._marker)
+        self._ingest.start(connect=False)
+
+    def poll(self, game, now):
+        from mocap import FakeMessage
+        if not self.records or not self._ingest.ready.is_set():
+            return
+        if self._start is None:
+            self._start = now
+        elapsed = now - self._start
+        while self._next < len(self.records) and self.records[self._next][0] <= elapsed:
+            self._ingest.mqtt_on_message(None, None, FakeMessage(self.records[self._next][1]))
+            self._next += 1
+        if self._next >= len(self.records) and self.loop:
+            self._next = 0
+            self._start = now
+        self._latest = self._marker.latest()
+
+    def samples_between(self, t0, t1):
+        return self._marker.samples_between(t0, t1) if self._marker is not None else ()
+
+
+# ------------------------------------------------------
+class ComputerProvider(InputProvider):
+    """
+    Oponente simple: defiende su portería y ataca el puck cuando entra en su mitad.
+    Se mueve a velocidad limitada, nunca cruza el centro ni entra al círculo central (lo que
+    dispararía el warning "center"), y fuera de RUNNING espera en su posición de inicio.
+    """
+    def __init__(self, speed=700, reaction=0.08):
+        super().__init__()
+        self.name = "computer"
+        self.speed = speed
+        self.reaction = reaction     # segundos de anticipación sobre la velocidad del puck
+        self._last = None
+
+    def attach(self, game, index):
+        super().attach(game, index)
+        x, y = game.players[index].body.position
+        self._latest = InputSample(x, y, time.perf_counter())
+        self.left_side = x < game.rink.rect.centerx
+
+    def poll(self, game, now):
+        dt = 0.0 if self._last is None else min(now - self._last, 0.1)
+        self._last = now
+
+        rect = game.rink.rect
+        cx, cy = rect.center
+        left_side = self.left_side
+        home_x = rect.left + 120 if left_side else rect.right - 120
+        goal_x = rect.right if left_side else rect.left      # portería rival
+        reach = game.players[self.index].radius + game.puck.radius
+
+        radius = game.players[self.index].radius
+        keep_out = game.center_radius + 25 + radius     # ver Game.check_initial_positions
+
+        px, py = game.puck.body.position
+        vx, vy = game.puck.body.velocity
+        resting_center = (math.hypot(vx, vy) < 20
+                          and math.hypot(px - cx, py - cy) < game.center_radius + 25)
+        px += vx * self.reaction
+        py += vy * self.reaction
+        x, y = self._latest.x, self._latest.y
+
+        # Un puck justo en la línea central no es de ningún lado
+        own_half = px < cx if left_side else px > cx
+        if game.ui.state != GameState.RUNNING or not game.initial_check_done or resting_center:
+            own_half = False
+            py = cy
+        behind = px < x - 10 if left_side else px > x + 10
+        if own_half and behind:
+            # El puck quedó entre el jugador y su portería: rodearlo sin empujarlo hacia atrás
+            tx = home_x
+            ty = py + (reach * 1.5 if y >= py else -reach * 1.5)
+        elif own_half:
+            # Golpear desde atrás en dirección a la portería rival
+            dx, dy = goal_x - px, cy - py
+            dist = math.hypot(dx, dy) or 1.0
+            tx = px - dx / dist * reach * 0.5
+            ty = py - dy / dist * reach * 0.5
+        else:
+            tx, ty = home_x, cy + (py - cy) * 0.5
+
+        # Nunca cruzar la línea central ni entrar al círculo central
+        if left_side:
+            tx = min(tx, cx - radius)
+        else:
+            tx = max(tx, cx + radius)
+        ox, oy = tx - cx, ty - cy
+        d = math.hypot(ox, oy)
+        if d < keep_out:
+            if d < 1e-6:
+                ox, oy, d = (-1.0 if left_side else 1.0), 0.0, 1.0
+            tx, ty = cx + ox / d * keep_out, cy + oy / d * keep_out
+
+        dx, dy = tx - x, ty - y
+        dist = math.hypot(dx, dy)
+        step = self.speed * dt
+        if dist > step > 0:
+            x += dx / dist * step
+            y += dy / dist * step
+        elif dist <= step:
+            x, y = tx, ty
+        self._latest = InputSample(x, y, now)
+
+
+# ------------------------------------------------------
+def provider_from_spec(spec, smoothing=DEFAULT_SMOOTHING):
+    """
+    Construye un provider desde texto (línea de comandos):
+    mocap:65, mouse, keyboard, keyboard:ijkl, computer, replay:ruta.jsonl[@65]
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "mocap":
+        return MocapProvider(arg, smoothing)
+    if kind == "mouse":
+        return MouseProvider()
+    if kind == "keyboard":
+        return KeyboardProvider(arg or "arrows")
+    if kind == "computer":
+        return ComputerProvider()
+    if kind == "replay":
+        path, _, identifier = arg.partition("@")
+        return ReplayProvider(path, identifier or None)
+    raise ValueError(f"provider de entrada desconocido: {spec}")
+
+
+# ------------------------------------------------------
+def load_marker_config(path):
+    """
+    Registro de markers desde un JSON, para partidos de N jugadores y objetos rastreados:
+
+        {"markers": [
+            {"id": "65", "team": 1},
+            {"id": "69", "team": 2},
+            {"id": "71", "team": 1, "filter": {"min_cutoff": 1.0, "beta": 0.5}},
+            {"id": "73", "team": 2},
+            {"id": "80", "prop": "puck", "center": [4, 41], "angle_deg": 180}
+        ]}
+
+    "filter" activa el suavizado One-Euro del marker (sin "filter" va crudo); "center"/"angle_deg"
+    dan al marker una homografía propia. Devuelve (inputs, teams, props).
+    """
+    import json
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["markers"]
+
+    inputs, teams, props = [], [], {}
+    for entry in entries:
+        placement = None
+        if "center" in entry:
+            placement = (tuple(entry["center"]), entry.get("angle_deg", 180))
+        provider = MocapProvider(entry["id"], entry.get("filter", DEFAULT_SMOOTHING), placement)
+        if "prop" in entry:
+            props[entry["prop"]] = provider
+        else:
+            inputs.append(provider)
+            teams.append(int(entry.get("team", 1 + len(teams) % 2)))
+    return inputs, teams, props
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+import time
+from array import array
+
+# Etapas del camino marker → fotón (cada una mide desde la etapa anterior)
+STAGES = (
+    "mocap_to_recv",    # timestamp del mocap → llegada al cliente MQTT (requiere relojes sincronizados)
+    "recv_to_decode",   # JSON + homografía
+    "decode_to_use",    # espera hasta que Player.update toma la muestra
+    "use_to_physics",   # hasta que un space.step mueve el mallet hacia ese target
+    "physics_to_draw",  # hasta que se dibuja la escena
+    "draw_to_flip",     # hasta que termina pygame.display.flip
+    "recv_to_flip",     # total dentro del proceso
+)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con bins logarítmicos fijos (0.01 ms – 10 s)."""
+    BINS_PER_DECADE = 20
+    MIN_MS = 0.01
+    DECADES = 6
+
+    def __init__(self):
+        self.counts = array("L", bytes(array("L").itemsize * (self.BINS_PER_DECADE * self.DECADES + 1)))
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        if ms <= self.MIN_MS:
+            idx = 0
+        else:
+            idx = min(len(self.counts) - 1,
+                      int(math.log10(ms / self.MIN_MS) * self.BINS_PER_DECADE))
+        self.counts[idx] += 1
+        self.n += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def bin_upper(self, idx):
+        return self.MIN_MS * 10 ** ((idx + 1) / self.BINS_PER_DECADE)
+
+    def percentile(self, q):
+        """Cota superior del bin que contiene el percentil q."""
+        if self.n == 0:
+            return 0.0
+        target = q * self.n
+        acc = 0
+        for idx, count in enumerate(self.counts):
+            acc += count
+            if acc >= target:
+                return min(self.bin_upper(idx), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "n": self.n,
+            "mean_ms": self.total / self.n if self.n else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max,
+        }
+
+
+class MarkerSample:
+    """Timestamps de una muestra de marker a lo largo del pipeline."""
+    __slots__ = ("seq", "mocap_ts", "recv", "decoded", "used", "physics", "drawn")
+
+    def __init__(self, seq, mocap_ts, recv, decoded):
+        self.seq = seq
+        self.mocap_ts = mocap_ts    # time.time() del sistema de captura (o None)
+        self.recv = recv            # perf_counter()
+        self.decoded = decoded
+        self.used = self.physics = self.drawn = 0.0
+
+
+class LatencyTracker:
+    """
+    Sigue cada muestra de marker desde su llegada hasta el flip que la muestra.
+    Se llama desde el hilo del juego (used/physics/drawn/flipped) y desde el hilo MQTT (received).
+    """
+    def __init__(self, log_path=None):
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.log_path = log_path
+        self.pending = []     # muestras tomadas por Player.update, esperando un space.step
+        self.stepped = []     # ya afectaron la física, esperando dibujo
+        self.drawn = []       # dibujadas, esperando flip
+        self._last_used = {}  # jugador -> seq de la última muestra contabilizada
+        self.match_start = time.time()
+
+    # ------------------------------------------------------
+    def received(self, mocap_ts, recv_wall):
+        """Etapa mocap → recepción (solo si el payload trae timestamp)."""
+        if mocap_ts:
+            delay_ms = (recv_wall - mocap_ts) * 1000
+            if 0 <= delay_ms < 10_000:   # descarta relojes claramente desincronizados
+                self.histograms["mocap_to_recv"].add(delay_ms)
+
+    def used(self, player_idx, sample):
+        """Player.update tomó la muestra (solo se cuenta la primera vez)."""
+        if sample is None or self._last_used.get(player_idx) == sample.seq:
+            return
+        self._last_used[player_idx] = sample.seq
+        sample.used = time.perf_counter()
+        self.pending.append(sample)
+
+    def physics_done(self):
+        if self.pending:
+            now = time.perf_counter()
+            for sample in self.pending:
+                sample.physics = now
+            self.stepped.extend(self.pending)
+            self.pending.clear()
+
+    def draw_done(self):
+        if self.stepped:
+            now = time.perf_counter()
+            for sample in self.stepped:
+                sample.drawn = now
+            self.drawn.extend(self.stepped)
+            self.stepped.clear()
+
+    def flipped(self):
+        if not self.drawn:
+            return
+        now = time.perf_counter()
+        h = self.histograms
+        drawn, self.drawn = self.drawn, []   # en modo pipelined draw_done corre en otro hilo
+        for s in drawn:
+            h["recv_to_decode"].add((s.decoded - s.recv) * 1000)
+            h["decode_to_use"].add((s.used - s.decoded) * 1000)
+            h["use_to_physics"].add((s.physics - s.used) * 1000)
+            h["physics_to_draw"].add((s.drawn - s.physics) * 1000)
+            h["draw_to_flip"].add((now - s.drawn) * 1000)
+            h["recv_to_flip"].add((now - s.recv) * 1000)
+
+    # ------------------------------------------------------
+    def summary(self):
+        return {stage: h.summary() for stage, h in self.histograms.items()}
+
+    def hud_lines(self):
+        lines = ["latencia        p50     p95"]
+        for stage, h in self.histograms.items():
+            if h.n:
+                lines.append(f"{stage:<15}{h.percentile(0.5):6.2f} {h.percentile(0.95):7.2f}")
+        return lines
+
+    def end_match(self, **info):
+        """Registra el resumen del partido (una línea JSON) y reinicia los histogramas."""
+        if self.log_path and any(h.n for h in self.histograms.values()):
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            record = {
+                "start": self.match_start,
+                "end": time.time(),
+                **info,
+                "stages": self.summary(),
+            }
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.match_start = time.time()
+
+
+def mocap_timestamp(data):
+    """Timestamp del sistema de captura en segundos epoch (acepta s, ms o ns), o None."""
+    ts = data.get("timestamp")
+    if ts is None:
+        ts = data.get("payload", {}).get("timestamp")
+    if not isinstance(ts, (int, float)) or ts <= 0:
+        return None
+    if ts > 1e17:
+        return ts / 1e9
+    if ts > 1e11:
+        return ts / 1e3
+    return float(ts)
+
+
+def check_budgets(summary, budgets):
+    """Devuelve la lista de (etapa, p95, presupuesto) que exceden el presupuesto."""
+    failures = []
+    for stage, budget_ms in budgets.items():
+        stats = summary.get(stage)
+        if stats and stats["n"] and stats["p95_ms"] > budget_ms:
+            failures.append((stage, stats["p95_ms"], budget_ms))
+    return failures
@@ -0,0 +1,123 @@
+"""
+Modo de prueba de latencia guiado por replay (sin ventana ni broker).
+
+Reproduce payloads de mocap con su temporización original contra MocapIngest.mqtt_on_message
+mientras el juego corre su loop normal, y verifica los presupuestos de latencia por etapa.
+
+Uso (desde src/):
+    python latency_check.py                                  # payloads sintéticos a 120 Hz
+    python latency_check.py --replay mocap.jsonl --seconds 20
+    python latency_check.py --budget recv_to_flip=40 --budget recv_to_decode=1
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import threading
+import time
+
+import pygame
+
+from benchmark import sample_payloads
+from mocap import FakeMessage, load_replay
+from latency import STAGES, check_budgets
+
+# Presupuestos por defecto (p95, ms)
+DEFAULT_BUDGETS = {
+    "recv_to_decode": 2.0,
+    "decode_to_use": 25.0,
+    "draw_to_flip": 20.0,
+    "recv_to_flip": 60.0,
+}
+
+
+def replay_feeder(game, records, stop):
+    """Hilo que imita a paho: entrega cada payload en su instante relativo."""
+    start = time.perf_counter()
+    duration = records[-1][0] + 1 / 120.0 if records else 0.0
+    loop = 0
+    while not stop.is_set():
+        base = start + loop * duration
+        for t, payload in records:
+            delay = base + t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if stop.is_set():
+                return
+            game.ingest.mqtt_on_message(None, None, FakeMessage(payload))
+        loop += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificación de presupuestos de latencia")
+    parser.add_argument("--replay", help="payloads grabados (jsonl)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--budget", action="append", default=[], metavar="ETAPA=MS",
+                        help=f"presupuesto p95 por etapa ({', '.join(STAGES)})")
+    parser.add_argument("--log", help="añadir el resumen a este jsonl de latencias")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        stage, ms = item.split("=")
+        if stage not in STAGES:
+            parser.error(f"etapa desconocida: {stage}")
+        budgets[stage] = float(ms)
+
+    if args.replay:
+        records = load_replay(args.replay)
+    else:
+        records = [(i / 120.0, p) for i, p in enumerate(sample_payloads(240))]
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+
+    from game import Game
+    from ui_manager import GameState
+    game = Game(screen, use_mqtt=False, latency_log=args.log)
+    game.ingest.wait_ready()
+    game.initial_check_done = True
+    game.ui.state = GameState.RUNNING
+
+    stop = threading.Event()
+    feeder = threading.Thread(target=replay_feeder, args=(game, records, stop), daemon=True)
+    feeder.start()
+
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        dt = game.clock.tick(60) / 1000.0
+        pygame.event.pump()
+        game.update(dt)
+        if game.ui.state != GameState.RUNNING:
+            # Goles o warnings no interesan aquí: el partido sigue corriendo
+            game.ui.state = GameState.RUNNING
+            game.ui.warning_active = False
+        game.draw()
+        game.present()
+
+    stop.set()
+    feeder.join(timeout=1.0)
+
+    summary = game.latency.summary()
+    print(f"{'etapa':<16}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}   presupuesto")
+    for stage in STAGES:
+        s = summary[stage]
+        budget = budgets.get(stage)
+        budget_text = f"{budget:.1f} ms" if budget is not None else "-"
+        print(f"{stage:<16}{s['n']:>7}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}"
+              f"{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}   {budget_text}")
+
+    game.latency.end_match(result="latency_check")
+    pygame.quit()
+
+    failures = check_budgets(summary, budgets)
+    if failures:
+        for stage, p95, budget in failures:
+            print(f"FALLA: {stage} p95={p95:.2f} ms > {budget:.2f} ms")
+        raise SystemExit(1)
+    print("Todos los presupuestos de latencia se cumplen.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import pygame
+
+
+class Layer:
+    """
+    Capa estática: una función que dibuja sobre una superficie.
+    Solo se vuelve a dibujar cuando cambia la pila (resolución, capas activas o invalidate()).
+    """
+    def __init__(self, name, build, enabled=None):
+        self.name = name
+        self.build = build              # build(surface) dibuja la capa
+        self.enabled = enabled          # callable -> bool (None = siempre activa)
+        self.version = 0
+
+    def is_enabled(self):
+        return self.enabled is None or bool(self.enabled())
+
+    def invalidate(self):
+        """Forzar que la capa se recomponga en el próximo frame."""
+        self.version += 1
+
+
+class LayerStack:
+    """Compone las capas estáticas una sola vez en una superficie cacheada."""
+    def __init__(self):
+        self.layers = []
+        self.surface = None
+        self._key = None
+        self.rebuilds = 0
+
+    def add(self, layer: Layer):
+        self.layers.append(layer)
+        self._key = None
+        return layer
+
+    def get(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def invalidate(self):
+        self._key = None
+
+    def _current_key(self, size):
+        return (size,) + tuple((layer.is_enabled(), layer.version) for layer in self.layers)
+
+    def rebuild(self, size):
+        """Recompone todas las capas activas en una superficie opaca."""
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert()
+        self.surface.fill((0, 0, 0))
+        for layer in self.layers:
+            if layer.is_enabled():
+                layer.build(self.surface)
+        self.rebuilds += 1
+
+    def is_current(self, size):
+        """True si la composición cacheada ya corresponde a este tamaño y estas capas."""
+        return self._key == self._current_key(size)
+
+    def draw(self, screen):
+        """Blitea la composición cacheada (reconstruye solo si cambió algo)."""
+        size = screen.get_size()
+        key = self._current_key(size)
+        if key != self._key:
+            self.rebuild(size)
+            self._key = key
+        screen.blit(self.surface, (0, 0))
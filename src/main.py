@@ -1,15 +1,138 @@
+import time
+T0 = time.perf_counter()   # antes de importar pygame/pymunk: cuenta para el arranque
+
+import argparse
 import pygame
 from game import Game
+from game_log import setup_logging
+from input_providers import load_marker_config, provider_from_spec
+from physics_profiles import DEFAULT_PROFILE, PROFILES
+from startup import StartupTimer
 
 def main():
+    parser = argparse.ArgumentParser(description="Air Hockey 2D")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="simulación en un hilo a cadencia fija, render desacoplado")
+    parser.add_argument("--sim-hz", type=int, default=120,
+                        help="frecuencia de la simulación en modo pipelined")
+    parser.add_argument("--profile-csv", metavar="RUTA",
+                        help="exportar los tiempos por fase de los últimos frames al salir")
+    parser.add_argument("--latency-log", metavar="RUTA", default="../logs/latency.jsonl",
+                        help="resumen de latencia marker→pantalla por partido (jsonl)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="servir métricas Prometheus en este puerto (/metrics, /metrics.json)")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                        help="interfaz del endpoint de métricas (0.0.0.0 para verlo desde la red)")
+    parser.add_argument("--metrics-snapshot", metavar="RUTA", default=None,
+                        help="escribir un JSON con las métricas cada 5 s")
+    parser.add_argument("--track-alloc", action="store_true",
+                        help="diagnóstico: asignaciones de memoria por fase con tracemalloc (lento)")
+    parser.add_argument("--no-gc-control", action="store_true",
+                        help="dejar el GC automático de Python en lugar de recolectar entre frames")
+    parser.add_argument("--p1", default="mocap:65", metavar="FUENTE",
+                        help="entrada del jugador 1: mocap:ID, mouse, keyboard[:ijkl], computer, "
+                             "replay:RUTA[@ID]")
+    parser.add_argument("--p2", default="mocap:69", metavar="FUENTE",
+                        help="entrada del jugador 2 (mismas opciones que --p1)")
+    parser.add_argument("--p3", default=None, metavar="FUENTE",
+                        help="tercer jugador (equipo 1) para partidos 2v2")
+    parser.add_argument("--p4", default=None, metavar="FUENTE",
+                        help="cuarto jugador (equipo 2) para partidos 2v2")
+    parser.add_argument("--markers", metavar="RUTA", default=None,
+                        help="registro de markers en JSON (jugadores, equipos, props, filtro y "
+                             "homografía por marker); reemplaza --p1..--p4")
+    parser.add_argument("--mocap-filter", default="off", metavar="MIN_CUTOFF,BETA",
+                        help="suavizado One-Euro de cada marker (Hz, s/mm; p. ej. 1.0,0.5); "
+                             "por defecto 'off' (posición cruda)")
+    parser.add_argument("--walls", choices=("python", "solver"), default="python",
+                        help="rebotes del puck: reflexión en Python una vez por frame, o resueltos "
+                             "por pymunk en cada subpaso (ver wall_modes.py)")
+    parser.add_argument("--physics", choices=tuple(PROFILES), default=DEFAULT_PROFILE,
+                        help="perfil de física: ajustes del solver y subpasos por frame "
+                             "(ver physics_bench.py)")
+    parser.add_argument("--governor", action="store_true",
+                        help="bajar la calidad (debug, marcador, presentación, física) si los "
+                             "frames no entran en 16.7 ms (ver quality.py; loop serial de una mesa)")
+    parser.add_argument("--ingest-process", action="store_true",
+                        help="MQTT, JSON y homografía en un proceso aparte (memoria compartida)")
+    parser.add_argument("--table", action="append", default=[], metavar="IDS[@CX,CY]",
+                        help="una mesa por opción (p. ej. --table 65,69 --table 71,73@4,1600): "
+                             "varias mesas en un proceso, una proyección de 1920x1080 cada una")
+    parser.add_argument("--table-workers", type=int, default=None,
+                        help="hilos para la física de las mesas (por defecto uno por mesa)")
+    parser.add_argument("--publish-hz", type=float, default=0,
+                        help="publicar el estado (binario) a esta frecuencia; 0 = no publicar")
+    parser.add_argument("--publish-broker", default="192.168.50.200:1880", metavar="HOST:PUERTO",
+                        help="broker MQTT para el estado publicado (tópico airhockey/state)")
+    parser.add_argument("--record", metavar="DIR", default="../recordings",
+                        help="grabar cada partido (columnar, ver replay_viewer.py) en este directorio")
+    parser.add_argument("--no-record", action="store_true", help="no grabar los partidos")
+    parser.add_argument("--startup-budget-ms", type=float, default=1500,
+                        help="avisar si el primer frame tarda más que esto desde el arranque")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--log-file", metavar="RUTA", default="../logs/game.jsonl",
+                        help="logs estructurados (un JSON por línea)")
+    args = parser.parse_args()
+
+    startup = StartupTimer(T0, budget_ms=args.startup_budget_ms)
+    startup.mark("imports")
+    logs = setup_logging(args.log_level, json_path=args.log_file)
+
     pygame.init()
-    screen = pygame.display.set_mode((1920, 1080))
+    screen = pygame.display.set_mode((1920 * max(1, len(args.table)), 1080))
     pygame.display.set_caption("Air Hockey 2D")
+    startup.mark("display")
+
+    if args.table:
+        from multi_table import MultiTable, parse_table_spec
+        tables = MultiTable(screen, [parse_table_spec(t) for t in args.table],
+                            workers=args.table_workers, latency_log=args.latency_log,
+                            profile_csv=args.profile_csv, startup=startup,
+                            record_dir=None if args.no_record else args.record,
+                            physics=args.physics, ingest_process=args.ingest_process)
+        try:
+            tables.run()
+        finally:
+            pygame.quit()
+            logs.shutdown()
+        return
 
-    game = Game(screen)
-    game.run()
+    if args.markers:
+        inputs, teams, props = load_marker_config(args.markers)
+    else:
+        smoothing = None
+        if args.mocap_filter != "off":
+            min_cutoff, beta = (float(v) for v in args.mocap_filter.split(","))
+            smoothing = {"min_cutoff": min_cutoff, "beta": beta}
+        specs = [s for s in (args.p1, args.p2, args.p3, args.p4) if s]
+        inputs, teams, props = [provider_from_spec(s, smoothing) for s in specs], None, None
 
-    pygame.quit()
+    game = Game(screen, pipelined=args.pipelined, sim_hz=args.sim_hz,
+                profile_csv=args.profile_csv, latency_log=args.latency_log,
+                metrics_port=args.metrics_port, metrics_host=args.metrics_host,
+                metrics_snapshot=args.metrics_snapshot,
+                gc_control=not args.no_gc_control, track_alloc=args.track_alloc,
+                inputs=inputs, teams=teams, props=props, startup=startup, walls=args.walls,
+                physics=args.physics, ingest_process=args.ingest_process, governor=args.governor)
+    if args.publish_hz > 0:
+        from state_publisher import StatePublisher
+        host, _, port = args.publish_broker.partition(":")
+        game.publisher = StatePublisher(game, host, int(port or 1883),
+                                        rate_hz=args.publish_hz).start()
+    if not args.no_record:
+        from recorder import MatchRecorder
+        game.recorder = MatchRecorder(game, args.record).start()
+    try:
+        game.run()
+    finally:
+        if game.publisher is not None:
+            game.publisher.stop()
+        if game.recorder is not None:
+            game.recorder.stop()
+        if game.ingest is not None:
+            game.ingest.stop()
+        pygame.quit()
+        logs.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+"""
+Comprobación de una partida computadora contra computadora (sin ventana ni broker).
+
+Corre la escena del juego a 60 fps en tiempo real y verifica que la partida pase READY/GO y
+que, después de cada gol (el puck vuelve al centro), el warning se resuelva y el juego siga.
+Sale con código 1 si alguna etapa no termina en --timeout segundos.
+
+Uso (desde src/):
+    python match_check.py
+    python match_check.py --goals 3 --physics headless-fast --walls solver
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+
+import pygame
+
+from physics_profiles import DEFAULT_PROFILE, PROFILES
+
+
+def run_until(game, condition, timeout):
+    """Frames de 1/60 s hasta que condition() sea verdadera; devuelve los segundos o None."""
+    from ui_manager import GameState
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        game.ui.timer = max(game.ui.timer, 60)      # que el reloj del partido no termine
+        game.poll_inputs()
+        game.scenes.update(1 / 60)
+        if condition():
+            return time.perf_counter() - start
+        if game.ui.state == GameState.FINISHED:
+            return None
+        time.sleep(1 / 60)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partida computadora vs computadora")
+    parser.add_argument("--goals", type=int, default=2, help="goles forzados a comprobar")
+    parser.add_argument("--timeout", type=float, default=8.0, help="segundos por etapa")
+    parser.add_argument("--physics", choices=tuple(PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--walls", choices=("python", "solver"), default="python")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    from game import Game
+    from input_providers import ComputerProvider
+    from ui_manager import GameState
+    game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[ComputerProvider(), ComputerProvider()], physics=args.physics,
+                walls=args.walls)
+    running = lambda: game.initial_check_done and game.ui.state == GameState.RUNNING
+
+    failed = False
+    elapsed = run_until(game, running, args.timeout)
+    print(f"READY/GO → RUNNING: {'no terminó' if elapsed is None else f'{elapsed:.1f} s'}")
+    failed |= elapsed is None
+    for goal in range(args.goals):
+        if failed:
+            break
+        game.goal_scored(1 + goal % 2)
+        run_until(game, lambda: game.ui.state == GameState.RESET_WARNING, args.timeout)
+        elapsed = run_until(game, running, args.timeout)
+        print(f"gol {goal + 1} → RUNNING: {'no terminó' if elapsed is None else f'{elapsed:.1f} s'}")
+        failed |= elapsed is None
+    pygame.quit()
+
+    if failed:
+        print("La partida quedó detenida (warning sin resolver).")
+        raise SystemExit(1)
+    print("La partida arranca y sigue después de cada gol.")
+
+
+if __name__ == "__main__":
+    main()
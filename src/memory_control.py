@@ -0,0 +1,131 @@
+import gc
+import logging
+import time
+import tracemalloc
+
+log = logging.getLogger(__name__)
+
+
+class FrameGC:
+    """
+    Control del recolector de basura para el loop de juego.
+    - start(): recolecta y congela (gc.freeze) todo lo creado al arrancar y desactiva el GC automático.
+    - between_frames(deadline): corre recolecciones pequeñas solo si queda tiempo antes del próximo frame.
+    - Cuenta las pausas de GC que caen dentro de un frame (deberían ser 0).
+    """
+    def __init__(self, gen0_threshold=700, gen1_every=10, gen2_interval=30.0):
+        self.gen0_threshold = gen0_threshold   # objetos pendientes para forzar una gen0
+        self.gen1_every = gen1_every           # cada cuántas gen0 hacer una gen1
+        self.gen2_interval = gen2_interval     # segundos entre recolecciones completas
+        self.active = False
+        self.in_frame = False
+        self.collections = 0
+        self.pauses_in_frame = 0
+        self.max_pause_ms = 0.0
+        self._gen0_runs = 0
+        self._last_full = time.perf_counter()
+        self._gc_start = 0.0
+
+    def start(self):
+        gc.collect()
+        gc.freeze()            # los objetos de arranque no vuelven a recorrerse
+        gc.disable()
+        gc.callbacks.append(self._on_gc)
+        self.active = True
+        log.info("GC controlado: %d objetos congelados", gc.get_freeze_count())
+
+    def stop(self):
+        if self.active:
+            gc.callbacks.remove(self._on_gc)
+            gc.unfreeze()
+            gc.enable()
+            self.active = False
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            if self.in_frame:
+                self.pauses_in_frame += 1
+        else:
+            pause = (time.perf_counter() - self._gc_start) * 1000
+            if pause > self.max_pause_ms:
+                self.max_pause_ms = pause
+
+    def between_frames(self, deadline, idle=False):
+        """
+        Llamar después del flip. deadline = perf_counter() del próximo frame.
+        idle=True (pausa, pantallas estáticas) permite una recolección completa.
+        """
+        if not self.active:
+            return
+        now = time.perf_counter()
+        budget = deadline - now
+        pending = gc.get_count()[0]
+
+        if (idle or budget > 0.008) and now - self._last_full > self.gen2_interval:
+            gc.collect(2)
+            self._last_full = now
+        elif pending >= self.gen0_threshold and budget > 0.001:
+            self._gen0_runs += 1
+            gc.collect(1 if self._gen0_runs % self.gen1_every == 0 else 0)
+        elif pending >= self.gen0_threshold * 20:
+            gc.collect(0)      # sin presupuesto pero creciendo demasiado: no dejar que explote
+        else:
+            return
+        self.collections += 1
+
+
+class AllocationTracker:
+    """
+    Modo de diagnóstico basado en tracemalloc: bytes asignados netos y picos por fase del frame.
+    Se engancha al FrameProfiler (profiler.alloc = tracker) para reutilizar sus marcas.
+    Caro: solo para investigar, no para partidas en vivo.
+    """
+    def __init__(self, phases, report_every=300, frames=25):
+        self.phases = phases
+        self.report_every = report_every
+        self.frames = 0
+        self.net = {phase: 0 for phase in phases}
+        self.peak = {phase: 0 for phase in phases}
+        self.frame_growth = 0
+        self._last = 0
+        self._frame_start = 0
+        tracemalloc.start(frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def begin_frame(self):
+        current, _ = tracemalloc.get_traced_memory()
+        self._last = self._frame_start = current
+        tracemalloc.reset_peak()
+
+    def mark(self, phase):
+        current, peak = tracemalloc.get_traced_memory()
+        self.net[phase] += current - self._last
+        transient = peak - self._last
+        if transient > self.peak[phase]:
+            self.peak[phase] = transient
+        self._last = current
+        tracemalloc.reset_peak()
+
+    def end_frame(self):
+        current, _ = tracemalloc.get_traced_memory()
+        self.frame_growth += current - self._frame_start
+        self.frames += 1
+        if self.frames % self.report_every == 0:
+            self.report()
+
+    def report(self, top=5):
+        n = max(1, self.frames)
+        parts = [f"{phase}={self.net[phase] / n:+.0f}B (pico {self.peak[phase]}B)"
+                 for phase in self.phases if self.net[phase] or self.peak[phase]]
+        log.info("Asignaciones por frame (%d frames, crecimiento medio %+.0f B/frame): %s",
+                 self.frames, self.frame_growth / n, ", ".join(parts),
+                 extra={"key": "alloc_report"})
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.compare_to(self._baseline, "lineno")[:top]:
+            log.info("  %s", stat, extra={"key": ("alloc_top", str(stat.traceback))})
+        self._baseline = snapshot
+
+    def stop(self):
+        self.report()
+        tracemalloc.stop()
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class MetricsCollector:
+    """
+    Vista de solo lectura sobre los contadores del juego.
+    El juego solo incrementa enteros y guarda timestamps (sin locks); todo el cálculo
+    (percentiles, tasas, staleness) ocurre aquí, en el hilo del servidor o del snapshot.
+    """
+    def __init__(self, game):
+        self.game = game
+        self._last_rate_time = time.perf_counter()
+        self._last_rate_count = 0
+        self.mqtt_rate = 0.0
+        self._lock = threading.Lock()   # solo entre lectores (HTTP y snapshot)
+
+    def _frame_times(self):
+        profiler = getattr(self.game, "render_profiler", None) or self.game.profiler
+        count = profiler.count
+        data = list(profiler.total)       # copia; el buffer puede estar escribiéndose
+        if count < profiler.size:
+            data = data[:count]
+        return sorted(t for t in data if t > 0)
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q * (len(values) - 1)))]
+
+    def collect(self):
+        game = self.game
+        ingest = game.ingest
+        now = time.perf_counter()
+        with self._lock:
+            total = ingest.total if ingest is not None else 0
+            elapsed = now - self._last_rate_time
+            if elapsed >= 1.0:
+                self.mqtt_rate = (total - self._last_rate_count) / elapsed
+                self._last_rate_time = now
+                self._last_rate_count = total
+
+        frames = self._frame_times()
+        last_seen = list(ingest.last_seen.items()) if ingest is not None else []
+        staleness = {marker: now - seen for marker, seen in last_seen}
+
+        return {
+            "timestamp": time.time(),
+            "fps": game.clock.get_fps(),
+            "frame_time_ms": {
+                "p50": self._percentile(frames, 0.50) * 1000,
+                "p95": self._percentile(frames, 0.95) * 1000,
+                "p99": self._percentile(frames, 0.99) * 1000,
+                "max": frames[-1] * 1000 if frames else 0.0,
+            },
+            "physics_substeps": game.substeps,
+            "quality_level": game.quality.name,
+            "mqtt_messages_total": total,
+            "mqtt_messages_per_second": self.mqtt_rate,
+            "mqtt_errors_total": ingest.errors if ingest is not None else 0,
+            "mqtt_ignored_total": ingest.ignored if ingest is not None else 0,
+            "marker_staleness_s": staleness,
+            "goals_total": {"1": game.goals_total[0], "2": game.goals_total[1]},
+            "game_state": game.ui.state.name,
+        }
+
+    def prometheus(self):
+        """Formato de exposición de texto de Prometheus."""
+        m = self.collect()
+        lines = [
+            "# HELP airhockey_fps Cuadros por segundo presentados (pygame.time.Clock)",
+            "# TYPE airhockey_fps gauge",
+            f"airhockey_fps {m['fps']:.3f}",
+            "# HELP airhockey_frame_time_ms Tiempo de trabajo por frame (sin la espera del clock)",
+            "# TYPE airhockey_frame_time_ms summary",
+        ]
+        for q, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"), ("1", "max")):
+            lines.append(f'airhockey_frame_time_ms{{quantile="{q}"}} {m["frame_time_ms"][key]:.3f}')
+        lines += [
+            "# TYPE airhockey_physics_substeps gauge",
+            f"airhockey_physics_substeps {m['physics_substeps']}",
+            "# TYPE airhockey_quality_level gauge",
+            f'airhockey_quality_level{{level="{m["quality_level"]}"}} 1',
+            "# TYPE airhockey_mqtt_messages_total counter",
+            f"airhockey_mqtt_messages_total {m['mqtt_messages_total']}",
+            "# TYPE airhockey_mqtt_messages_per_second gauge",
+            f"airhockey_mqtt_messages_per_second {m['mqtt_messages_per_second']:.2f}",
+            "# TYPE airhockey_mqtt_errors_total counter",
+            f"airhockey_mqtt_errors_total {m['mqtt_errors_total']}",
+            "# TYPE airhockey_mqtt_ignored_total counter",
+            f"airhockey_mqtt_ignored_total {m['mqtt_ignored_total']}",
+            "# HELP airhockey_marker_staleness_seconds Tiempo desde el último dato de cada marker",
+            "# TYPE airhockey_marker_staleness_seconds gauge",
+        ]
+        for marker, age in sorted(m["marker_staleness_s"].items(), key=lambda kv: str(kv[0])):
+            lines.append(f'airhockey_marker_staleness_seconds{{identifier="{marker}"}} {age:.3f}')
+        lines.append("# TYPE airhockey_goals_total counter")
+        for team, goals in m["goals_total"].items():
+            lines.append(f'airhockey_goals_total{{team="{team}"}} {goals}')
+        lines.append("# TYPE airhockey_game_state gauge")
+        lines.append(f'airhockey_game_state{{state="{m["game_state"]}"}} 1')
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Servidor HTTP en un hilo daemon: /metrics (Prometheus) y /metrics.json."""
+    def __init__(self, collector, host="127.0.0.1", port=9108):
+        self.collector = collector
+        collector_ref = collector
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(collector_ref.collect()).encode("utf-8")
+                    content_type = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = collector_ref.prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass   # sin logs por request
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        log.info("Métricas en http://%s:%s/metrics", host, port)
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+class SnapshotWriter:
+    """Escribe periódicamente un JSON con las métricas (escritura atómica)."""
+    def __init__(self, collector, path, interval=5.0):
+        self.collector = collector
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.collector.collect(), f, indent=2)
+        os.replace(tmp, self.path)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
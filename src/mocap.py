@@ -0,0 +1,337 @@
+import json
+import logging
+import math
+import threading
+import time
+
+from latency import MarkerSample, mocap_timestamp
+
+log = logging.getLogger(__name__)
+
+# Suavizado por defecto de cada marker: ninguno (posición cruda). El OneEuroFilter se pide por
+# marker ("filter" en --markers) o para todos (--mocap-filter); {"min_cutoff": 1.0, "beta": 0.5}
+# (mm y segundos) es un buen punto de partida
+DEFAULT_SMOOTHING = None
+
+
+class Homography:
+    """
+    Homografía plano del Robotat (mm) → pantalla de una mesa.
+    center/scale/angle_deg ubican el área de juego dentro del volumen de captura.
+    """
+    def __init__(self, screen_size, center=(4, 41), scale=1, angle_deg=180):
+        self.screen_w, self.screen_h = screen_size
+        self.center = center
+        self.scale = scale
+        self.angle_deg = angle_deg
+        self.H = None
+        self.coeffs = None
+
+    # ------------------------------------------------------
+    def compute(self):
+        """Calcula la homografía entre el plano del Robotat y la pantalla."""
+        import numpy as np, cv2
+
+        # ===============================================================
+        # --- DEFINIR PLANOS Y HOMOGRAFÍA ---
+        # ===============================================================
+        A = np.array([-853, -1583])  # inferior izquierda en ROBOTAT (Inferior derecha en proyección)
+        B = np.array([854, -1583])   # inferior derecha en ROBOTAT (Superior derecha en proyección)
+
+        C = np.array([854, 1475])    # superior derecha en ROBOTAT (Superior izquierda en proyección)
+        D = np.array([-853, 1475])   # superior izquierda en ROBOTAT (Inferior izquierda en proyección)
+        original = np.array([A, B, C, D, A]) #<-- Primer Plano
+
+        width = 1707
+        height = 3058
+        screen_w, screen_h = self.screen_w, self.screen_h #<-- Tercer Plano
+
+        if width < height and screen_w > screen_h:
+            log.info("Rotando segundo plano 90° para coincidir con la orientación de la pantalla...")
+            width, height = height, width
+            rect_local = np.array([
+                [-width/2, -height/2],
+                [ width/2, -height/2],
+                [ width/2,  height/2],
+                [-width/2,  height/2]
+            ])
+            R90 = np.array([[0, -1], [1, 0]]) #<-- Primera rotación segundo plano
+            rect_local = rect_local @ R90.T
+        else:
+            rect_local = np.array([
+                [-width/2, -height/2],
+                [ width/2, -height/2],
+                [ width/2,  height/2],
+                [-width/2,  height/2]
+            ])
+
+        center = np.array(self.center)  #<--- Posición, escala y rotación del segundo plano
+        scale = self.scale
+        angle_deg = self.angle_deg
+        theta = np.deg2rad(angle_deg)
+        R = np.array([[np.cos(theta), -np.sin(theta)],
+                      [np.sin(theta),  np.cos(theta)]])
+        rect_transformed = center + scale * (rect_local @ R.T)
+
+        half_w, half_h = screen_w/2, screen_h/2
+        third_plane = np.array([
+            [-half_w, -half_h],
+            [ half_w, -half_h],
+            [ half_w,  half_h],
+            [-half_w,  half_h]
+        ], dtype=np.float32)
+
+        src_points = rect_transformed.astype(np.float32)
+        dst_points = third_plane
+        self.H, _ = cv2.findHomography(src_points, dst_points)
+        # Coeficientes como floats de Python: map() no crea arrays
+        self.coeffs = tuple(float(v) for v in self.H.ravel())
+        return self
+
+    # ------------------------------------------------------
+    def map(self, x_mm, y_mm):
+        """Transforma coordenadas del plano original a coordenadas de pantalla."""
+        # Equivalente a cv2.perspectiveTransform con la homografía H (3x3)
+        h00, h01, h02, h10, h11, h12, h20, h21, h22 = self.coeffs
+        w = h20 * x_mm + h21 * y_mm + h22
+        hom_x = (h00 * x_mm + h01 * y_mm + h02) / w
+        hom_y = (h10 * x_mm + h11 * y_mm + h12) / w
+
+        screen_x = int(hom_x + self.screen_w / 2)
+        screen_y = int(-hom_y + self.screen_h / 2)
+
+        screen_x = max(0, min(self.screen_w - 1, screen_x))
+        screen_y = max(0, min(self.screen_h - 1, screen_y))
+        return screen_x, screen_y
+
+
+class OneEuroFilter:
+    """
+    Filtro One-Euro (Casiez et al., 2012) para la posición 2D de un marker.
+    En reposo el corte es bajo (min_cutoff Hz) y elimina el jitter; sube con la velocidad
+    (beta) para no agregar retraso cuando el jugador se mueve rápido.
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.5, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap       # sin muestras por más que esto: arrancar de nuevo
+        self._t = None
+        self._x = self._y = 0.0
+        self._dx = self._dy = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, y, t):
+        last = self._t
+        if last is None or t - last > self.max_gap:
+            self._t = t
+            self._x, self._y = x, y
+            self._dx = self._dy = 0.0
+            return x, y
+        dt = t - last
+        if dt <= 0:
+            return self._x, self._y
+        self._t = t
+
+        # Velocidad suavizada → corte adaptativo
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._dx += a_d * ((x - self._x) / dt - self._dx)
+        self._dy += a_d * ((y - self._y) / dt - self._dy)
+        cutoff = self.min_cutoff + self.beta * math.hypot(self._dx, self._dy)
+
+        a = self._alpha(cutoff, dt)
+        self._x += a * (x - self._x)
+        self._y += a * (y - self._y)
+        return self._x, self._y
+
+
+class MocapIngest:
+    """
+    Cliente MQTT del sistema de captura (mocap/all) y homografía Robotat → pantalla.
+    Entrega cada muestra decodificada al MocapProvider registrado para su identificador
+    (jugadores o props: cualquier cantidad, búsqueda O(1) en routes), suavizada con el
+    OneEuroFilter propio del marker. Un solo ingest puede alimentar varias mesas: cada marker se mapea con la homografía
+    de su mesa y el JSON de mocap/all se decodifica una sola vez.
+    """
+    def __init__(self, screen_size, latency=None, broker="192.168.50.200", port=1880,
+                 topic="mocap/all", startup=None):
+        # ===============================================================
+        # --- CONFIGURACIÓN MQTT ---
+        # ===============================================================
+        self.BROKER = broker
+        self.PORT = port
+        self.TOPIC = topic
+        self.client = None
+
+        # ===============================================================
+        # --- CONFIGURACIÓN DE PANTALLA ---
+        # ===============================================================
+        self.screen_w, self.screen_h = screen_size
+        self.homography = Homography(screen_size)   # por defecto (mesa única)
+
+        self.latency = latency
+        self.startup = startup     # StartupTimer (opcional) para medir la fase de red
+        self.ready = threading.Event()   # homografía lista
+        self.connected = threading.Event()
+        self.routes = {}           # identifier -> (MocapProvider, Homography, LatencyTracker, filtro)
+        self.seq = 0
+
+        # Contadores operativos (solo se incrementan; los lee metrics.py en otro hilo)
+        self.messages = 0          # mensajes desde el último frame (lo reinicia el perfilador)
+        self.total = 0
+        self.errors = 0
+        self.ignored = 0
+        self.last_seen = {}        # identifier -> perf_counter de la última muestra
+
+    # ------------------------------------------------------
+    def register(self, provider, homography=None, latency=None):
+        """
+        Asocia el marker del provider a la homografía y al medidor de latencia de su mesa.
+        La homografía es la de la mesa, la propia del marker (provider.placement) o la por defecto.
+        """
+        if homography is None and provider.placement is not None:
+            center, angle_deg = provider.placement
+            homography = Homography((self.screen_w, self.screen_h), center=center, angle_deg=angle_deg)
+        homography = homography or self.homography
+        if self.ready.is_set() and homography.coeffs is None:
+            homography.compute()
+        smoothing = provider.smoothing
+        marker_filter = OneEuroFilter(**smoothing) if smoothing else None
+        if provider.identifier in self.routes:
+            log.warning("Marker %s registrado dos veces; se usa %r", provider.identifier, provider)
+        self.routes[provider.identifier] = (provider, homography, latency or self.latency,
+                                            marker_filter)
+
+    # ------------------------------------------------------
+    def start(self, connect=True):
+        """
+        Homografía (importa numpy/cv2) y conexión al broker en un hilo daemon,
+        para no retrasar el primer frame. ready/connected indican cuándo terminó cada parte.
+        """
+        self._start_time = time.perf_counter()
+        threading.Thread(target=self._run, args=(connect,), name="mocap", daemon=True).start()
+        return self
+
+    def _run(self, connect):
+        self.setup_homography()
+        self.ready.set()
+        if self.startup is not None:
+            self.startup.record("homography", (time.perf_counter() - self._start_time) * 1000)
+        if connect:
+            self.connect()
+
+    def wait_ready(self, timeout=None):
+        """Bloquea hasta tener la homografía (herramientas que alimentan mensajes a mano)."""
+        return self.ready.wait(timeout)
+
+    def poll(self):
+        """Nada que hacer: el hilo MQTT ya entregó las muestras (ver ProcessIngest.poll)."""
+
+    def stop(self):
+        if self.client is not None:
+            self.client.disconnect()
+
+    # ------------------------------------------------------
+    def setup_homography(self):
+        """Calcula las homografías de todas las mesas registradas (importa numpy/cv2)."""
+        for hom in {id(h): h for h in [self.homography] + [r[1] for r in self.routes.values()]}.values():
+            if hom.coeffs is None:
+                hom.compute()
+        self.H = self.homography.H
+
+    # ------------------------------------------------------
+    def connect(self):
+        """Corre el cliente MQTT en el hilo actual (lo llama _run, ya en segundo plano)."""
+        import paho.mqtt.client as mqtt
+
+        # ===============================================================
+        # --- ARRANCAR CLIENTE MQTT ---
+        # ===============================================================
+        self.client = mqtt.Client()
+        self.client.on_connect = self.mqtt_on_connect
+        self.client.on_message = self.mqtt_on_message
+        # connect_async: si el broker no responde se reintenta sin bloquear el juego
+        self.client.connect_async(self.BROKER, self.PORT, keepalive=60)
+
+        log.info("Hilo MQTT iniciado correctamente.")
+        self.client.loop_forever(retry_first_connection=True)
+
+    # ------------------------------------------------------
+    def mqtt_on_connect(self, client, userdata, flags, rc):
+        log.info("Conectado con código: %s", rc, extra={"rc": rc})
+        client.subscribe(self.TOPIC)
+        if not self.connected.is_set():
+            self.connected.set()
+            if self.startup is not None:
+                self.startup.record("network", (time.perf_counter() - self._start_time) * 1000)
+
+    # ------------------------------------------------------
+    def map_to_screen_from_marker(self, x_mm, y_mm):
+        """Transforma coordenadas del plano original a la pantalla (homografía por defecto)."""
+        return self.homography.map(x_mm, y_mm)
+
+    # ------------------------------------------------------
+    def mqtt_on_message(self, client, userdata, msg):
+        """Procesa las posiciones de los markers y las entrega a su provider."""
+        recv = time.perf_counter()
+        self.messages += 1
+        self.total += 1
+        try:
+            data = json.loads(msg.payload.decode("utf-8"))
+            identifier = data.get("identifier")
+            pos = data["payload"]["pose"]["position"]
+            x_mm, y_mm, z_mm = pos["x"]*1000, pos["y"]*1000, pos["z"]*1000
+            self.last_seen[identifier] = recv
+
+            route = self.routes.get(identifier)
+            if route is None:
+                self.ignored += 1
+                return
+            provider, homography, latency, marker_filter = route
+            if marker_filter is not None:
+                x_mm, y_mm = marker_filter(x_mm, y_mm, recv)
+            x_screen, y_screen = homography.map(x_mm, y_mm)
+
+            mocap_ts = mocap_timestamp(data)
+            if latency is not None:
+                latency.received(mocap_ts, time.time())
+            self.seq += 1
+            provider.push(x_screen, y_screen,
+                          MarkerSample(self.seq, mocap_ts, recv, time.perf_counter()))
+
+        except Exception as e:
+            # Corre en el hilo de paho: el log se encola y se limita por clave
+            self.errors += 1
+            log.warning("Error al procesar mensaje: %s", e,
+                        extra={"key": ("mqtt_decode", type(e).__name__), "topic": msg.topic})
+
+
+class FakeMessage:
+    """Imita paho.mqtt.client.MQTTMessage para alimentar mqtt_on_message sin broker."""
+    def __init__(self, payload, topic="mocap/all"):
+        self.payload = payload
+        self.topic = topic
+
+
+def load_replay(path):
+    """
+    Lista de (t_relativo_s, payload_bytes) desde un jsonl grabado de mocap/all.
+    Cada línea puede ser el payload crudo (se asume 120 Hz) o {"t": segundos, "payload": {...}}.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if "t" in data and "payload" in data and "identifier" not in data:
+                records.append((float(data["t"]), json.dumps(data["payload"]).encode("utf-8")))
+            else:
+                records.append((n / 120.0, line.encode("utf-8")))
+    t0 = records[0][0] if records else 0.0
+    return [(t - t0, payload) for t, payload in records]
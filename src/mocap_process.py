@@ -0,0 +1,321 @@
+"""
+Ingest de mocap en un proceso aparte (Game(ingest_process=True), --ingest-process).
+
+El proceso hijo corre el mismo MocapIngest (paho, json.loads, filtro One-Euro y homografía)
+y escribe cada pose ya mapeada a pantalla en un anillo de registros de tamaño fijo en
+multiprocessing.shared_memory. El juego lee el anillo una vez por paso (ProcessIngest.poll)
+sin competir por el GIL con paho ni con json.loads: por más mensajes que traiga mocap/all, en
+el proceso del juego solo queda el costo de las muestras de sus propios markers.
+
+Layout del bloque compartido:
+
+    header    int64[8]                 escritos, mensajes, errores, ignorados, listo, conectado
+    last_seen float64[MAX_SLOTS]       perf_counter de la última muestra de cada marker
+    records   RECORD_DTYPE[capacity]   anillo; el registro n va en n % capacity
+
+Un solo escritor (el hijo) y un solo lector (el juego): el hijo escribe el registro y recién
+después incrementa header[WRITTEN]. El lector copia los registros nuevos y después descarta lo
+que el escritor pudo pisar mientras los copiaba (más de capacity registros de atraso).
+La lectura es una copia a propósito: leyendo en el lugar, un registro a medio pisar ya habría
+llegado a un provider cuando se detecta. La copia son uno o dos memcpy a un arreglo propio
+preasignado, sin objetos de Python; los únicos que se crean son los floats que necesita push.
+"""
+import json
+import logging
+import math
+import multiprocessing
+import random
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from latency import MarkerSample
+
+log = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype([
+    ("seq", "<i8"),
+    ("slot", "<i4"),
+    ("_pad", "<i4"),
+    ("x", "<f8"),          # px de pantalla (ya filtrado y mapeado)
+    ("y", "<f8"),
+    ("mocap_ts", "<f8"),   # time.time() del sistema de captura (nan si no vino)
+    ("recv", "<f8"),       # perf_counter() en el hijo (mismo reloj monotónico que el juego)
+    ("decoded", "<f8"),
+    ("recv_wall", "<f8"),  # time.time() al recibir, para LatencyTracker.received
+])
+WRITTEN, MESSAGES, ERRORS, IGNORED, READY, CONNECTED = range(6)
+HEADER_LEN = 8
+MAX_SLOTS = 64
+DEFAULT_CAPACITY = 4096    # ~17 s de 2 markers a 120 Hz
+
+
+class PoseRing:
+    """
+    Vistas NumPy sobre el bloque compartido. Lo crea el juego y el hijo se adjunta por nombre;
+    con spawn ambos usan el mismo resource_tracker, que lo borra si el juego muere sin stop().
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, name=None):
+        size = HEADER_LEN * 8 + MAX_SLOTS * 8 + capacity * RECORD_DTYPE.itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+        self.capacity = capacity
+        buf = self.shm.buf
+        self.header = np.ndarray((HEADER_LEN,), np.int64, buf, 0)
+        self.last_seen = np.ndarray((MAX_SLOTS,), np.float64, buf, HEADER_LEN * 8)
+        self.records = np.ndarray((capacity,), RECORD_DTYPE, buf, HEADER_LEN * 8 + MAX_SLOTS * 8)
+        if self.owner:
+            self.header[:] = 0
+            self.last_seen[:] = 0.0
+
+    def close(self):
+        # Las vistas apuntan al buffer: soltarlas antes de cerrarlo
+        self.header = self.last_seen = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ------------------------------------------------------
+# PROCESO HIJO
+# ------------------------------------------------------
+class RingWriter:
+    """Hace las veces de MocapProvider dentro del hijo: cada push escribe un registro."""
+    def __init__(self, ring, slot, identifier, smoothing, placement):
+        self.ring = ring
+        self.slot = slot
+        self.identifier = identifier
+        self.smoothing = smoothing
+        self.placement = placement
+
+    def push(self, x, y, sample):
+        ring = self.ring
+        n = int(ring.header[WRITTEN])
+        ring.records[n % ring.capacity] = (
+            sample.seq, self.slot, 0, x, y,
+            sample.mocap_ts if sample.mocap_ts else math.nan,
+            sample.recv, sample.decoded, time.time())
+        ring.last_seen[self.slot] = sample.recv
+        ring.header[WRITTEN] = n + 1     # publicar recién con el registro completo
+
+
+def _child_main(ring_name, capacity, screen_size, routes, mqtt, connect, stop, flood_hz):
+    from mocap import Homography, MocapIngest
+
+    ring = PoseRing(capacity, name=ring_name)
+    header = ring.header
+    broker, port, topic = mqtt
+    ingest = MocapIngest(screen_size, broker=broker, port=port, topic=topic)
+
+    # Contadores del ingest copiados al header después de cada mensaje
+    on_message = ingest.mqtt_on_message
+    def mqtt_on_message(client, userdata, msg):
+        on_message(client, userdata, msg)
+        header[MESSAGES] = ingest.total
+        header[ERRORS] = ingest.errors
+        header[IGNORED] = ingest.ignored
+    ingest.mqtt_on_message = mqtt_on_message
+
+    homographies = {}
+    for slot, (identifier, smoothing, placement, table) in enumerate(routes):
+        homography = None
+        if table is not None:
+            if table not in homographies:
+                homographies[table] = Homography(table[0], center=table[1], scale=table[2],
+                                                 angle_deg=table[3])
+            homography = homographies[table]
+        ingest.register(RingWriter(ring, slot, identifier, smoothing, placement), homography)
+
+    ingest.setup_homography()
+    ingest.ready.set()
+    header[READY] = 1
+    if flood_hz > 0:
+        # Carga sintética (ingest_bench.py): payloads de mocap/all sin broker
+        threading.Thread(target=flood, args=(mqtt_on_message, flood_hz, stop),
+                         daemon=True).start()
+        header[CONNECTED] = 1
+    elif connect:
+        ingest_connected = ingest.connected
+        threading.Thread(target=ingest.connect, name="mocap", daemon=True).start()
+        while not ingest_connected.wait(0.2) and not stop.is_set():
+            pass
+        header[CONNECTED] = int(ingest_connected.is_set())
+    stop.wait()
+    if ingest.client is not None:
+        ingest.client.disconnect()
+    ring.close()
+
+
+def flood(on_message, rate_hz, stop, n_markers=8):
+    """Entrega payloads de mocap/all a on_message a rate_hz (dos markers registrados y ruido)."""
+    from mocap import FakeMessage
+    rng = random.Random(1234)
+    ids = ["65", "69"] + [str(100 + i) for i in range(n_markers - 2)]
+    payloads = [FakeMessage(json.dumps({
+        "identifier": ids[i % len(ids)],
+        "payload": {"pose": {"position": {"x": rng.uniform(-0.85, 0.85),
+                                          "y": rng.uniform(-1.5, 1.4), "z": 0.01}}},
+    }).encode("utf-8")) for i in range(512)]
+    period = 1.0 / rate_hz
+    next_t = time.perf_counter()
+    i = 0
+    while not stop.is_set():
+        on_message(None, None, payloads[i % len(payloads)])
+        i += 1
+        next_t += period
+        delay = next_t - time.perf_counter()
+        if delay > 0.001:
+            time.sleep(delay)
+        elif delay < -0.1:
+            next_t = time.perf_counter()     # atrasado: no acumular una ráfaga
+
+
+# ------------------------------------------------------
+# LADO DEL JUEGO
+# ------------------------------------------------------
+class ProcessIngest:
+    """
+    Misma interfaz que MocapIngest para Game, MultiTable y metrics.py (register, start,
+    ready/connected, contadores, last_seen), con el trabajo de red en otro proceso.
+    Las muestras llegan a los MocapProvider en poll(), desde el hilo que lo llama.
+    """
+    def __init__(self, screen_size, latency=None, broker="192.168.50.200", port=1880,
+                 topic="mocap/all", startup=None, capacity=DEFAULT_CAPACITY, flood_hz=0):
+        self.screen_size = tuple(screen_size)
+        self.latency = latency
+        self.startup = startup
+        self.mqtt = (broker, port, topic)
+        self.capacity = capacity
+        self.flood_hz = flood_hz
+        self.ready = threading.Event()
+        self.connected = threading.Event()
+        self.routes = []             # slot -> (MocapProvider, LatencyTracker)
+        self._specs = []             # slot -> lo que necesita el hijo para rearmar la ruta
+        self.ring = None
+        self.process = None
+        self._stop = None
+        self._read = 0
+        self._staging = np.empty(capacity, RECORD_DTYPE)   # copia de los registros nuevos
+
+        # Contadores con los nombres de MocapIngest (se actualizan en poll)
+        self.messages = 0
+        self.total = 0
+        self.errors = 0
+        self.ignored = 0
+        self.lost = 0                # registros pisados antes de leerlos (juego muy atrasado)
+
+    # ------------------------------------------------------
+    def register(self, provider, homography=None, latency=None):
+        if self.process is not None:
+            raise RuntimeError("ProcessIngest.register después de start()")
+        if len(self.routes) >= MAX_SLOTS:
+            raise ValueError(f"más de {MAX_SLOTS} markers en un ProcessIngest")
+        table = None
+        if homography is not None:
+            table = ((homography.screen_w, homography.screen_h), tuple(homography.center),
+                     homography.scale, homography.angle_deg)
+        self._specs.append((provider.identifier, provider.smoothing, provider.placement, table))
+        self.routes.append((provider, latency or self.latency))
+
+    @property
+    def last_seen(self):
+        """identifier -> perf_counter de la última muestra (solo markers registrados)."""
+        if self.ring is None:
+            return {}
+        seen = self.ring.last_seen
+        return {provider.identifier: float(seen[slot])
+                for slot, (provider, _) in enumerate(self.routes) if seen[slot] > 0}
+
+    # ------------------------------------------------------
+    def start(self, connect=True):
+        self._start_time = time.perf_counter()
+        self.ring = PoseRing(self.capacity)
+        # spawn: el hijo no hereda pygame, la ventana ni los hilos del juego
+        ctx = multiprocessing.get_context("spawn")
+        self._stop = ctx.Event()
+        self.process = ctx.Process(
+            target=_child_main, name="mocap-ingest", daemon=True,
+            args=(self.ring.name, self.capacity, self.screen_size, self._specs,
+                  self.mqtt, connect, self._stop, self.flood_hz))
+        self.process.start()
+        log.info("Ingest de mocap en el proceso %d (%d markers)", self.process.pid, len(self.routes))
+        return self
+
+    def wait_ready(self, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.ready.is_set():
+            self.poll()
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            time.sleep(0.01)
+        return self.ready.is_set()
+
+    def stop(self):
+        if self.process is None:
+            return
+        self._stop.set()
+        self.process.join(2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.ring.close()
+        self.ring = None
+
+    # ------------------------------------------------------
+    def poll(self):
+        """
+        Entrega a cada provider las poses escritas desde la última llamada. Los registros se
+        copian (memcpy a _staging) antes de validarlos: ver el docstring del módulo.
+        """
+        ring = self.ring
+        if ring is None:
+            return
+        header = ring.header
+        if not self.ready.is_set() and header[READY]:
+            self.ready.set()
+            if self.startup is not None:
+                self.startup.record("homography", (time.perf_counter() - self._start_time) * 1000)
+        if not self.connected.is_set() and header[CONNECTED]:
+            self.connected.set()
+            if self.startup is not None:
+                self.startup.record("network", (time.perf_counter() - self._start_time) * 1000)
+
+        total = int(header[MESSAGES])
+        self.messages += total - self.total
+        self.total = total
+        self.errors = int(header[ERRORS])
+        self.ignored = int(header[IGNORED])
+
+        written = int(header[WRITTEN])
+        first = self._read
+        if written == first:
+            return
+        capacity = self.capacity
+        if written - first > capacity:
+            self.lost += written - capacity - first
+            first = written - capacity
+        # Copia de los registros nuevos (a lo sumo dos tramos del anillo, sin listas intermedias)
+        count = written - first
+        start = first % capacity
+        staging = self._staging
+        head = min(count, capacity - start)
+        staging[:head] = ring.records[start:start + head]
+        if head < count:
+            staging[head:count] = ring.records[:count - head]
+        # Lo que el hijo pudo pisar mientras se copiaba
+        overwritten = max(0, int(header[WRITTEN]) - capacity - first)
+        if overwritten:
+            self.lost += min(overwritten, count)
+        rows = staging[min(overwritten, count):count].tolist()
+        self._read = written
+
+        routes = self.routes
+        for seq, slot, _, x, y, mocap_ts, recv, decoded, recv_wall in rows:
+            provider, latency = routes[slot]
+            mocap_ts = None if mocap_ts != mocap_ts else mocap_ts     # nan → None
+            if latency is not None:
+                latency.received(mocap_ts, recv_wall)
+            provider.push(x, y, MarkerSample(seq, mocap_ts, recv, decoded))
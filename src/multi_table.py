@@ -0,0 +1,191 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import pygame
+
+from game import Game
+from input_providers import MocapProvider
+from memory_control import FrameGC
+from mocap import Homography, MocapIngest
+from physics_profiles import DEFAULT_PROFILE
+from pipeline import LoopStats
+from profiler import FrameProfiler
+from startup import StartupTimer
+
+log = logging.getLogger(__name__)
+
+TABLE_SIZE = (1920, 1080)   # cada mesa es una proyección de 1920x1080 (escritorio extendido)
+
+
+class TableSpec(NamedTuple):
+    """Una mesa: markers de sus jugadores y ubicación de su área en el Robotat (mm)."""
+    markers: tuple
+    center: tuple = (4, 41)
+    angle_deg: float = 180
+
+
+def parse_table_spec(text):
+    """'65,69' o '65,69@cx,cy' o '65,69@cx,cy,ángulo'."""
+    markers, _, where = text.partition("@")
+    spec = TableSpec(tuple(m.strip() for m in markers.split(",") if m.strip()))
+    if where:
+        values = [float(v) for v in where.split(",")]
+        spec = spec._replace(center=(values[0], values[1]))
+        if len(values) > 2:
+            spec = spec._replace(angle_deg=values[2])
+    return spec
+
+
+class MultiTable:
+    """
+    K partidos independientes en un solo proceso.
+    Cada Game (una mesa) tiene su propio Space, marcador, timers y homografía; todas comparten
+    un MocapIngest (un cliente MQTT, un json.loads por mensaje), la caché de assets y un loop
+    de render con un solo flip. La física de las mesas se reparte en un pool de hilos
+    (pymunk suelta el GIL dentro de space.step).
+    """
+    def __init__(self, screen, specs, use_mqtt=True, workers=None, latency_log=None,
+                 profile_csv=None, startup=None, record_dir=None, physics=DEFAULT_PROFILE,
+                 ingest_process=False):
+        self.screen = screen
+        self.clock = pygame.time.Clock()
+        self.startup = startup or StartupTimer()
+        self.profile_csv = profile_csv
+
+        # Un solo ingest para todas las mesas (cada marker va a la homografía de su mesa)
+        if ingest_process:
+            from mocap_process import ProcessIngest
+            self.ingest = ProcessIngest(TABLE_SIZE, startup=self.startup)
+        else:
+            self.ingest = MocapIngest(TABLE_SIZE, startup=self.startup)
+
+        self.matches = []
+        for k, spec in enumerate(specs):
+            view = screen.subsurface(pygame.Rect((k * TABLE_SIZE[0], 0), TABLE_SIZE))
+            homography = Homography(TABLE_SIZE, center=spec.center, angle_deg=spec.angle_deg)
+            log_path = latency_log.replace(".jsonl", f"_mesa{k + 1}.jsonl") if latency_log else None
+            game = Game(view, latency_log=log_path, gc_control=False,
+                        inputs=[MocapProvider(m) for m in spec.markers],
+                        ingest=self.ingest, homography=homography, physics=physics)
+            game.name = f"mesa{k + 1}"
+            if record_dir:
+                from recorder import MatchRecorder
+                game.recorder = MatchRecorder(game, os.path.join(record_dir, game.name)).start()
+            self.matches.append(game)
+            log.info("%s: markers %s, centro %s mm", game.name, ",".join(spec.markers), spec.center)
+        self.startup.mark("tables")
+
+        self.ingest.start(use_mqtt)
+
+        # Física en paralelo: un hilo por mesa salvo que se pida otra cosa
+        if workers is None:
+            workers = len(self.matches)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mesa") \
+            if workers > 1 else None
+
+        self.focus = 0   # mesa que recibe los atajos de teclado (TAB cambia)
+        self.profiler = FrameProfiler("mesas", phases=("events", "physics", "draw", "flip"))
+        self.frame_gc = FrameGC()
+
+    # ------------------------------------------------------
+    @staticmethod
+    def tick_match(game, dt):
+        """Paso de una mesa con su propio perfilador (corre en un hilo del pool)."""
+        game.profiler.begin_frame()
+        game.sim_tick(dt)
+        if game.recorder is not None:
+            game.recorder.record_frame()
+        game.profiler.end_frame()
+
+    # ------------------------------------------------------
+    def step(self, dt):
+        """Un paso de lógica + física de todas las mesas."""
+        for game in self.matches:
+            game.poll_inputs()
+        if self.pool is None:
+            for game in self.matches:
+                self.tick_match(game, dt)
+        else:
+            # list(): propaga la primera excepción de cualquier mesa
+            list(self.pool.map(self.tick_match, self.matches, [dt] * len(self.matches)))
+
+    # ------------------------------------------------------
+    def draw(self, seq):
+        """Cada mesa dibuja su estado en su subsuperficie; un solo flip para todas."""
+        for game in self.matches:
+            game.draw_state(game.snapshot(seq, game.last_input_time()))
+            game.latency.draw_done()
+            if game.debug:
+                game.profiler.draw_hud(game.screen)
+        if len(self.matches) > 1:
+            # Marco en la mesa con el foco del teclado
+            view = self.matches[self.focus].screen
+            rect = pygame.Rect(view.get_abs_offset(), view.get_size())
+            pygame.draw.rect(self.screen, (255, 255, 255), rect, 2)
+
+    # ------------------------------------------------------
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_TAB:
+                self.focus = (self.focus + 1) % len(self.matches)
+            else:
+                self.matches[self.focus].handle_key(event.key)
+
+    # ------------------------------------------------------
+    def run(self):
+        for game in self.matches:
+            game.initial_check_done = False     # cada mesa empieza en su ReadyGoScene
+        stats = LoopStats(f"{len(self.matches)} mesas", 1 / 60)
+        profiler = self.profiler
+        self.frame_gc.start()
+
+        running = True
+        seq = 0
+        while running:
+            dt = self.clock.tick(60) / 1000.0
+            deadline = time.perf_counter() + 1 / 60
+            stats.sim_tick()
+            profiler.begin_frame()
+            self.frame_gc.in_frame = True
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                self.handle_event(event)
+            profiler.mark("events")
+
+            self.step(dt)
+            profiler.mark("physics")
+
+            seq += 1
+            self.draw(seq)
+            profiler.mark("draw")
+
+            pygame.display.flip()
+            self.startup.first_frame()
+            for game in self.matches:
+                game.latency.flipped()
+            profiler.mark("flip")
+            stats.presented(max(game.last_input_time() for game in self.matches))
+
+            profiler.set_counter("mqtt_msgs", self.ingest.messages)
+            self.ingest.messages = 0
+            profiler.end_frame()
+            self.frame_gc.in_frame = False
+            self.frame_gc.between_frames(deadline)
+
+        stats.report()
+        self.frame_gc.stop()
+        self.ingest.stop()
+        if self.pool is not None:
+            self.pool.shutdown()
+        for game in self.matches:
+            game.latency.end_match(table=game.name, result="exit",
+                                   score=[game.scoreboard.team1_score, game.scoreboard.team2_score])
+            if game.recorder is not None:
+                game.recorder.stop()
+        if self.profile_csv:
+            profiler.export_csv(self.profile_csv)
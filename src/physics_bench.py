@@ -0,0 +1,171 @@
+"""
+Comparación de los perfiles de física (physics_profiles.py).
+
+Para cada perfil se arma un Game nuevo (el spatial hash no se puede quitar de un Space), se
+dejan los dos mazos quietos en la cancha y se lanzan los mismos tiros aleatorios (misma
+semilla). Se mide:
+
+    - costo de Game.update (media y p99) y subpasos por frame
+    - túneles: el puck terminó fuera del rink
+    - penetración del puck en los mazos (px, máximo y media de los frames en contacto)
+    - desvío de la trayectoria contra el perfil de referencia (high-accuracy) a 0.25 s y
+      al final del tiro: cuánto cambia la física al elegir un perfil más barato
+    - frames con el puck dormido (solo perfiles con sleep_time)
+
+Uso (desde src/):
+    python physics_bench.py
+    python physics_bench.py --stall 0.05 --walls solver
+    python physics_bench.py --profiles projector-60fps,headless-fast --shots 400
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+import pygame
+
+from physics_profiles import PROFILES
+from wall_modes import outside_rink
+
+REFERENCE = "high-accuracy"
+MALLETS = ((700, 520), (1250, 740))   # mazos quietos, en el camino de muchos tiros
+EARLY_FRAMES = 15                    # 0.25 s a 60 fps: desvío antes de que el caos lo amplifique
+
+
+def make_game(screen, profile, walls):
+    from game import Game
+    from input_providers import MouseProvider
+    game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[MouseProvider(), MouseProvider()], walls=walls, physics=profile)
+    # Mazos sin entrada: Player.path los deja quietos donde estén
+    for player, pos in zip(game.players, MALLETS):
+        player.input = None
+        player.body.position = pos
+        player.body.velocity = (0, 0)
+    return game
+
+
+def shots(rink, n, seed):
+    """Tiros (posición, velocidad) reproducibles; el puck no arranca encima de un mazo."""
+    rng = random.Random(seed)
+    result = []
+    while len(result) < n:
+        x = rink.rect.centerx + rng.uniform(-450, 450)
+        y = rink.rect.centery + rng.uniform(-250, 250)
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(400, 1000)
+        if any(math.hypot(x - mx, y - my) < 90 for mx, my in MALLETS):
+            continue
+        result.append(((x, y), (speed * math.cos(angle), speed * math.sin(angle))))
+    return result
+
+
+def run_profile(game, shot_list, frames_per_shot, dt):
+    from ui_manager import GameState
+    rink = game.rink
+    puck = game.puck
+    contact = [puck.radius + p.radius for p in game.players]
+
+    update_ms = []
+    overlaps = []
+    escapes = sleeping = 0
+    tracks = []
+    for position, velocity in shot_list:
+        game.ui.timer = 120
+        puck.body.position = position
+        puck.body.velocity = velocity
+        puck.body.angular_velocity = 0
+        for player, pos in zip(game.players, MALLETS):
+            player.body.position = pos
+        track = []
+        for _ in range(frames_per_shot):
+            game.ui.state = GameState.RUNNING
+            game.pending_goal_team = None
+            t = time.perf_counter()
+            game.update(dt)
+            update_ms.append((time.perf_counter() - t) * 1000)
+
+            x, y = puck.body.position
+            track.append((x, y))
+            sleeping += puck.body.is_sleeping
+            for player, reach in zip(game.players, contact):
+                px, py = player.body.position
+                overlap = reach - math.hypot(x - px, y - py)
+                if overlap > 0:
+                    overlaps.append(overlap)
+            if outside_rink(rink, x, y):
+                escapes += 1
+                break
+        tracks.append(track)
+
+    update_ms.sort()
+    return {
+        "update_ms_mean": statistics.fmean(update_ms),
+        "update_ms_p99": update_ms[int(len(update_ms) * 0.99)],
+        "substeps": game.substeps,
+        "escapes": escapes,
+        "overlap_max": max(overlaps, default=0.0),
+        "overlap_mean": statistics.fmean(overlaps) if overlaps else 0.0,
+        "sleeping_frames": sleeping,
+        "tracks": tracks,
+    }
+
+
+def deviation(tracks, reference, frame):
+    """Distancia media (px) al tiro de referencia en el frame dado (o el último)."""
+    errors = []
+    for track, ref in zip(tracks, reference):
+        k = min(frame, len(track), len(ref)) - 1
+        if k >= 0:
+            errors.append(math.dist(track[k], ref[k]))
+    return statistics.fmean(errors) if errors else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo y precisión de los perfiles de física")
+    parser.add_argument("--profiles", default=",".join(PROFILES),
+                        help="perfiles separados por coma (por defecto todos)")
+    parser.add_argument("--shots", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=90, help="frames por tiro")
+    parser.add_argument("--stall", type=float, default=0.0,
+                        help="dt de los frames en segundos (0 = 1/60; p. ej. 0.05 simula 20 fps)")
+    parser.add_argument("--walls", choices=("python", "solver"), default="python")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.profiles.split(",") if n.strip()]
+    if REFERENCE not in names:
+        names.append(REFERENCE)
+    dt = args.stall or 1 / 60
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    results = {}
+    shot_list = None
+    for name in names:
+        game = make_game(screen, name, args.walls)
+        if shot_list is None:
+            shot_list = shots(game.rink, args.shots, args.seed)
+        results[name] = run_profile(game, shot_list, args.frames, dt)
+    reference = results[REFERENCE]["tracks"]
+
+    print(f"{args.shots} tiros x {args.frames} frames, dt {dt * 1000:.1f} ms, paredes {args.walls}; "
+          f"desvío contra {REFERENCE}")
+    print(f"{'perfil':<17}{'subp.':>6}{'update ms':>11}{'p99':>8}{'túnel':>7}"
+          f"{'penetr. máx':>13}{'media':>7}{'desvío 0.25s':>14}{'final':>8}{'dormido':>9}")
+    for name in names:
+        r = results[name]
+        print(f"{name:<17}{r['substeps']:>6}{r['update_ms_mean']:>11.3f}{r['update_ms_p99']:>8.3f}"
+              f"{r['escapes']:>7}{r['overlap_max']:>13.2f}{r['overlap_mean']:>7.2f}"
+              f"{deviation(r['tracks'], reference, EARLY_FRAMES):>14.2f}"
+              f"{deviation(r['tracks'], reference, args.frames):>8.1f}{r['sleeping_frames']:>9}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import math
+from typing import NamedTuple
+
+
+class PhysicsProfile(NamedTuple):
+    """
+    Ajustes del pymunk.Space y política de subpasos, elegidos juntos (Game(physics=...)).
+    Los subpasos por frame son ceil(dt / max_step), limitados a [min_substeps, max_substeps].
+    """
+    name: str
+    iterations: int = 10              # iteraciones del solver por paso (default de pymunk)
+    collision_slop: float = 0.1       # px de penetración tolerada (default de pymunk)
+    sleep_time: float = math.inf      # s en reposo antes de dormir el puck (inf = nunca)
+    idle_speed: float = 0.0           # px/s por debajo de los cuales el puck cuenta como en reposo
+    spatial_hash: tuple = None        # (tamaño de celda px, cantidad de celdas) o None = árbol AABB
+    max_step: float = 1 / 900
+    min_substeps: int = 15
+    max_substeps: int = 15
+    description: str = ""
+
+    def substeps_for(self, dt):
+        # El épsilon evita un subpaso de más por redondeo (1/60 / 1/900 = 15.000000000000002)
+        steps = math.ceil(dt / self.max_step - 1e-9)
+        return max(self.min_substeps, min(self.max_substeps, steps))
+
+    def apply(self, space):
+        """Configura el espacio. El spatial hash no se puede deshacer: aplicar una sola vez."""
+        space.iterations = self.iterations
+        space.collision_slop = self.collision_slop
+        space.sleep_time_threshold = self.sleep_time
+        space.idle_speed_threshold = self.idle_speed
+        if self.spatial_hash is not None:
+            space.use_spatial_hash(*self.spatial_hash)
+
+
+PROFILES = {p.name: p for p in (
+    # Lo que el juego usó siempre: 15 subpasos fijos por frame, solver por defecto
+    PhysicsProfile("projector-60fps",
+                   description="mesa con proyector a 60 fps (comportamiento original)"),
+    # Simulaciones sin pantalla (multi-mesa, análisis, robots): menos subpasos e iteraciones,
+    # el puck duerme cuando queda quieto y las celdas del hash son del tamaño de un mazo
+    PhysicsProfile("headless-fast", iterations=5, collision_slop=0.5, sleep_time=0.5,
+                   idle_speed=5.0, spatial_hash=(100, 512), max_step=1 / 240,
+                   min_substeps=2, max_substeps=8,
+                   description="pocos subpasos; para simular muchas mesas o más rápido que real"),
+    # Mesa con proyector cuando el frame no alcanza (quality.FrameGovernor): mismo solver,
+    # subpasos de ~2 ms (8 por frame a 60 fps) y ningún ajuste que no se pueda cambiar en caliente
+    PhysicsProfile("projector-light", max_step=1 / 480, min_substeps=4, max_substeps=15,
+                   description="menos subpasos para liberar tiempo de frame sin dejar el proyector"),
+    # Subpasos de ~0.55 ms sin importar el dt: frames lentos no agrandan el paso de física
+    PhysicsProfile("high-accuracy", iterations=20, collision_slop=0.05, max_step=1 / 1800,
+                   min_substeps=15, max_substeps=120,
+                   description="paso de física corto y constante, aunque el frame se alargue"),
+)}
+
+DEFAULT_PROFILE = "projector-60fps"
+
+
+def get_profile(profile):
+    """Perfil por nombre (o el mismo PhysicsProfile si ya lo es)."""
+    if isinstance(profile, PhysicsProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"perfil de física desconocido: {profile} "
+                         f"(opciones: {', '.join(PROFILES)})") from None
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class FrameState(NamedTuple):
+    """Registro inmutable con todo lo que el render necesita para dibujar un frame."""
+    seq: int
+    sim_time: float        # perf_counter() al publicar el estado
+    input_time: float      # perf_counter() de la entrada más reciente usada
+    puck_pos: tuple
+    player_pos: tuple      # ((x1, y1), (x2, y2), ...)
+    team1_score: int
+    team2_score: int
+    time_left: float
+    ui_state: object       # GameState
+    result_text: str
+    warning_active: bool
+    warning_type: str
+    continue_timer: float
+    ready_go_stage: str
+    ready_go_timer: float
+
+
+class TripleBuffer:
+    """
+    Triple buffer productor/consumidor.
+    La simulación escribe en su slot sin esperar al render, y el render
+    siempre toma el estado publicado más reciente (los intermedios se descartan).
+    """
+    def __init__(self):
+        self._slots = [None, None, None]
+        self._write = 0
+        self._ready = 1
+        self._read = 2
+        self._fresh = False
+        self._lock = threading.Lock()   # solo protege el intercambio de índices
+
+    def publish(self, state):
+        self._slots[self._write] = state
+        with self._lock:
+            self._write, self._ready = self._ready, self._write
+            self._fresh = True
+
+    def latest(self):
+        """Devuelve el estado más reciente (o None si aún no se publicó nada)."""
+        with self._lock:
+            if self._fresh:
+                self._read, self._ready = self._ready, self._read
+                self._fresh = False
+        return self._slots[self._read]
+
+
+class LoopStats:
+    """Mide el jitter de la simulación y la latencia entrada→pantalla de un modo de loop."""
+    def __init__(self, name, target_dt, size=3600):
+        self.name = name
+        self.target_dt = target_dt
+        self.sim_intervals = deque(maxlen=size)
+        self.photon_latency = deque(maxlen=size)
+        self._last_sim = None
+        self._last_input = None
+
+    def sim_tick(self, now=None):
+        """Registrar el inicio de un paso de simulación."""
+        now = time.perf_counter() if now is None else now
+        if self._last_sim is not None:
+            self.sim_intervals.append(now - self._last_sim)
+        self._last_sim = now
+
+    def presented(self, input_time, now=None):
+        """Registrar un flip que muestra una entrada recibida en input_time."""
+        # Solo el primer flip que muestra cada entrada (el mouse quieto no genera entradas nuevas)
+        if not input_time or input_time == self._last_input:
+            return
+        self._last_input = input_time
+        now = time.perf_counter() if now is None else now
+        self.photon_latency.append(now - input_time)
+
+    @staticmethod
+    def _percentile(values, q):
+        data = sorted(values)
+        if not data:
+            return 0.0
+        idx = min(len(data) - 1, int(round(q * (len(data) - 1))))
+        return data[idx]
+
+    def summary(self):
+        """Resumen en milisegundos."""
+        intervals = list(self.sim_intervals)
+        latency = list(self.photon_latency)
+        jitter = 0.0
+        if intervals:
+            jitter = (sum((i - self.target_dt) ** 2 for i in intervals) / len(intervals)) ** 0.5
+        return {
+            "mode": self.name,
+            "sim_steps": len(intervals),
+            "sim_jitter_ms": jitter * 1000,
+            "sim_interval_p99_ms": self._percentile(intervals, 0.99) * 1000,
+            "photon_latency_p50_ms": self._percentile(latency, 0.50) * 1000,
+            "photon_latency_p95_ms": self._percentile(latency, 0.95) * 1000,
+        }
+
+    def report(self):
+        s = self.summary()
+        log.info("[%s] pasos=%d jitter=%.2f ms p99=%.2f ms | entrada→pantalla p50=%.2f ms p95=%.2f ms",
+                 s["mode"], s["sim_steps"], s["sim_jitter_ms"], s["sim_interval_p99_ms"],
+                 s["photon_latency_p50_ms"], s["photon_latency_p95_ms"], extra=s)
@@ -1,11 +1,13 @@
 import pygame
 import pymunk
 import math
+from assets import ASSETS
 
 class Player:
-    def __init__(self, space, x, y, radius=45, mass=200, asset_path=None):
+    def __init__(self, space, x, y, radius=45, mass=200, asset_path=None, team=1):
         self.radius = radius
         self.mass = mass
+        self.team = team     # 1 = defiende la portería izquierda, 2 = la derecha
 
         # Cuerpo kinemático
         self.body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
@@ -19,59 +21,113 @@ class Player:
 
         space.add(self.body, self.shape)
 
+        # Fuente de posiciones (InputProvider); la asigna Game.attach_inputs
+        self.input = None
+
         # --- Imagen del jugador ---
         if asset_path:
-            self.image = pygame.image.load(asset_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (radius*3, radius*4))
+            self.image = ASSETS.image(asset_path, (radius*3, radius*4), alpha=True)
         else:
             self.image = None
 
     def update(self, dt, rink, target_x=None, target_y=None):
         if target_x is None or target_y is None:
             target_x, target_y = self.body.position
+        target_x, target_y = self.clamp_target(rink, target_x, target_y)
+
+        px, py = self.body.position
+        self.body.velocity = ((target_x - px) / dt, (target_y - py) / dt)
 
+    def clamp_target(self, rink, target_x, target_y):
+        """Objetivo limitado al interior del rink (rect base y paredes)."""
         # Limitar target dentro del rect base
         target_x = max(rink.rect.left + self.radius,
                        min(rink.rect.right - self.radius, target_x))
         target_y = max(rink.rect.top + self.radius,
                        min(rink.rect.bottom - self.radius, target_y))
 
-        # Ajustar target usando las walls
-        for wall in rink.walls:
-            if isinstance(wall, pymunk.Segment):
-                ax, ay = wall.a
-                bx, by = wall.b
-                abx = bx - ax
-                aby = by - ay
-                apx = target_x - ax
-                apy = target_y - ay
-                ab_len2 = abx**2 + aby**2
-                t = max(0, min(1, (apx*abx + apy*aby) / ab_len2))
-                nearest_x = ax + abx * t
-                nearest_y = ay + aby * t
-                dx_n = target_x - nearest_x
-                dy_n = target_y - nearest_y
-                dist = math.hypot(dx_n, dy_n)
-                min_dist = self.radius + wall.radius
-
-                if dist < min_dist and dist > 0:
-                    nx = dx_n / dist
-                    ny = dy_n / dist
-                    target_x += nx * (min_dist - dist)
-                    target_y += ny * (min_dist - dist)
-
-        dx = target_x - self.body.position.x
-        dy = target_y - self.body.position.y
-        self.body.velocity = (dx / dt, dy / dt)
+        # Ajustar target usando las walls (geometría precalculada en rink.segments)
+        for ax, ay, abx, aby, inv_ab_len2, wall_radius in rink.segments:
+            apx = target_x - ax
+            apy = target_y - ay
+            t = (apx*abx + apy*aby) * inv_ab_len2
+            if t < 0:
+                t = 0
+            elif t > 1:
+                t = 1
+            dx_n = apx - abx * t
+            dy_n = apy - aby * t
+            dist2 = dx_n*dx_n + dy_n*dy_n
+            min_dist = self.radius + wall_radius
+            if dist2 >= min_dist * min_dist:
+                continue
+            dist = math.sqrt(dist2)
+
+            if dist > 0:
+                nx = dx_n / dist
+                ny = dy_n / dist
+                target_x += nx * (min_dist - dist)
+                target_y += ny * (min_dist - dist)
+        return target_x, target_y
+
+    def path(self, rink, t0, t1, delay=0.0):
+        """
+        Trayectoria del jugador durante un frame: nodos (t, x, y) desde su posición actual
+        pasando por todas las muestras de su entrada, retrasadas 'delay' s. Con el retraso,
+        al final del frame ya llegó la muestra siguiente y siempre hay hacia dónde interpolar
+        (sin ella el jugador se detendría y saltaría al empezar el frame siguiente).
+        Si la última muestra es anterior a la ventana, va hacia ella a lo largo del frame.
+        """
+        x, y = self.body.position
+        knots = [(t0, x, y)]
+        provider = self.input
+        if provider is None:
+            knots.append((t1, *self.clamp_target(rink, x, y)))
+            return knots
+        for sample in provider.samples_between(t0 - delay, t1):
+            knots.append((sample.t + delay, *self.clamp_target(rink, sample.x, sample.y)))
+        if len(knots) == 1:
+            latest = provider.latest()
+            if latest is not None and latest.t <= t0 - delay:
+                x, y = latest.x, latest.y
+                knots.append((t1, *self.clamp_target(rink, x, y)))
+        return knots
+
+    def follow(self, knots, t, dt):
+        """Velocidad para estar, al final del subpaso dt, en el punto de 'knots' del instante t."""
+        tx, ty = knots[-1][1], knots[-1][2]
+        if t < knots[-1][0]:
+            # Interpolación lineal entre los dos nodos que rodean a t
+            for (ta, xa, ya), (tb, xb, yb) in zip(knots, knots[1:]):
+                if t < tb:
+                    u = (t - ta) / (tb - ta) if tb > ta else 1.0
+                    tx = xa + (xb - xa) * u
+                    ty = ya + (yb - ya) * u
+                    break
+        px, py = self.body.position
+        self.body.velocity = ((tx - px) / dt, (ty - py) / dt)
 
     def draw(self, screen):
         x, y = self.body.position
+        self.draw_at(screen, x, y)
+
+    def draw_at(self, screen, x, y):
+        """Dibuja el jugador en una posición dada (p. ej. desde un FrameState)."""
         if self.image:
             rect = self.image.get_rect(center=(int(x), int(y)))
             screen.blit(self.image, rect)
         else:
             pygame.draw.circle(screen, (0, 0, 200), (int(x), int(y)), self.radius)
 
+    def bounds(self):
+        """Rect de pantalla que ocupa el sprite (para redibujar solo esa zona)."""
+        x, y = self.body.position
+        x, y = int(x), int(y)
+        if self.image:
+            return self.image.get_rect(center=(x, y))
+        r = self.radius
+        return pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1)
+
     def draw_debug(self, screen, rink=None):
         x, y = self.body.position
         pygame.draw.circle(screen, (255, 0, 0), (int(x), int(y)), self.radius, 1)
@@ -0,0 +1,155 @@
+import time
+import logging
+from array import array
+import pygame
+
+log = logging.getLogger(__name__)
+
+# Fases del frame en el orden en que ocurren
+PHASES = (
+    "events",       # pygame.event.get() y teclado
+    "timers",       # UIManager.update_timer / fin de partida
+    "goals",        # process_pending_goal
+    "players",      # trayectorias de los jugadores (Player.path)
+    "physics",      # lote de space.step
+    "puck",         # limit_speed + keep_inside_rink
+    "draw_layers",  # capas estáticas
+    "draw_sprites", # LEDs, puck, jugadores, hitboxes
+    "draw_ui",      # overlays y textos
+    "flip",         # pygame.display.flip
+)
+
+
+class FrameProfiler:
+    """
+    Perfilador por fases con buffer circular de tamaño fijo.
+    mark(fase) suma el tiempo transcurrido desde la marca anterior a esa fase;
+    no asigna memoria por frame (arrays preasignados).
+    """
+    def __init__(self, name="frame", phases=PHASES, counters=("mqtt_msgs",), size=600):
+        self.name = name
+        self.phases = phases
+        self.counters = counters
+        self.size = size
+        self.index = {phase: i for i, phase in enumerate(phases)}
+        self.counter_index = {c: i for i, c in enumerate(counters)}
+
+        self.ring = [array("d", bytes(8 * size)) for _ in phases]
+        self.total = array("d", bytes(8 * size))
+        self.counter_ring = [array("d", bytes(8 * size)) for _ in counters]
+
+        self.current = array("d", bytes(8 * len(phases)))
+        self.current_counters = array("d", bytes(8 * len(counters)))
+        self.pos = 0
+        self.count = 0
+        self._frame_start = time.perf_counter()
+        self._last = self._frame_start
+
+        # Seguimiento de asignaciones opcional (memory_control.AllocationTracker)
+        self.alloc = None
+
+        # HUD (se re-renderiza pocas veces por segundo)
+        self.hud_extra = None       # callable -> lista de líneas extra
+        self._hud_font = None
+        self._hud_lines = []
+        self._hud_next = 0.0
+
+    # ------------------------------------------------------
+    def begin_frame(self):
+        for i in range(len(self.current)):
+            self.current[i] = 0.0
+        if self.alloc is not None:
+            self.alloc.begin_frame()
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Asigna a 'phase' el tiempo desde la marca anterior."""
+        now = time.perf_counter()
+        self.current[self.index[phase]] += now - self._last
+        if self.alloc is not None:
+            self.alloc.mark(phase)
+            now = time.perf_counter()   # no contar el costo de tracemalloc
+        self._last = now
+
+    def skip(self):
+        """Descarta el tiempo desde la marca anterior (p. ej. esperas)."""
+        self._last = time.perf_counter()
+
+    def set_counter(self, name, value):
+        self.current_counters[self.counter_index[name]] = value
+
+    def end_frame(self):
+        pos = self.pos
+        for i, value in enumerate(self.current):
+            self.ring[i][pos] = value
+        for i, value in enumerate(self.current_counters):
+            self.counter_ring[i][pos] = value
+        self.total[pos] = time.perf_counter() - self._frame_start
+        self.pos = (pos + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        if self.alloc is not None:
+            self.alloc.end_frame()
+
+    # ------------------------------------------------------
+    def _values(self, data):
+        if self.count < self.size:
+            return list(data[:self.count])
+        return list(data)
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[min(len(values) - 1, int(q * (len(values) - 1)))]
+
+    def stats(self):
+        """{fase: (media_ms, p95_ms)} sobre el contenido del buffer."""
+        result = {}
+        for phase, data in zip(self.phases + ("total",), self.ring + [self.total]):
+            values = self._values(data)
+            mean = sum(values) / len(values) if values else 0.0
+            result[phase] = (mean * 1000, self._percentile(values, 0.95) * 1000)
+        return result
+
+    # ------------------------------------------------------
+    def draw_hud(self, screen, pos=(10, 10)):
+        """Tabla de tiempos por fase (solo con debug activo)."""
+        now = time.perf_counter()
+        if now >= self._hud_next:
+            self._hud_next = now + 0.5
+            if self._hud_font is None:
+                self._hud_font = pygame.font.Font("../assets/VCR_MONO.ttf", 18)
+            stats = self.stats()
+            mean_total = stats["total"][0]
+            fps = 1000 / mean_total if mean_total > 0 else 0
+            lines = [f"{self.name}: {mean_total:5.2f} ms  ({fps:4.0f} fps max)"]
+            for phase in self.phases:
+                mean, p95 = stats[phase]
+                if mean > 0 or p95 > 0:
+                    lines.append(f"{phase:<13}{mean:6.2f} {p95:6.2f}")
+            if self.hud_extra is not None:
+                lines += self.hud_extra()
+            self._hud_lines = [self._hud_font.render(line, True, (0, 255, 0), (0, 0, 0))
+                               for line in lines]
+
+        x, y = pos
+        for surf in self._hud_lines:
+            screen.blit(surf, (x, y))
+            y += surf.get_height()
+        return y
+
+    # ------------------------------------------------------
+    def export_csv(self, path):
+        """Exporta el contenido del buffer (un frame por fila, tiempos en ms)."""
+        start = self.pos - self.count
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(",".join(("frame",) + self.phases + ("total",) + self.counters) + "\n")
+            for n in range(self.count):
+                i = (start + n) % self.size
+                row = [str(n)]
+                row += [f"{data[i] * 1000:.4f}" for data in self.ring]
+                row.append(f"{self.total[i] * 1000:.4f}")
+                row += [f"{data[i]:g}" for data in self.counter_ring]
+                f.write(",".join(row) + "\n")
+        log.info("Perfil de frames exportado a %s (%d frames)", path, self.count)
@@ -0,0 +1,157 @@
+"""
+Benchmark del publicador de estado contra un broker MQTT local de reemplazo.
+
+El broker (StandInBroker) solo entiende lo necesario para QoS 0: CONNECT/CONNACK,
+PUBLISH (se cuenta y se descarta), SUBSCRIBE/SUBACK, PINGREQ/PINGRESP y DISCONNECT.
+Mide el costo de capture() en el loop, mensajes y bytes por segundo que llegan al broker,
+descartes de la cola y tamaño binario contra el JSON equivalente.
+
+Uso (desde src/):
+    python publisher_bench.py                       # 5 s publicando en cada paso
+    python publisher_bench.py --rate 120 --seconds 10
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import socketserver
+import statistics
+import threading
+import time
+
+import pygame
+
+from state_publisher import StateDecoder, StatePublisher
+
+
+class StandInBroker(socketserver.ThreadingTCPServer):
+    """Broker MQTT mínimo en 127.0.0.1 (un hilo por cliente)."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0, keep=0):
+        super().__init__(("127.0.0.1", port), _BrokerHandler)
+        self.published = 0
+        self.published_bytes = 0
+        self.keep = keep              # cuántos payloads guardar para verificar el decodificador
+        self.payloads = []
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    def _read(self, n):
+        data = b""
+        while len(data) < n:
+            chunk = self.request.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return data
+
+    def handle(self):
+        server = self.server
+        try:
+            while True:
+                packet_type = self._read(1)[0] >> 4
+                length, mult = 0, 1
+                while True:
+                    byte = self._read(1)[0]
+                    length += (byte & 0x7F) * mult
+                    mult *= 128
+                    if not byte & 0x80:
+                        break
+                body = self._read(length) if length else b""
+
+                if packet_type == 1:        # CONNECT
+                    self.request.sendall(b"\x20\x02\x00\x00")
+                elif packet_type == 3:      # PUBLISH (QoS 0)
+                    topic_len = int.from_bytes(body[:2], "big")
+                    payload = body[2 + topic_len:]
+                    with server._lock:
+                        server.published += 1
+                        server.published_bytes += len(payload)
+                        if len(server.payloads) < server.keep:
+                            server.payloads.append(payload)
+                elif packet_type == 8:      # SUBSCRIBE
+                    self.request.sendall(b"\x90\x03" + body[:2] + b"\x00")
+                elif packet_type == 12:     # PINGREQ
+                    self.request.sendall(b"\xd0\x00")
+                elif packet_type == 14:     # DISCONNECT
+                    return
+        except (ConnectionError, OSError):
+            return
+
+
+def json_equivalent(state):
+    return json.dumps(state).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput del publicador de estado")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=0,
+                        help="frecuencia de publicación (0 = en cada paso)")
+    parser.add_argument("--queue", type=int, default=64)
+    parser.add_argument("--keyframe-every", type=int, default=30)
+    args = parser.parse_args()
+
+    broker = StandInBroker(keep=2000).start()
+
+    from benchmark import Context
+    ctx = Context()
+    ctx.reset_running()
+    game = ctx.game
+
+    publisher = StatePublisher(game, "127.0.0.1", broker.port, rate_hz=args.rate,
+                               keyframe_every=args.keyframe_every, queue_size=args.queue)
+    publisher.start()
+    while not publisher.client.is_connected():
+        time.sleep(0.01)
+
+    capture_us = []
+    steps = 0
+    start = time.perf_counter()
+    end = start + args.seconds
+    while time.perf_counter() < end:
+        game.update(1 / 120)
+        if game.ui.state != ctx.GameState.RUNNING:
+            ctx.reset_running()
+        t = time.perf_counter()
+        publisher.capture(t)
+        capture_us.append((time.perf_counter() - t) * 1e6)
+        steps += 1
+    elapsed = time.perf_counter() - start
+    time.sleep(0.5)       # dejar que el hilo y paho vacíen lo pendiente
+    publisher.stop()
+    broker.shutdown()
+
+    decoder = StateDecoder()
+    states = [s for s in (decoder.decode(p) for p in broker.payloads) if s is not None]
+    binary_avg = broker.published_bytes / max(1, broker.published)
+    json_avg = statistics.mean(len(json_equivalent(s)) for s in states) if states else 0.0
+    capture_us.sort()
+
+    print(f"pasos del loop        {steps} en {elapsed:.2f} s")
+    print(f"capture() p50/p99/max {capture_us[len(capture_us) // 2]:.1f} / "
+          f"{capture_us[int(len(capture_us) * 0.99)]:.1f} / {capture_us[-1]:.1f} µs")
+    print(f"capturados            {publisher.captured}")
+    print(f"recibidos por broker  {broker.published} ({broker.published / elapsed:.0f} msg/s, "
+          f"{broker.published_bytes / elapsed / 1024:.1f} KiB/s)")
+    print(f"descartados           {publisher.dropped}")
+    print(f"bytes por mensaje     {binary_avg:.1f} binario vs {json_avg:.1f} JSON")
+    print(f"decodificados         {len(states)}/{len(broker.payloads)} (huecos: {decoder.gaps})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pygame
 import pymunk
+from assets import ASSETS
 
 class Puck:
     def __init__(self, space: pymunk.Space, x, y, radius=15, mass=120, max_speed=1000, asset_path=None):
@@ -17,10 +18,16 @@ class Puck:
 
         space.add(self.body, self.shape)
 
+        # Por debajo de esta velocidad limit_speed no toca al puck, para que pymunk lo pueda
+        # dormir (asignar la velocidad lo despierta); 0 = nunca. Lo fija el perfil de física.
+        self.rest_speed = 0.0
+
+        # Veces que keep_inside_rink tuvo que mover el puck (red de seguridad en modo solver)
+        self.corrections = 0
+
         # --- Imagen del puck ---
         if asset_path:
-            self.image = pygame.image.load(asset_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (radius*2.5, radius*2.5))
+            self.image = ASSETS.image(asset_path, (radius*2.5, radius*2.5), alpha=True)
         else:
             self.image = None
 
@@ -32,8 +39,11 @@ class Puck:
     def limit_speed(self):
         """Limita y amortigua la velocidad del puck."""
         vx, vy = self.body.velocity
-        speed = (vx ** 2 + vy ** 2) ** 0.5
-        if speed > self.max_speed:
+        speed2 = vx * vx + vy * vy
+        if speed2 < self.rest_speed * self.rest_speed:
+            return
+        if speed2 > self.max_speed * self.max_speed:
+            speed = speed2 ** 0.5
             scale = self.max_speed / speed
             vx *= scale
             vy *= scale
@@ -42,8 +52,13 @@ class Puck:
             vy *= 0.995
         self.body.velocity = (vx, vy)
 
-    def keep_inside_rink(self, rink):
-        """Evita que el puck atraviese las paredes del rink o se quede pegado en esquinas."""
+    def keep_inside_rink(self, rink, slack=0.0):
+        """
+        Evita que el puck atraviese las paredes del rink o se quede pegado en esquinas.
+        slack: penetración tolerada (px) antes de corregir; con las paredes resueltas por
+        pymunk (modo "solver") solo actúa si el solver dejó al puck incrustado.
+        Devuelve el índice (en rink.walls) del muro contra el que rebotó, o -1.
+        """
         x, y = self.body.position
         vx, vy = self.body.velocity
 
@@ -51,69 +66,86 @@ class Puck:
         correction_strength = 0.6     # qué tan fuerte corrige si se incrusta en una pared
         extra_padding = 0.5           # pequeña separación adicional para evitar quedarse dentro
 
-        for wall in rink.walls:
-            if isinstance(wall, pymunk.Segment):
-                ax, ay = wall.a
-                bx, by = wall.b
-
-                # Vector AB (dirección del segmento)
-                abx = bx - ax
-                aby = by - ay
-                ab_len2 = abx**2 + aby**2
-
-                # Proyección del punto puck sobre el segmento (clamp 0..1)
-                apx = x - ax
-                apy = y - ay
-                t = max(0.0, min(1.0, (apx * abx + apy * aby) / ab_len2))
-
-                # Punto más cercano en el segmento
-                nearest_x = ax + abx * t
-                nearest_y = ay + aby * t
-
-                # Vector desde el segmento hacia el puck
-                dx = x - nearest_x
-                dy = y - nearest_y
-                dist = (dx * dx + dy * dy) ** 0.5
-                min_dist = self.radius + wall.radius + extra_padding
-
-                # Si está demasiado cerca o dentro del muro
-                if dist < min_dist and dist > 0:
-                    nx = dx / dist
-                    ny = dy / dist
-
-                    # Desplazar suavemente al puck fuera del muro
-                    correction = (min_dist - dist) * correction_strength
-                    x += nx * correction
-                    y += ny * correction
-
-                    # Rebote de velocidad (reflexión)
-                    dot = vx * nx + vy * ny
-                    vx -= 2 * dot * nx
-                    vy -= 2 * dot * ny
-
-                    # Pequeña amortiguación para estabilidad
-                    vx *= rebound_damping
-                    vy *= rebound_damping
-
-                    # Límite superior de velocidad para evitar “saltos”
-                    speed = (vx**2 + vy**2) ** 0.5
-                    if speed > 1000:
-                        factor = 1000 / speed
-                        vx *= factor
-                        vy *= factor
-
-        # Aplicar nueva posición y velocidad
-        self.body.position = (x, y)
-        self.body.velocity = (vx, vy)
+        changed = False
+        hit = -1
+        # rink.segments = (ax, ay, abx, aby, 1/|ab|², radio) precalculados por el Rink
+        for index, (ax, ay, abx, aby, inv_ab_len2, wall_radius) in enumerate(rink.segments):
+            # Proyección del punto puck sobre el segmento (clamp 0..1)
+            apx = x - ax
+            apy = y - ay
+            t = (apx * abx + apy * aby) * inv_ab_len2
+            if t < 0.0:
+                t = 0.0
+            elif t > 1.0:
+                t = 1.0
+
+            # Vector desde el punto más cercano del segmento hacia el puck
+            dx = apx - abx * t
+            dy = apy - aby * t
+            dist2 = dx * dx + dy * dy
+            min_dist = self.radius + wall_radius + extra_padding - slack
+
+            # Descarte barato: lejos del muro (caso de casi todos los segmentos)
+            if dist2 >= min_dist * min_dist:
+                continue
+            dist = dist2 ** 0.5
+
+            # Si está demasiado cerca o dentro del muro
+            if dist > 0:
+                changed = True
+                nx = dx / dist
+                ny = dy / dist
+
+                # Desplazar suavemente al puck fuera del muro
+                correction = (min_dist - dist) * correction_strength
+                x += nx * correction
+                y += ny * correction
+
+                # Rebote de velocidad (reflexión)
+                dot = vx * nx + vy * ny
+                if dot < 0:
+                    hit = index       # venía hacia el muro: rebote real, no solo apoyo
+                vx -= 2 * dot * nx
+                vy -= 2 * dot * ny
+
+                # Pequeña amortiguación para estabilidad
+                vx *= rebound_damping
+                vy *= rebound_damping
+
+                # Límite superior de velocidad para evitar “saltos”
+                speed = (vx**2 + vy**2) ** 0.5
+                if speed > 1000:
+                    factor = 1000 / speed
+                    vx *= factor
+                    vy *= factor
+
+        # Aplicar nueva posición y velocidad (solo si hubo corrección)
+        if changed:
+            self.corrections += 1
+            self.body.position = (x, y)
+            self.body.velocity = (vx, vy)
+        return hit
 
     def draw(self, screen):
-        x, y = int(self.body.position.x), int(self.body.position.y)
+        self.draw_at(screen, self.body.position.x, self.body.position.y)
+
+    def draw_at(self, screen, x, y):
+        """Dibuja el puck en una posición dada (p. ej. desde un FrameState)."""
+        x, y = int(x), int(y)
         if self.image:
             rect = self.image.get_rect(center=(x, y))
             screen.blit(self.image, rect)
         else:
             pygame.draw.circle(screen, (30, 30, 30), (x, y), self.radius*10)
 
+    def bounds(self):
+        """Rect de pantalla que ocupa el sprite (para redibujar solo esa zona)."""
+        x, y = int(self.body.position.x), int(self.body.position.y)
+        if self.image:
+            return self.image.get_rect(center=(x, y))
+        r = self.radius * 10
+        return pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1)
+
     def draw_debug(self, screen):
         x, y = int(self.body.position.x), int(self.body.position.y)
         pygame.draw.circle(screen, (255, 0, 0), (x, y), self.radius, 1)
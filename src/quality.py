@@ -0,0 +1,125 @@
+"""
+Gobernador del presupuesto de frame (Game(governor=True), --governor).
+
+Mira el p95 del tiempo de trabajo de los últimos frames (sin la espera del clock) y, si se
+acerca al presupuesto de 16.7 ms, baja un nivel de calidad; si sobra margen durante un rato,
+sube uno. Los niveles sacrifican primero lo visual y por último la física, para que el puck y
+los mazos sigan moviéndose a 60 fps:
+
+    full             todo como siempre
+    no-debug         sin HUD ni hitboxes aunque el debug esté activado (D)
+    scoreboard-4hz   LEDs encendidos desde una copia que se redibuja 4 veces por segundo
+    partial-present  en juego solo se restauran y presentan las zonas que cambiaron
+    light-physics    perfil de física "projector-light" (menos subpasos por frame)
+
+Histéresis: para bajar basta medio segundo por encima del 85 % del presupuesto; para subir
+hacen falta 5 s seguidos por debajo del 50 %, y si al subir hay que volver a bajar enseguida,
+la espera para el próximo intento se duplica (hasta 60 s). Cada cambio queda en el log.
+"""
+import logging
+import time
+from collections import deque
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class QualityLevel(NamedTuple):
+    name: str
+    debug: bool = True                # se permite dibujar el debug (HUD, hitboxes, geometría)
+    scoreboard_hz: float = None       # refresco de los LEDs encendidos (None = cada frame)
+    partial_present: bool = False     # display.update de las zonas cambiadas en vez de flip
+    physics: str = None               # perfil de física a usar (None = el elegido al crear el Game)
+
+
+LEVELS = (
+    QualityLevel("full"),
+    QualityLevel("no-debug", debug=False),
+    QualityLevel("scoreboard-4hz", debug=False, scoreboard_hz=4),
+    QualityLevel("partial-present", debug=False, scoreboard_hz=4, partial_present=True),
+    QualityLevel("light-physics", debug=False, scoreboard_hz=4, partial_present=True,
+                 physics="projector-light"),
+)
+
+
+class FrameGovernor:
+    """
+    frame(trabajo) una vez por frame presentado; cuando el nivel cambia llama on_change(nivel).
+    Los tiempos se descartan en cada cambio: el nivel nuevo se juzga con sus propios frames.
+    """
+    def __init__(self, on_change=None, budget=1 / 60, levels=LEVELS, window=60, percentile=0.95,
+                 down=0.85, up=0.5, up_hold=5.0, max_up_hold=60.0, flap=10.0):
+        self.on_change = on_change
+        self.budget = budget
+        self.levels = levels
+        self.samples = deque(maxlen=window)
+        self.min_samples = window // 2      # ~0.5 s a 60 fps
+        self.percentile = percentile
+        self.down = down
+        self.up = up
+        self.base_up_hold = up_hold
+        self.up_hold = up_hold
+        self.max_up_hold = max_up_hold
+        self.flap = flap                    # s: bajar antes de esto tras subir cuenta como rebote
+
+        self.level = 0
+        self.calm_since = None
+        self.raised_at = None
+        self.transitions = 0
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def p95(self):
+        values = sorted(self.samples)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(self.percentile * (len(values) - 1)))]
+
+    # ------------------------------------------------------
+    def frame(self, work, now=None):
+        """Registra el tiempo de trabajo (s) de un frame; devuelve el nivel nuevo si cambió."""
+        now = time.perf_counter() if now is None else now
+        self.samples.append(work)
+        if len(self.samples) < self.min_samples:
+            return None
+        p = self.p95()
+
+        if p > self.budget * self.down:
+            self.calm_since = None
+            if self.level + 1 < len(self.levels):
+                if self.raised_at is not None and now - self.raised_at < self.flap:
+                    # El nivel de arriba no alcanzaba: esperar más antes de volver a probarlo
+                    self.up_hold = min(self.up_hold * 2, self.max_up_hold)
+                return self.set_level(self.level + 1, p, now)
+            return None
+
+        if p < self.budget * self.up and self.level > 0:
+            if self.calm_since is None:
+                self.calm_since = now
+            elif now - self.calm_since >= self.up_hold:
+                self.raised_at = now
+                return self.set_level(self.level - 1, p, now)
+        else:
+            self.calm_since = None
+            if self.raised_at is not None and now - self.raised_at >= self.flap:
+                self.raised_at = None
+                self.up_hold = self.base_up_hold
+        return None
+
+    def set_level(self, level, p95=0.0, now=None):
+        previous = self.current
+        self.level = level
+        self.samples.clear()
+        self.calm_since = None
+        self.transitions += 1
+        current = self.current
+        log.info("Calidad %s → %s (p95 %.1f ms de %.1f ms)", previous.name, current.name,
+                 p95 * 1000, self.budget * 1000,
+                 extra={"key": ("quality", current.name), "quality": current.name,
+                        "previous": previous.name, "p95_ms": round(p95 * 1000, 2),
+                        "up_hold_s": self.up_hold})
+        if self.on_change is not None:
+            self.on_change(current)
+        return current
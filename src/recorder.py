@@ -0,0 +1,364 @@
+"""
+Grabación de partidos en formato columnar (un archivo binario crudo por columna).
+
+Cada partido es un directorio:
+
+    meta.json        dtypes y formas de las columnas, regiones de los muros, jugadores y equipos
+    t.bin            f8   segundos desde el inicio del partido
+    puck.bin         f4   (x, y, vx, vy)
+    players.bin      f4   (jugadores, 4)
+    score.bin        u1   (2,)
+    time_left.bin    f4
+    state.bin        u1   GameState
+    events.bin       EVENT_DTYPE (contactos, goles, cambios de estado) en orden de frame
+    keyframes.bin    KEYFRAME_DTYPE cada 'keyframe_every' frames: (frame, t, primera fila de eventos)
+
+Los archivos solo crecen (append): si el proceso muere se pierde como mucho el chunk en
+memoria, y la cantidad de filas sale del tamaño del archivo. Recording los abre con
+np.memmap, así que el replay puede saltar a cualquier frame sin leer el resto.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2      # 2: event_row de un keyframe = primer evento de ese frame
+
+# Tipos de evento
+EV_PLAYER = 1      # a = jugador, value = velocidad relativa (px/s)
+EV_WALL = 2        # a = índice del muro (ver wall_regions), value = rapidez del puck
+EV_GOAL = 3        # a = equipo que anota, x/y = punto del cruce, value = rapidez del puck
+EV_STATE = 4       # a = estado anterior, b = estado nuevo
+EVENT_NAMES = {EV_PLAYER: "player", EV_WALL: "wall", EV_GOAL: "goal", EV_STATE: "state"}
+
+EVENT_DTYPE = np.dtype([("frame", "<i4"), ("kind", "u1"), ("a", "<i2"), ("b", "<i2"),
+                        ("value", "<f4"), ("x", "<f4"), ("y", "<f4")])
+KEYFRAME_DTYPE = np.dtype([("frame", "<i4"), ("t", "<f8"), ("event_row", "<i8")])
+
+
+def frame_columns(n_players):
+    """Columnas por frame: nombre -> (dtype, forma de una fila)."""
+    return {
+        "t": ("<f8", ()),
+        "puck": ("<f4", (4,)),
+        "players": ("<f4", (n_players, 4)),
+        "score": ("u1", (2,)),
+        "time_left": ("<f4", ()),
+        "state": ("u1", ()),
+    }
+
+
+class ColumnWriter:
+    """
+    Columnas append-only con chunks preasignados (anillo de 3).
+    El loop escribe en current[nombre][row] y llama commit(); un chunk lleno pasa al hilo
+    escritor y el loop sigue en el siguiente sin asignar memoria.
+    """
+    RING = 3
+
+    def __init__(self, directory, columns, rows, writer_queue):
+        self.columns = columns
+        self.rows = rows
+        self.files = {name: open(os.path.join(directory, f"{name}.bin"), "ab") for name in columns}
+        self.chunks = [{name: np.zeros((rows,) + tuple(shape), dtype=dtype)
+                        for name, (dtype, shape) in columns.items()} for _ in range(self.RING)]
+        self.free = [threading.Event() for _ in range(self.RING)]
+        for event in self.free:
+            event.set()
+        self.index = 0
+        self.current = self.chunks[0]
+        self.row = 0          # fila libre en el chunk actual
+        self.count = 0        # filas totales (escritas + en memoria)
+        self._queue = writer_queue
+
+    def commit(self):
+        self.row += 1
+        self.count += 1
+        if self.row == self.rows:
+            self.flush()
+
+    def flush(self):
+        """Entrega el chunk actual al hilo escritor y pasa al siguiente."""
+        if self.row == 0:
+            return
+        index, rows = self.index, self.row
+        self.free[index].clear()
+        self._queue.put((self, index, rows))
+        self.index = (index + 1) % self.RING
+        self.current = self.chunks[self.index]
+        self.row = 0
+        # Con chunks de varios segundos el escritor nunca va tres chunks atrás
+        self.free[self.index].wait()
+
+    def write(self, index, rows):
+        """Hilo escritor: vuelca las primeras 'rows' filas de un chunk."""
+        for name, array in self.chunks[index].items():
+            array[:rows].tofile(self.files[name])
+            self.files[name].flush()
+        self.free[index].set()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class MatchRecorder:
+    """
+    Graba cada partido en su propio directorio dentro de 'root'.
+    record_frame() va una vez por paso (end_profiled_frame); los handlers de colisión y
+    goal_scored agregan eventos. new_match() cierra el partido actual y abre otro.
+    """
+    def __init__(self, game, root="../recordings", chunk_rows=1024, keyframe_every=60):
+        self.game = game
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self.keyframe_every = keyframe_every
+        self.n_players = len(game.players)
+
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+        self._writer.start()
+
+        self.path = None
+        self.frames = None
+        self.events = None
+        self.keyframes = None
+        self.matches = 0
+
+    # ------------------------------------------------------
+    def start(self):
+        self.new_match()
+        return self
+
+    def new_match(self):
+        """Cierra la grabación actual (si hay) y empieza un directorio nuevo."""
+        self.close_match()
+        self.matches += 1
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(self.root, f"match_{stamp}_{self.matches:03d}")
+        os.makedirs(self.path, exist_ok=True)
+
+        game = self.game
+        columns = frame_columns(self.n_players)
+        meta = {
+            "version": FORMAT_VERSION,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "players": self.n_players,
+            "teams": [player.team for player in game.players],
+            "screen": list(game.screen.get_size()),
+            "rink": list(game.rink.rect),
+            "wall_regions": game.rink.wall_regions,
+            "walls": game.walls,
+            "physics": game.physics_profile.name,
+            "keyframe_every": self.keyframe_every,
+            "columns": {name: [dtype, list(shape)] for name, (dtype, shape) in columns.items()},
+            "events": {"dtype": EVENT_DTYPE.descr, "kinds": EVENT_NAMES},
+            "keyframes": KEYFRAME_DTYPE.descr,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        self.frames = ColumnWriter(self.path, columns, self.chunk_rows, self._queue)
+        self.events = ColumnWriter(self.path, {"events": (EVENT_DTYPE, ())},
+                                   max(64, self.chunk_rows // 4), self._queue)
+        self.keyframes = ColumnWriter(self.path, {"keyframes": (KEYFRAME_DTYPE, ())},
+                                      max(16, self.chunk_rows // self.keyframe_every), self._queue)
+        self._t0 = time.perf_counter()
+        self._last_state = None
+        self._frame_events = 0      # fila del primer evento del frame en curso
+        log.info("Grabando partido en %s", self.path)
+
+    def close_match(self):
+        if self.frames is None:
+            return
+        writers = (self.frames, self.events, self.keyframes)
+        for writer in writers:
+            writer.flush()
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        for writer in writers:
+            writer.close()
+        log.info("Partido grabado: %d frames, %d eventos (%s)",
+                 self.frames.count, self.events.count, self.path)
+        self.frames = self.events = self.keyframes = None
+
+    def stop(self):
+        self.close_match()
+        self._queue.put(None)
+        self._writer.join(timeout=2.0)
+
+    # ------------------------------------------------------
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()        # marca: todo lo anterior ya está en disco
+                continue
+            writer, index, rows = item
+            try:
+                writer.write(index, rows)
+            except OSError:
+                log.exception("No se pudo escribir la grabación")
+                writer.free[index].set()
+
+    # ------------------------------------------------------
+    def event(self, kind, a=0, b=-1, value=0.0, x=0.0, y=0.0):
+        events = self.events
+        if events is None:
+            return
+        row = events.current["events"][events.row]
+        row["frame"] = self.frames.count
+        row["kind"] = kind
+        row["a"] = a
+        row["b"] = b
+        row["value"] = value
+        row["x"] = x
+        row["y"] = y
+        events.commit()
+
+    def contact_player(self, index, rel_vel, x, y):
+        self.event(EV_PLAYER, index, value=rel_vel, x=x, y=y)
+
+    def contact_wall(self, wall, speed, x, y):
+        self.event(EV_WALL, wall, value=speed, x=x, y=y)
+
+    def goal(self, team, x, y, speed=0.0):
+        self.event(EV_GOAL, team, value=speed, x=x, y=y)
+
+    # ------------------------------------------------------
+    def record_frame(self, now=None):
+        """Una fila por paso. Solo escribe en arrays ya asignados."""
+        frames = self.frames
+        if frames is None:
+            return
+        game = self.game
+        now = time.perf_counter() if now is None else now
+        i = frames.row
+        frame = frames.count
+        t = now - self._t0
+
+        state = game.ui.state.value
+        if state != self._last_state:
+            if self._last_state is not None:
+                self.event(EV_STATE, self._last_state, state)
+            self._last_state = state
+
+        if frame % self.keyframe_every == 0:
+            keyframes = self.keyframes
+            row = keyframes.current["keyframes"][keyframes.row]
+            row["frame"] = frame
+            row["t"] = t
+            row["event_row"] = self._frame_events     # antes de los eventos de este frame
+            keyframes.commit()
+
+        cols = frames.current
+        cols["t"][i] = t
+        body = game.puck.body
+        puck = cols["puck"][i]
+        puck[0], puck[1] = body.position
+        puck[2], puck[3] = body.velocity
+        players = cols["players"][i]
+        for k, player in enumerate(game.players):
+            body = player.body
+            players[k, 0], players[k, 1] = body.position
+            players[k, 2], players[k, 3] = body.velocity
+        board = game.scoreboard
+        score = cols["score"][i]
+        score[0] = board.team1_score
+        score[1] = board.team2_score
+        cols["time_left"][i] = board.time_left
+        cols["state"][i] = state
+        frames.commit()
+        self._frame_events = self.events.count
+
+
+class Recording:
+    """Lectura de un partido grabado con np.memmap (nada se carga hasta que se usa)."""
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.n_players = self.meta["players"]
+        # Las grabaciones anteriores no guardan los equipos: alternados como en Game
+        self.teams = self.meta.get("teams") or [1 + i % 2 for i in range(self.n_players)]
+        self.wall_regions = self.meta["wall_regions"]
+        # En la versión 1 event_row venía después de los eventos del propio keyframe
+        self._key_lag = 1 if self.meta.get("version", 1) < 2 else 0
+
+        columns = {name: (dtype, tuple(shape)) for name, (dtype, shape) in self.meta["columns"].items()}
+        # Filas completas en todas las columnas (si se cortó a mitad de un chunk)
+        self.n_frames = min(self._rows(name, dtype, shape) for name, (dtype, shape) in columns.items())
+        self.columns = {name: self._map(name, dtype, shape, self.n_frames)
+                        for name, (dtype, shape) in columns.items()}
+        self.events = self._map("events", EVENT_DTYPE, (), self._rows("events", EVENT_DTYPE, ()))
+        self.keyframes = self._map("keyframes", KEYFRAME_DTYPE, (),
+                                   self._rows("keyframes", KEYFRAME_DTYPE, ()))
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _rows(self, name, dtype, shape):
+        row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+        try:
+            return os.path.getsize(self._file(name)) // row_bytes
+        except OSError:
+            return 0
+
+    def _map(self, name, dtype, shape, rows):
+        if rows == 0:
+            return np.zeros((0,) + shape, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(rows,) + shape)
+
+    def __len__(self):
+        return self.n_frames
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def duration(self):
+        return float(self.columns["t"][-1]) if self.n_frames else 0.0
+
+    # ------------------------------------------------------
+    def frame_at(self, t):
+        """Índice del último frame con tiempo <= t (búsqueda binaria sobre la columna t)."""
+        index = int(np.searchsorted(self.columns["t"], t, side="right")) - 1
+        return min(max(index, 0), max(self.n_frames - 1, 0))
+
+    def keyframe_for(self, frame):
+        """Último keyframe en o antes de 'frame' (o None si no hay)."""
+        if len(self.keyframes) == 0:
+            return None
+        k = int(np.searchsorted(self.keyframes["frame"], frame, side="right")) - 1
+        return self.keyframes[max(k, 0)]
+
+    def events_between(self, first, last):
+        """Eventos con first <= frame < last. Parte del keyframe: no recorre desde el inicio."""
+        key = self.keyframe_for(first - self._key_lag) if first >= self._key_lag else None
+        start = int(key["event_row"]) if key is not None else 0
+        stop = len(self.events)
+        k = int(np.searchsorted(self.keyframes["frame"], last, side="right"))
+        if k < len(self.keyframes):
+            stop = int(self.keyframes[k]["event_row"])
+        window = self.events[start:stop]
+        lo = int(np.searchsorted(window["frame"], first, side="left"))
+        hi = int(np.searchsorted(window["frame"], last, side="left"))
+        return window[lo:hi]
+
+
+def latest_recording(root="../recordings"):
+    """Directorio del partido grabado más reciente (o None)."""
+    try:
+        matches = sorted(d for d in os.listdir(root) if d.startswith("match_"))
+    except OSError:
+        return None
+    return os.path.join(root, matches[-1]) if matches else None
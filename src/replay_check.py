@@ -0,0 +1,101 @@
+"""
+Comprobación de la grabación y del índice de eventos (sin ventana).
+
+Graba un partido computadora contra computadora en un directorio temporal, con goles forzados
+justo en frames de keyframe, y recorre la grabación en ventanas como el visor
+(events_between(anterior + 1, actual + 1)): cada evento grabado tiene que aparecer en
+exactamente una ventana. Sale con código 1 si falta o se repite alguno.
+
+Uso (desde src/):
+    python replay_check.py
+    python replay_check.py --frames 3000 --keyframe-every 10
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import tempfile
+
+import numpy as np
+import pygame
+
+
+def record_match(root, frames, keyframe_every):
+    """Graba 'frames' pasos y devuelve el directorio del partido."""
+    from game import Game
+    from input_providers import ComputerProvider
+    from recorder import MatchRecorder
+    from ui_manager import GameState
+
+    screen = pygame.display.set_mode((1920, 1080))
+    game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[ComputerProvider(), ComputerProvider()])
+    recorder = MatchRecorder(game, root, chunk_rows=256, keyframe_every=keyframe_every)
+    game.recorder = recorder.start()
+    game.check_initial_positions()
+    game.ui.state = GameState.RUNNING
+    game.puck.body.velocity = (900, 300)
+    for frame in range(frames):
+        game.ui.timer = max(game.ui.timer, 60)
+        if frame % (keyframe_every * 7) == 0:
+            game.goal_scored(1 + frame % 2)          # evento en un frame de keyframe
+        game.poll_inputs()
+        game.update(1 / 60)
+        game.end_profiled_frame()
+        if game.ui.state == GameState.RESET_WARNING:
+            game.ui.state = GameState.RUNNING
+    path = recorder.path
+    recorder.stop()
+    return path
+
+
+def windows(n_frames, rng, longest):
+    """Ventanas [first, last) consecutivas como las del visor, de 1 a 'longest' frames."""
+    last = -1
+    while last < n_frames - 1:
+        frame = min(last + rng.randint(1, longest), n_frames - 1)
+        yield last + 1, frame + 1
+        last = frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de eventos de la grabación")
+    parser.add_argument("--frames", type=int, default=1500)
+    parser.add_argument("--keyframe-every", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from recorder import Recording
+    pygame.init()
+    with tempfile.TemporaryDirectory() as root:
+        rec = Recording(record_match(root, args.frames, args.keyframe_every))
+        events = np.array(rec.events)
+        rng = random.Random(args.seed)
+        failed = False
+        # Frame a frame (velocidad 1) y a saltos (velocidades altas)
+        for longest in (1, 12):
+            seen = np.zeros(len(events), dtype=int)
+            for first, last in windows(len(rec), rng, longest):
+                window = rec.events_between(first, last)
+                start = int(np.searchsorted(events["frame"], first, side="left"))
+                if len(window) and (events[start:start + len(window)] == window).all():
+                    seen[start:start + len(window)] += 1
+            missing, repeated = int((seen == 0).sum()), int((seen > 1).sum())
+            print(f"ventanas de 1 a {longest} frames: {missing} eventos sin ventana, "
+                  f"{repeated} en más de una")
+            failed |= bool(missing or repeated)
+        on_keyframes = int(np.isin(events["frame"], rec.keyframes["frame"]).sum())
+        del rec, events
+    pygame.quit()
+
+    print(f"{len(seen)} eventos grabados, {on_keyframes} en frames de keyframe")
+    if failed or not on_keyframes:
+        print("El índice de eventos pierde o repite eventos.")
+        raise SystemExit(1)
+    print("Cada evento aparece en exactamente una ventana.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Visor de partidos grabados (recorder.py).
+
+Abre la grabación con np.memmap y dibuja cada frame con el mismo render del juego
+(Game.draw_state). Saltar o adelantar solo toca las filas que se muestran; los eventos
+se buscan a partir del índice de keyframes.
+
+Uso (desde src/):
+    python replay_viewer.py                            # el partido más reciente de ../recordings
+    python replay_viewer.py ../recordings/match_...    # uno en particular
+    python replay_viewer.py --speed 4
+
+Teclas: ESPACIO pausa · ←/→ ±1 s (SHIFT ±10 s) · ,/. frame a frame (en pausa)
+        ↑/↓ velocidad · INICIO/FIN · N/P evento siguiente/anterior · ESC sale
+"""
+import argparse
+import logging
+
+import numpy as np
+import pygame
+
+from game_log import setup_logging
+from pipeline import FrameState
+from recorder import EV_GOAL, EV_PLAYER, EV_STATE, EV_WALL, Recording, latest_recording
+from ui_manager import GameState
+
+log = logging.getLogger(__name__)
+
+SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+
+class ReplayViewer:
+    def __init__(self, screen, recording, speed=1.0):
+        from game import Game
+        from input_providers import MouseProvider
+
+        self.screen = screen
+        self.rec = recording
+        self.clock = pygame.time.Clock()
+        # Un Game sin entradas de red: solo se usan sus capas, sprites y marcador.
+        # Un mazo por jugador grabado, en los mismos equipos (2v2, N jugadores)
+        self.game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                         inputs=[MouseProvider() for _ in recording.teams], teams=recording.teams)
+        self.font = pygame.font.Font("../assets/VCR_MONO.ttf", 22)
+
+        self.t = 0.0
+        self.speed = speed
+        self.paused = False
+        self.recent = []          # últimos eventos mostrados en el HUD
+        # Tiempos de los goles para marcarlos en la barra (una sola pasada por los eventos)
+        events = recording.events
+        goal_frames = events["frame"][events["kind"] == EV_GOAL] if len(events) else []
+        self.goal_times = [float(recording["t"][min(int(f), len(recording) - 1)]) for f in goal_frames]
+
+    # ------------------------------------------------------
+    def state_at(self, frame):
+        """FrameState del juego a partir de una fila de la grabación."""
+        rec = self.rec
+        puck = rec["puck"][frame]
+        players = rec["players"][frame]
+        score = rec["score"][frame]
+        state = GameState(int(rec["state"][frame]))
+        result = ""
+        if state == GameState.FINISHED:
+            result = ("PLAYER 1 WINS" if score[0] > score[1]
+                      else "PLAYER 2 WINS" if score[1] > score[0] else "TIE")
+        return FrameState(
+            seq=frame, sim_time=float(rec["t"][frame]), input_time=0.0,
+            puck_pos=(float(puck[0]), float(puck[1])),
+            player_pos=tuple((float(p[0]), float(p[1])) for p in players),
+            team1_score=int(score[0]), team2_score=int(score[1]),
+            time_left=float(rec["time_left"][frame]), ui_state=state, result_text=result,
+            warning_active=False, warning_type=None, continue_timer=0.0,
+            ready_go_stage="done", ready_go_timer=0.0,
+        )
+
+    # ------------------------------------------------------
+    def seek(self, t):
+        self.t = min(max(t, 0.0), self.rec.duration)
+        self.recent.clear()
+
+    def jump_event(self, direction):
+        """Salta al evento (contacto, gol, cambio de estado) siguiente o anterior."""
+        events = self.rec.events
+        if len(events) == 0:
+            return
+        frame = self.rec.frame_at(self.t)
+        frames = events["frame"]
+        if direction > 0:
+            k = int(np.searchsorted(frames, frame, side="right"))
+        else:
+            k = int(np.searchsorted(frames, frame, side="left")) - 1
+        if 0 <= k < len(events):
+            self.seek(float(self.rec["t"][int(frames[k])]))
+
+    # ------------------------------------------------------
+    def describe(self, event):
+        kind = int(event["kind"])
+        if kind == EV_PLAYER:
+            return f"jugador {int(event['a']) + 1}  {event['value']:.0f} px/s"
+        if kind == EV_WALL:
+            return f"muro {self.rec.wall_regions[int(event['a'])]}  {event['value']:.0f} px/s"
+        if kind == EV_GOAL:
+            return f"GOL equipo {int(event['a'])}"
+        if kind == EV_STATE:
+            return f"{GameState(int(event['a'])).name} -> {GameState(int(event['b'])).name}"
+        return "?"
+
+    def draw_hud(self, frame):
+        rec = self.rec
+        lines = [
+            f"{rec.path}",
+            f"frame {frame + 1}/{len(rec)}   {self.t:7.2f} / {rec.duration:.2f} s   "
+            f"x{self.speed:g}{'   PAUSA' if self.paused else ''}",
+        ] + [self.describe(e) for e in self.recent[-6:]]
+        y = 10
+        for line in lines:
+            surf = self.font.render(line, True, (255, 255, 255), (0, 0, 0))
+            self.screen.blit(surf, (10, y))
+            y += surf.get_height() + 2
+
+        # Barra de progreso con los goles marcados
+        width = self.screen.get_width() - 20
+        bar = pygame.Rect(10, self.screen.get_height() - 24, width, 8)
+        pygame.draw.rect(self.screen, (60, 60, 60), bar)
+        if rec.duration > 0:
+            done = bar.copy()
+            done.width = int(width * self.t / rec.duration)
+            pygame.draw.rect(self.screen, (200, 200, 200), done)
+            for t in self.goal_times:
+                x = 10 + int(width * t / rec.duration)
+                pygame.draw.line(self.screen, (255, 60, 40), (x, bar.top - 6), (x, bar.bottom + 6), 3)
+
+    # ------------------------------------------------------
+    def handle_key(self, event):
+        step = 10.0 if event.mod & pygame.KMOD_SHIFT else 1.0
+        frame_dt = self.rec.duration / max(1, len(self.rec) - 1)
+        if event.key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif event.key == pygame.K_RIGHT:
+            self.seek(self.t + step)
+        elif event.key == pygame.K_LEFT:
+            self.seek(self.t - step)
+        elif event.key == pygame.K_PERIOD:
+            self.seek(self.t + frame_dt)
+        elif event.key == pygame.K_COMMA:
+            self.seek(self.t - frame_dt)
+        elif event.key == pygame.K_UP:
+            self.speed = next((s for s in SPEEDS if s > self.speed), SPEEDS[-1])
+        elif event.key == pygame.K_DOWN:
+            self.speed = next((s for s in reversed(SPEEDS) if s < self.speed), SPEEDS[0])
+        elif event.key == pygame.K_HOME:
+            self.seek(0.0)
+        elif event.key == pygame.K_END:
+            self.seek(self.rec.duration)
+        elif event.key == pygame.K_n:
+            self.jump_event(+1)
+        elif event.key == pygame.K_p:
+            self.jump_event(-1)
+        elif event.key == pygame.K_ESCAPE:
+            return False
+        return True
+
+    # ------------------------------------------------------
+    def run(self, max_frames=None):
+        if len(self.rec) == 0:
+            log.warning("Grabación vacía: %s", self.rec.path)
+            return
+        running = True
+        last_frame = self.rec.frame_at(self.t) - 1     # los eventos del primer frame también
+        shown = 0
+        while running:
+            dt = self.clock.tick(60) / 1000.0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    running = self.handle_key(event)
+
+            if not self.paused:
+                self.t = min(self.t + dt * self.speed, self.rec.duration)
+            frame = self.rec.frame_at(self.t)
+
+            # Eventos entre el frame anterior y este (solo hacia adelante)
+            if frame > last_frame:
+                self.recent.extend(self.rec.events_between(last_frame + 1, frame + 1))
+                del self.recent[:-6]
+            last_frame = frame
+
+            self.game.draw_state(self.state_at(frame))
+            self.draw_hud(frame)
+            pygame.display.flip()
+
+            shown += 1
+            if max_frames is not None and shown >= max_frames:
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Visor de partidos grabados")
+    parser.add_argument("path", nargs="?", help="directorio del partido (por defecto el último)")
+    parser.add_argument("--root", default="../recordings")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--start", type=float, default=0.0, help="segundo inicial")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+    logs = setup_logging(args.log_level)
+
+    path = args.path or latest_recording(args.root)
+    if path is None:
+        parser.error(f"no hay grabaciones en {args.root}")
+    recording = Recording(path)
+    log.info("%s: %d frames, %.1f s, %d eventos", path, len(recording), recording.duration,
+             len(recording.events))
+
+    pygame.init()
+    screen = pygame.display.set_mode(tuple(recording.meta["screen"]))
+    pygame.display.set_caption("Air Hockey 2D - replay")
+    viewer = ReplayViewer(screen, recording, speed=args.speed)
+    viewer.seek(args.start)
+    try:
+        viewer.run()
+    finally:
+        pygame.quit()
+        logs.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -62,11 +62,30 @@ class Rink:
             wall.friction = 0.01
             wall.collision_type = 99
 
+        # Rebote puck-pared cuando lo resuelve pymunk (Game con walls="solver"); igual a la
+        # amortiguación de Puck.keep_inside_rink en el modo por defecto
+        self.restitution = 0.92
+
         # Agregar todas las paredes de una sola vez
         space.add(*walls)
 
         self.walls = walls
 
+        # Región de cada muro (mismo orden que walls): 4 lados rectos y luego los arcos
+        corner_names = ("corner_tl", "corner_tr", "corner_br", "corner_bl")
+        self.wall_regions = ["top", "right", "bottom", "left"] + [
+            name for name in corner_names for _ in range(arc_segments)]
+
+        # Geometría precalculada para las correcciones por frame (evita crear Vec2d cada vez):
+        # (ax, ay, abx, aby, 1/|ab|², radio)
+        self.segments = []
+        for wall in walls:
+            if isinstance(wall, pymunk.Segment):
+                ax, ay = wall.a
+                bx, by = wall.b
+                abx, aby = bx - ax, by - ay
+                self.segments.append((ax, ay, abx, aby, 1.0 / (abx * abx + aby * aby), wall.radius))
+
 
     def draw_debug(self, screen):
         for wall in self.walls:
@@ -0,0 +1,209 @@
+import logging
+
+from ui_manager import GameState
+
+log = logging.getLogger(__name__)
+
+
+class Scene:
+    """
+    Un GameState como escena no bloqueante: el loop principal (o el hilo de simulación) llama
+    enter() al entrar, update(dt) y draw() una vez por frame. Ninguna escena tiene su propio
+    loop ni su propio reloj, así que los eventos y los markers se siguen procesando siempre.
+    """
+    state = None
+    gameplay = False          # frame de juego (cuenta para LoopStats.presented)
+    idle_hz = None            # escena estática: frames por segundo en reposo (None = 60 fps)
+
+    def __init__(self, game):
+        self.game = game
+
+    def enter(self, previous):
+        pass
+
+    def update(self, dt):
+        self.game.update(dt)
+
+    def draw(self):
+        """
+        Dibuja el frame y devuelve qué presentar: True (todo), una lista de rects cambiados o
+        False si la pantalla quedó igual (no hace falta flip).
+        """
+        self.game.draw()
+        return True
+
+    def is_idle(self):
+        return self.idle_hz is not None and not self.game.show_debug()
+
+
+# ------------------------------------------------------
+class IdleScene(Scene):
+    """
+    Escena con el juego detenido: la cancha, el overlay y las imágenes se componen una vez en
+    una copia de la pantalla, y en cada frame solo se decide si el texto que parpadea se ve.
+    Si no cambió nada no se dibuja ni se hace flip; el loop espera eventos con timeout
+    (idle_hz) en lugar de correr a 60 fps. Con el HUD de debug se dibuja todo, como antes.
+    """
+    idle_hz = 10              # los parpadeos cambian cada ~0.2-0.3 s
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.frozen = None
+        self.frozen_key = None
+        self.shown = None
+
+    def enter(self, previous):
+        self.frozen = None
+
+    def static_key(self):
+        """Todo lo que, si cambia, obliga a recomponer la copia congelada."""
+        game = self.game
+        ui = game.ui
+        return (ui.state, ui.warning_active, ui.warning_type, ui.result_text,
+                game.scoreboard.team1_score, game.scoreboard.team2_score,
+                game.screen.get_size())
+
+    def draw(self):
+        game = self.game
+        if not self.is_idle():
+            self.frozen = None
+            return super().draw()
+        ui = game.ui
+        screen = game.screen
+
+        key = self.static_key()
+        rebuilt = self.frozen is None or key != self.frozen_key
+        if rebuilt:
+            game.draw_scene()
+            ui.draw_static()
+            self.frozen = screen.copy()
+            self.frozen_key = key
+        label = ui.label(continue_timer=game.continue_timer)
+        if not rebuilt and label == self.shown:
+            return False
+        self.shown = label
+        if not rebuilt:
+            screen.blit(self.frozen, (0, 0))
+        if label:
+            ui.draw_center_text(label, ui.font)
+        game.latency.draw_done()
+        game.profiler.mark("draw_ui")
+        return True
+
+
+# ------------------------------------------------------
+class ReadyGoScene(Scene):
+    """READY? (1.5 s) → GO! (1 s) → esperar a que los jugadores estén en su lado."""
+    state = GameState.READY_GO
+
+    def enter(self, previous):
+        game = self.game
+        game.ready_go_stage = "ready"
+        game.ready_go_timer = 0
+        game.ui.state = GameState.READY_GO
+
+    def update(self, dt):
+        game = self.game
+        if game.ready_go_stage != "done":
+            game.ready_go_timer += dt
+            if game.ready_go_stage == "ready" and game.ready_go_timer > 1.5:
+                game.ready_go_stage = "go"
+                game.ready_go_timer = 0
+            elif game.ready_go_stage == "go" and game.ready_go_timer > 1.0:
+                game.ready_go_stage = "done"
+            return
+
+        # Comprobación inicial (muestra los warnings mientras no estén en posición)
+        if game.check_initial_positions():
+            game.initial_check_done = True
+            log.info("Jugadores listos, inicia el juego.")
+            game.ui.state = GameState.RUNNING
+
+    def draw(self):
+        game = self.game
+        if game.ready_go_stage == "done":
+            game.draw()
+            return True
+        game.draw_scene()
+        game.latency.draw_done()
+        game.draw_ready_go(game.ready_go_stage, game.ready_go_timer)
+        game.profiler.mark("draw_ui")
+        return True
+
+
+# ------------------------------------------------------
+class PlayScene(Scene):
+    """Juego en curso; con quality.partial_present solo se redibuja lo que se movió."""
+    state = GameState.RUNNING
+    gameplay = True
+
+    def enter(self, previous):
+        self.game.partial_rects = None     # la otra escena dibujó encima: primer frame completo
+
+    def draw(self):
+        game = self.game
+        if game.quality.partial_present and not game.show_debug():
+            return game.draw_partial()
+        return super().draw()
+
+
+class PauseScene(IdleScene):
+    state = GameState.PAUSED
+
+
+class WarningScene(IdleScene):
+    """Después de un gol: espera a que nadie quede en el círculo central (Game.handle_reset_warning)."""
+    state = GameState.RESET_WARNING
+    idle_hz = 20              # sin animación, pero las posiciones de los markers se revisan
+
+
+# ------------------------------------------------------
+class FinishedScene(IdleScene):
+    """Resultado y luego CONTINUE? (ENTER reinicia pasados 3 s; ESC deja GAME OVER)."""
+    state = GameState.FINISHED
+
+    def update(self, dt):
+        game = self.game
+        game.continue_timer += dt
+        if game.handle_victory_input() == "restart":
+            game.initial_check_done = False    # → ReadyGoScene
+
+
+# ------------------------------------------------------
+class SceneScheduler:
+    """
+    Elige la escena del frame a partir del estado del juego y llama enter() al cambiar.
+    El estado lo siguen cambiando Game y UIManager (goles, pausa, fin del reloj); FINISHED tiene
+    prioridad, y mientras no pasó la comprobación inicial la escena es READY_GO.
+    """
+    def __init__(self, game, scenes=(ReadyGoScene, PlayScene, PauseScene, WarningScene,
+                                     FinishedScene)):
+        self.game = game
+        self.scenes = {cls.state: cls(game) for cls in scenes}
+        self.current = None
+
+    def state(self):
+        game = self.game
+        state = game.ui.state
+        if state == GameState.FINISHED:
+            return state
+        if not game.initial_check_done:
+            return GameState.READY_GO
+        return state
+
+    def scene(self):
+        """Escena del frame (con enter() si cambió desde el anterior)."""
+        scene = self.scenes[self.state()]
+        previous = self.current
+        if scene is not previous:
+            self.current = scene
+            log.debug("Escena %s → %s", previous.state.name if previous else None, scene.state.name)
+            scene.enter(previous)
+        return scene
+
+    def update(self, dt):
+        previous = self.current
+        scene = self.scene()
+        if previous is not None and previous.is_idle() and not scene.is_idle():
+            dt = min(dt, 1 / 60)     # el último frame en reposo no es tiempo de juego
+        scene.update(dt)
@@ -15,16 +15,36 @@ DIGIT_MAP = {
     "7": ["1111","0001","0001","0001","0001","0001","0001"],
     "8": ["1111","1001","1001","1111","1001","1001","1111"],
     "9": ["1111","1001","1001","1111","0001","0001","1111"],
+    " ": ["0000","0000","0000","0000","0000","0000","0000"],  # todos los LEDs apagados
 }
 
 
 class DigitMatrix:
-    def __init__(self, number, led_size=20, spacing=4):
+    # Superficies ya escaladas, una por (dígito, tamaño, escala, lit_only)
+    _cache = {}
+
+    def __init__(self, number, led_size=20, spacing=4, lit_only=False):
         self.number = str(number)
         self.led_size = led_size
         self.spacing = spacing
+        self.lit_only = lit_only    # True = no dibuja los LEDs apagados (van en la capa estática)
         self.surface = self.render_digit()
 
+    @classmethod
+    def get(cls, number, led_size=20, spacing=4, scale=1.0, lit_only=False) -> Surface:
+        """Devuelve la superficie escalada de un dígito, renderizándola una sola vez."""
+        key = (str(number), led_size, spacing, scale, lit_only)
+        surf = cls._cache.get(key)
+        if surf is None:
+            d = cls(number, led_size, spacing, lit_only)
+            surf = d.surface
+            if scale != 1.0:
+                surf = pygame.transform.scale(
+                    surf, (int(surf.get_width() * scale), int(surf.get_height() * scale))
+                )
+            cls._cache[key] = surf
+        return surf
+
     def render_digit(self) -> Surface:
         width = COLS * (self.led_size + self.spacing)
         height = ROWS * (self.led_size + self.spacing)
@@ -48,7 +68,7 @@ class DigitMatrix:
                         x + offset, y + offset, inner_size, inner_size
                     )
                     pygame.draw.rect(surf, (253, 74, 44), inner_rect, border_radius=3)
-                else:
+                elif not self.lit_only:
                     pygame.draw.rect(surf, (50, 50, 50), rect, border_radius=4)
 
         return surf
@@ -93,50 +113,65 @@ class Scoreboard:
         self.time_left = max(0, self.time_left - dt)
 
     # ----- Render -----
-    def draw_number(self, screen, number: int, pos, scale=1.0, max_display=99):
-        """Dibuja un número de 2 dígitos (visual limitado a max_display)."""
-        # limitar visualmente
-        number = min(number, max_display)
-        s = f"{number:02d}"  # 2 dígitos siempre
+    def _draw_digits(self, screen, text, pos, scale, gap, lit_only=False):
+        """Dibuja una fila de dígitos y devuelve la x siguiente."""
         x, y = pos
-        for digit in s:
-            d = DigitMatrix(digit, self.led_size, self.spacing)
-            d.draw(screen, (x, y), scale)
-            x += d.surface.get_width() * scale + 10
+        width = COLS * (self.led_size + self.spacing)
+        for digit in text:
+            screen.blit(DigitMatrix.get(digit, self.led_size, self.spacing, scale, lit_only), (x, y))
+            x += width * scale + gap
+        return x
 
-    def draw_time(self, screen, pos, scale=1.0):
-        """Dibuja tiempo como MM  SS (con espacio para colocar ':' como imagen)."""
-        minutes = int(self.time_left // 60)
-        seconds = int(self.time_left % 60)
-        m_str = f"{minutes:02d}"
-        s_str = f"{seconds:02d}"
+    def draw_number(self, screen, number: int, pos, scale=1.0, max_display=99, lit_only=False):
+        """Dibuja un número de 2 dígitos (visual limitado a max_display)."""
+        # None = dígitos en blanco (solo LEDs apagados)
+        if number is None:
+            s = "  "
+        else:
+            # limitar visualmente
+            number = min(number, max_display)
+            s = f"{number:02d}"  # 2 dígitos siempre
+        self._draw_digits(screen, s, pos, scale, 10, lit_only)
 
-        x, y = pos
+    def draw_time(self, screen, pos, scale=1.0, time_left=None, lit_only=False, blank=False):
+        """Dibuja tiempo como MM  SS (con espacio para colocar ':' como imagen)."""
+        if time_left is None:
+            time_left = self.time_left
+        minutes = int(time_left // 60)
+        seconds = int(time_left % 60)
+        m_str = f"{minutes:02d}" if not blank else "  "
+        s_str = f"{seconds:02d}" if not blank else "  "
 
         # minutos
-        for digit in m_str:
-            d = DigitMatrix(digit, self.led_size, self.spacing)
-            d.draw(screen, (x, y), scale)
-            x += d.surface.get_width() * scale + 5
+        x = self._draw_digits(screen, m_str, pos, scale, 5, lit_only)
 
         # espacio grande para ":"
         x += 50 * scale
 
         # segundos
-        for digit in s_str:
-            d = DigitMatrix(digit, self.led_size, self.spacing)
-            d.draw(screen, (x, y), scale)
-            x += d.surface.get_width() * scale + 5
-
-    def draw(self, screen, pos=(50,50), scale=1.0):
-        """Dibuja marcador completo: SCORE1 TIME SCORE2"""
+        self._draw_digits(screen, s_str, (x, pos[1]), scale, 5, lit_only)
+
+    def draw(self, screen, pos=(50,50), scale=1.0, score=None, time_left=None, lit_only=False):
+        """
+        Dibuja marcador completo: SCORE1 TIME SCORE2
+        score/time_left permiten dibujar valores de un snapshot en vez del estado actual.
+        lit_only=True dibuja solo los LEDs encendidos (los apagados vienen de draw_static).
+        """
         x, y = pos
+        team1, team2 = score if score is not None else (self.team1_score, self.team2_score)
 
         # Equipo 1
-        self.draw_number(screen, self.team1_score, (x + 296, y + 20), scale*1.2)
+        self.draw_number(screen, team1, (x + 296, y + 20), scale*1.2, lit_only=lit_only)
 
         # Tiempo en el centro
-        self.draw_time(screen, (x + 386, y + 108), scale * 0.55)
+        self.draw_time(screen, (x + 386, y + 108), scale * 0.55, time_left, lit_only=lit_only)
 
         # Equipo 2
-        self.draw_number(screen, self.team2_score, (x + 480, y + 20), scale*1.2)
+        self.draw_number(screen, team2, (x + 480, y + 20), scale*1.2, lit_only=lit_only)
+
+    def draw_static(self, screen, pos=(50,50), scale=1.0):
+        """Dibuja solo la matriz de LEDs apagados (capa estática)."""
+        x, y = pos
+        self.draw_number(screen, None, (x + 296, y + 20), scale*1.2)
+        self.draw_time(screen, (x + 386, y + 108), scale * 0.55, blank=True)
+        self.draw_number(screen, None, (x + 480, y + 20), scale*1.2)
@@ -0,0 +1,50 @@
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Tiempos de arranque por fase (ms) desde t0 hasta el primer frame presentado.
+    mark() mide fases secuenciales del hilo principal; record() fases en segundo plano (red).
+    """
+    def __init__(self, t0=None, budget_ms=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.budget_ms = budget_ms
+        self.phases = {}
+        self.background = {}
+        self.first_frame_ms = None
+        self._last = self.t0
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def record(self, phase, ms):
+        with self._lock:
+            self.background[phase] = ms
+
+    def since_start_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    def first_frame(self):
+        """Llamar después del primer flip; avisa si se pasó del presupuesto."""
+        if self.first_frame_ms is not None:
+            return
+        self.mark("first_frame")
+        self.first_frame_ms = (self._last - self.t0) * 1000
+        parts = ", ".join(f"{k}={v:.0f}" for k, v in self.phases.items())
+        log.info("Primer frame en %.0f ms (%s)", self.first_frame_ms, parts, extra=self.summary())
+        if self.budget_ms is not None and self.first_frame_ms > self.budget_ms:
+            log.warning("Arranque fuera de presupuesto: %.0f ms > %.0f ms",
+                        self.first_frame_ms, self.budget_ms)
+
+    def summary(self):
+        with self._lock:
+            background = dict(self.background)
+        return {"first_frame_ms": self.first_frame_ms, "phases_ms": dict(self.phases),
+                "background_ms": background}
@@ -0,0 +1,116 @@
+"""
+Benchmark de arranque: tiempo hasta el primer frame, desglosado por fase.
+
+Cada corrida es un proceso nuevo (los imports solo se pueden medir en frío):
+imports → display → init → physics → assets → first_frame, más la homografía y la
+conexión al broker que corren en segundo plano.
+
+Uso (desde src/):
+    python startup_bench.py                    # 5 corridas (assets en paralelo si hay >1 núcleo)
+    python startup_bench.py --serial-assets    # carga secuencial, para comparar
+    python startup_bench.py --mqtt             # incluir la conexión real al broker
+    python startup_bench.py --budget-ms 800    # código 1 si la mediana supera el presupuesto
+"""
+import time
+T0 = time.perf_counter()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+def child(args):
+    """Una corrida: imprime un JSON con las fases en la última línea."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from startup import StartupTimer
+    from assets import ASSETS
+
+    startup = StartupTimer(T0)
+    startup.mark("imports")
+    if args.serial_assets:
+        ASSETS.workers = 0
+    elif args.workers is not None:
+        ASSETS.workers = args.workers
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    startup.mark("display")
+
+    game = Game(screen, use_mqtt=args.mqtt, latency_log=None, startup=startup)
+    game.draw()
+    game.present()
+
+    # Fases en segundo plano: esperar a que terminen para reportarlas
+    game.ingest.wait_ready(10)
+    if args.mqtt:
+        game.ingest.connected.wait(args.mqtt_timeout)
+    summary = startup.summary()
+    summary["ready_ms"] = startup.since_start_ms()
+    print(json.dumps(summary))
+    pygame.quit()
+
+
+def run(args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child"]
+    if args.serial_assets:
+        cmd.append("--serial-assets")
+    if args.mqtt:
+        cmd.append("--mqtt")
+    if args.workers is not None:
+        cmd += ["--workers", str(args.workers)]
+
+    runs = []
+    for i in range(args.runs):
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+
+    phases = list(runs[0]["phases_ms"])
+    background = sorted({k for r in runs for k in r["background_ms"]})
+    mode = "assets secuenciales" if args.serial_assets else f"hilos de assets: {args.workers or 'auto'}"
+    print(f"{args.runs} corridas ({mode}, {os.cpu_count()} núcleos)")
+    print(f"{'fase':<14}{'mediana':>10}{'min':>10}{'max':>10}")
+    for phase in phases:
+        values = [r["phases_ms"].get(phase, 0.0) for r in runs]
+        print(f"{phase:<14}{statistics.median(values):>8.1f}ms{min(values):>8.1f}ms{max(values):>8.1f}ms")
+    for phase in background:
+        values = [r["background_ms"][phase] for r in runs if phase in r["background_ms"]]
+        print(f"{phase + ' *':<14}{statistics.median(values):>8.1f}ms{min(values):>8.1f}ms{max(values):>8.1f}ms")
+    first = [r["first_frame_ms"] for r in runs]
+    median = statistics.median(first)
+    print(f"{'primer frame':<14}{median:>8.1f}ms{min(first):>8.1f}ms{max(first):>8.1f}ms")
+    print("* en segundo plano, medido desde que arranca el hilo de mocap")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "runs": runs}, f, indent=2)
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FALLA: primer frame {median:.1f} ms > {args.budget_ms:.1f} ms")
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque hasta el primer frame")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--serial-assets", action="store_true",
+                        help="decodificar las imágenes en el hilo principal")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="hilos para decodificar imágenes (por defecto según núcleos)")
+    parser.add_argument("--mqtt", action="store_true", help="conectarse al broker real")
+    parser.add_argument("--mqtt-timeout", type=float, default=5.0)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--save", metavar="RUTA", help="guardar las corridas en JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
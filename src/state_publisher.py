@@ -0,0 +1,248 @@
+"""
+Publicación del estado del juego para espectadores y controladores de robots.
+
+Formato binario de layout fijo (little endian), en vez de JSON:
+
+    cabecera   "AH" | versión u8 | flags u8 | seq u32 | t_ms u32 | jugadores u8
+    keyframe   goles1 u8 | goles2 u8 | tiempo u16 (décimas de s) | GameState u8 |
+               (x, y, vx, vy) i32 del puck y de cada jugador
+    delta      máscara u32 de campos cambiados | un i16 por campo cambiado (diferencia)
+
+Posiciones en 1/8 px y velocidades en 1/2 px/s. Un delta solo se puede aplicar sobre el
+mensaje anterior (seq - 1); si se pierde uno, el suscriptor espera al siguiente keyframe.
+
+Uso como espectador (desde src/):
+    python state_publisher.py --listen 192.168.50.200:1880
+"""
+import collections
+import logging
+import struct
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"AH"
+VERSION = 1
+FLAG_KEYFRAME = 1
+
+HEADER = struct.Struct("<2sBBIIB")
+META = struct.Struct("<BBHB")
+MASK = struct.Struct("<I")
+DELTA = struct.Struct("<h")
+
+POS_SCALE = 8        # 1/8 px
+VEL_SCALE = 2        # 1/2 px/s
+META_FIELDS = 4      # goles1, goles2, tiempo, estado
+TOPIC = "airhockey/state"
+
+
+def game_fields(game):
+    """Valores enteros (cuantizados) del estado visible del juego, en el orden del formato."""
+    board = game.scoreboard
+    values = [board.team1_score & 0xFF, board.team2_score & 0xFF,
+              min(0xFFFF, int(board.time_left * 10)), game.ui.state.value]
+    for body in [game.puck.body] + [p.body for p in game.players]:
+        x, y = body.position
+        vx, vy = body.velocity
+        values += (int(x * POS_SCALE), int(y * POS_SCALE), int(vx * VEL_SCALE), int(vy * VEL_SCALE))
+    return values
+
+
+class StateEncoder:
+    """Keyframe cada 'keyframe_every' mensajes (o si un delta no cabe); deltas entre medio."""
+    def __init__(self, n_players, keyframe_every=30):
+        self.n_players = n_players
+        self.n_fields = META_FIELDS + 4 * (n_players + 1)
+        self.keyframe_every = keyframe_every
+        self.body = struct.Struct(f"<{4 * (n_players + 1)}i")
+        self.seq = 0
+        self._previous = None
+        self._since_key = 0
+        # Los deltas usan una máscara de 32 bits: con más de 6 jugadores todo va como keyframe
+        self.deltas = self.n_fields <= 32
+
+    def force_keyframe(self):
+        self._previous = None
+
+    def encode(self, values, t_ms):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        previous = self._previous
+        self._previous = values
+        if previous is not None and self.deltas and self._since_key < self.keyframe_every:
+            changed = 0
+            parts = []
+            for i in range(self.n_fields):
+                diff = values[i] - previous[i]
+                if diff:
+                    if not -32768 <= diff <= 32767:
+                        break
+                    changed |= 1 << i
+                    parts.append(DELTA.pack(diff))
+            else:
+                self._since_key += 1
+                return b"".join([HEADER.pack(MAGIC, VERSION, 0, self.seq, t_ms, self.n_players),
+                                 MASK.pack(changed)] + parts)
+
+        self._since_key = 0
+        return (HEADER.pack(MAGIC, VERSION, FLAG_KEYFRAME, self.seq, t_ms, self.n_players)
+                + META.pack(*values[:META_FIELDS]) + self.body.pack(*values[META_FIELDS:]))
+
+
+class StateDecoder:
+    """Reconstruye el estado a partir de keyframes y deltas (para suscriptores)."""
+    def __init__(self):
+        self.values = None
+        self.seq = None
+        self.gaps = 0
+
+    def decode(self, payload):
+        """dict con el estado, o None si es un delta que no se puede aplicar (esperar keyframe)."""
+        magic, version, flags, seq, t_ms, n_players = HEADER.unpack_from(payload)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("mensaje de estado desconocido")
+        offset = HEADER.size
+        n_fields = META_FIELDS + 4 * (n_players + 1)
+
+        if flags & FLAG_KEYFRAME:
+            values = list(META.unpack_from(payload, offset))
+            values += struct.unpack_from(f"<{n_fields - META_FIELDS}i", payload, offset + META.size)
+        else:
+            if self.values is None or seq != (self.seq + 1) & 0xFFFFFFFF:
+                self.gaps += 1
+                self.values = None
+                return None
+            values = list(self.values)
+            (changed,) = MASK.unpack_from(payload, offset)
+            offset += MASK.size
+            for i in range(n_fields):
+                if changed >> i & 1:
+                    values[i] += DELTA.unpack_from(payload, offset)[0]
+                    offset += DELTA.size
+        self.values = values
+        self.seq = seq
+        return self.to_dict(values, n_players, seq, t_ms)
+
+    @staticmethod
+    def to_dict(values, n_players, seq, t_ms):
+        from ui_manager import GameState
+        kin = values[META_FIELDS:]
+        bodies = [{"pos": (kin[i] / POS_SCALE, kin[i + 1] / POS_SCALE),
+                   "vel": (kin[i + 2] / VEL_SCALE, kin[i + 3] / VEL_SCALE)}
+                  for i in range(0, len(kin), 4)]
+        return {"seq": seq, "t_ms": t_ms, "score": (values[0], values[1]),
+                "time_left": values[2] / 10, "state": GameState(values[3]).name,
+                "puck": bodies[0], "players": bodies[1:]}
+
+
+class StatePublisher:
+    """
+    Publica el estado a 'rate_hz' por MQTT sin bloquear nunca el loop del juego.
+    capture() (en el loop) solo codifica y agrega a una cola acotada; un hilo la vacía.
+    Si la cola está llena se descarta el mensaje más viejo y el siguiente sale como keyframe.
+    """
+    def __init__(self, game, broker="192.168.50.200", port=1880, topic=TOPIC, rate_hz=30,
+                 keyframe_every=30, queue_size=64, client=None):
+        self.game = game
+        self.topic = topic
+        self.period = 1.0 / rate_hz if rate_hz else 0.0
+        self.encoder = StateEncoder(len(game.players), keyframe_every)
+        self.queue = collections.deque(maxlen=queue_size)
+        self.broker = broker
+        self.port = port
+        self.client = client
+
+        # Contadores (los lee el benchmark / metrics)
+        self.captured = 0
+        self.sent = 0
+        self.sent_bytes = 0
+        self.dropped = 0
+
+        self._t0 = time.perf_counter()
+        self._next = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._sender, name="state-pub", daemon=True)
+
+    def start(self):
+        if self.client is None:
+            import paho.mqtt.client as mqtt
+            self.client = mqtt.Client()
+            self.client.max_queued_messages_set(self.queue.maxlen)
+            self.client.connect_async(self.broker, self.port, keepalive=60)
+            self.client.loop_start()
+        self.thread.start()
+        log.info("Publicando estado en %s:%s/%s", self.broker, self.port, self.topic)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self.thread.join(timeout=1.0)
+        if self.client is not None:
+            self.client.loop_stop()
+            self.client.disconnect()
+
+    # ------------------------------------------------------
+    def capture(self, now=None):
+        """Llamar una vez por frame/paso de simulación. Nunca bloquea."""
+        now = time.perf_counter() if now is None else now
+        if now < self._next:
+            return
+        self._next = now + self.period
+
+        if len(self.queue) == self.queue.maxlen:
+            # Se va a descartar el más viejo: los deltas siguientes no servirían
+            self.dropped += 1
+            self.encoder.force_keyframe()
+        t_ms = int((now - self._t0) * 1000) & 0xFFFFFFFF
+        self.queue.append(self.encoder.encode(game_fields(self.game), t_ms))
+        self.captured += 1
+        self._wake.set()
+
+    # ------------------------------------------------------
+    def _sender(self):
+        while not self._stop.is_set():
+            self._wake.wait(0.5)
+            self._wake.clear()
+            while True:
+                try:
+                    payload = self.queue.popleft()
+                except IndexError:
+                    break
+                info = self.client.publish(self.topic, payload, qos=0)
+                if info.rc != 0:
+                    # Sin conexión o cola de paho llena: perdido, el siguiente va como keyframe
+                    self.dropped += 1
+                    self.encoder.force_keyframe()
+                    continue
+                self.sent += 1
+                self.sent_bytes += len(payload)
+
+
+def main():
+    import argparse
+    import paho.mqtt.client as mqtt
+
+    parser = argparse.ArgumentParser(description="Espectador: imprime el estado publicado")
+    parser.add_argument("--listen", default="192.168.50.200:1880", metavar="HOST:PUERTO")
+    parser.add_argument("--topic", default=TOPIC)
+    args = parser.parse_args()
+    host, _, port = args.listen.partition(":")
+
+    decoder = StateDecoder()
+
+    def on_message(client, userdata, msg):
+        state = decoder.decode(msg.payload)
+        if state is not None:
+            print(state)
+
+    client = mqtt.Client()
+    client.on_connect = lambda c, u, f, rc: c.subscribe(args.topic)
+    client.on_message = on_message
+    client.connect(host, int(port or 1883), keepalive=60)
+    client.loop_forever()
+
+
+if __name__ == "__main__":
+    main()
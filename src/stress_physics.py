@@ -0,0 +1,350 @@
+"""
+Banco de estrés de la física: túneles, puck pegado, goles perdidos y ganancia de energía.
+
+Lanza miles de tiros aleatorios (los mismos para todas las configuraciones) a velocidades de
+hasta --max-factor veces Puck.max_speed contra cuatro blancos:
+
+    corner   las esquinas redondeadas
+    wall     los lados rectos, fuera de la boca de las porterías
+    goal     la boca de las porterías, sin nada en el camino: todos tienen que ser gol
+    mallet   un mazo que cruza el camino del puck a toda velocidad
+
+Cada configuración (perfil de física x subpasos x modo de paredes) corre en Games sin ventana y
+los tiros se reparten en un pool de procesos. Por configuración se informa:
+
+    túnel      el puck terminó fuera del rink
+    pegado     quieto contra una pared STICK_FRAMES frames seguidos (wall_modes.py)
+    gol perd.  tiros a la boca que no terminaron en gol
+    energía    tiros sin mazo en los que la rapidez creció más de ENERGY_TOLERANCE (y el máximo)
+    CPU        ms de CPU de Game.update por segundo simulado (process_time en cada worker)
+
+--save guarda los resultados; --compare sale con código 1 si alguna configuración tiene más
+túneles, puck pegado, goles perdidos o tiros con ganancia de energía que en el baseline, para
+que cada optimización de Game.update, Puck o Rink venga con la prueba de que no perdió precisión.
+
+Uso (desde src/):
+    python stress_physics.py
+    python stress_physics.py --shots 4000 --substeps 1,2,4,8,15 --walls python,solver
+    python stress_physics.py --profiles projector-60fps,projector-light --save stress.json
+    python stress_physics.py --compare stress.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from input_providers import InputProvider, InputSample
+from physics_profiles import DEFAULT_PROFILE, get_profile
+from wall_modes import CONTACT_BAND, STICK_FRAMES, STICK_SPEED, outside_rink, wall_distance
+
+CATEGORIES = ("corner", "wall", "goal", "mallet")
+ENERGY_TOLERANCE = 0.01     # 1 % más rápido que al salir (o que max_speed) ya es ganancia
+CHUNK = 100                 # tiros por tarea del pool
+METRICS = ("escapes", "stuck", "missed_goals", "energy_gain")   # las que --compare vigila
+
+
+class ScriptedMallet(InputProvider):
+    """Objetivo fijado por el banco en cada frame; Player.path lleva el mazo hasta él en el frame."""
+    name = "script"
+
+    def set(self, x, y):
+        self._latest = InputSample(x, y, 0.0)    # siempre "vieja": se interpola en todo el frame
+
+
+# ------------------------------------------------------
+# TIROS
+# ------------------------------------------------------
+def make_shots(rink, goals, n, seed, max_speed, max_factor):
+    """
+    Tiros reproducibles repartidos entre las categorías: (categoría, x, y, vx, vy, mazo), con
+    mazo = (x0, y0, x1, y1, rapidez) solo para "mallet".
+    """
+    rng = random.Random(seed)
+    rect, r = rink.rect, rink.corner_radius
+    cx, cy = rect.center
+    left, right = goals
+    mouth = (left.top, left.bottom)
+    shots = []
+    for i in range(n):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        speed = rng.uniform(0.5, max_factor) * max_speed
+        mallet = None
+        x, y = cx + rng.uniform(-500, 500), cy + rng.uniform(-250, 250)
+        if category == "corner":
+            ox, oy, a0 = rng.choice(((rect.left + r, rect.top + r, math.pi),
+                                     (rect.right - r, rect.top + r, 1.5 * math.pi),
+                                     (rect.right - r, rect.bottom - r, 0.0),
+                                     (rect.left + r, rect.bottom - r, 0.5 * math.pi)))
+            angle = a0 + rng.uniform(0.1, 0.5 * math.pi - 0.1)
+            tx, ty = ox + r * math.cos(angle), oy + r * math.sin(angle)
+        elif category == "wall":
+            if rng.random() < 0.7:
+                tx = rng.uniform(rect.left + r, rect.right - r)
+                ty = rng.choice((rect.top, rect.bottom))
+            else:
+                # Lados izquierdo/derecho, por encima o por debajo de la boca de la portería
+                tx = rng.choice((rect.left, rect.right))
+                ty = rng.choice((rng.uniform(rect.top + r, mouth[0] - 40),
+                                 rng.uniform(mouth[1] + 40, rect.bottom - r)))
+        elif category == "goal":
+            goal = rng.choice(goals)
+            tx = goal.right if goal is left else goal.left
+            ty = rng.uniform(mouth[0] + 5, mouth[1] - 5)
+            x = tx + rng.uniform(250, 700) * (1 if goal is left else -1)
+        else:
+            # Puck casi quieto en la mitad izquierda y el mazo del equipo 1 cruzándolo
+            x, y = rect.left + rng.uniform(250, 700), cy + rng.uniform(-200, 200)
+            angle = rng.uniform(0, 2 * math.pi)
+            ux, uy = math.cos(angle), math.sin(angle)
+            mallet = (x - 120 * ux, y - 120 * uy, x + 250 * ux, y + 250 * uy, speed)
+            drift = rng.uniform(0, 200)
+            angle = rng.uniform(0, 2 * math.pi)
+            shots.append((category, x, y, drift * math.cos(angle), drift * math.sin(angle), mallet))
+            continue
+        angle = math.atan2(ty - y, tx - x)
+        shots.append((category, x, y, speed * math.cos(angle), speed * math.sin(angle), mallet))
+    return shots
+
+
+# ------------------------------------------------------
+# WORKERS
+# ------------------------------------------------------
+_games = {}
+
+
+def _init_worker():
+    pygame.init()
+    pygame.display.set_mode((1920, 1080))
+
+
+def make_game(profile, walls, with_mallet):
+    from game import Game
+    from input_providers import MouseProvider
+    game = Game(pygame.display.get_surface(), use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[MouseProvider(), MouseProvider()], walls=walls, physics=profile)
+    # Solo el mazo del equipo 1 en los tiros "mallet"; ninguno en los demás
+    keep = game.players[:1] if with_mallet else []
+    for player in game.players[len(keep):]:
+        game.space.remove(player.body, player.shape)
+    game.players = keep
+    for player in keep:
+        player.input = ScriptedMallet()
+    return game
+
+
+def config_profile(config):
+    profile, substeps, walls = config
+    profile = get_profile(profile)
+    if substeps:
+        profile = profile._replace(name=f"{profile.name}/{substeps}", min_substeps=substeps,
+                                   max_substeps=substeps)
+    return profile
+
+
+def run_chunk(config, shots, frames, dt):
+    """Corre unos tiros con una configuración; devuelve contadores parciales."""
+    from ui_manager import GameState
+    totals = {"shots": 0, "escapes": 0, "stuck": 0, "goal_shots": 0, "missed_goals": 0,
+              "energy_gain": 0, "energy_gain_max": 0.0, "cpu_s": 0.0, "sim_s": 0.0}
+    for shot in shots:
+        category, x, y, vx, vy, mallet = shot
+        key = (config, mallet is not None)
+        game = _games.get(key)
+        if game is None:
+            game = _games[key] = make_game(config_profile(config), config[2], mallet is not None)
+        puck = game.puck
+        rink = game.rink
+        contact = puck.radius + CONTACT_BAND
+
+        game.pending_goal_team = None
+        game.sensor_hit = None
+        game.physics_time = None
+        puck.body.position = (x, y)
+        puck.body.velocity = (vx, vy)
+        puck.body.angular_velocity = 0
+        puck.body.activate()
+        if mallet is not None:
+            mx0, my0, mx1, my1, mallet_speed = mallet
+            player = game.players[0]
+            player.body.position = (mx0, my0)
+            player.body.velocity = (0, 0)
+            length = math.hypot(mx1 - mx0, my1 - my0)
+            travel = 0.0
+
+        reference = min(math.hypot(vx, vy), puck.max_speed)
+        gain = 0.0
+        touching = 0
+        escaped = stuck = scored = False
+        frames_run = 0
+        cpu = time.process_time()
+        for _ in range(frames):
+            game.ui.state = GameState.RUNNING
+            game.ui.timer = 120
+            if mallet is not None:
+                travel = min(length, travel + mallet_speed * dt)
+                u = travel / length
+                player.input.set(mx0 + (mx1 - mx0) * u, my0 + (my1 - my0) * u)
+            game.update(dt)
+            frames_run += 1
+
+            if game.pending_goal_team is not None:
+                scored = True
+                break
+            px, py = puck.body.position
+            if outside_rink(rink, px, py):
+                escaped = True
+                break
+            pvx, pvy = puck.body.velocity
+            speed = math.hypot(pvx, pvy)
+            if mallet is None and speed > reference:
+                gain = max(gain, speed / reference - 1)
+            if speed < STICK_SPEED and wall_distance(rink, px, py) < contact:
+                touching += 1
+                if touching == STICK_FRAMES:
+                    stuck = True
+            else:
+                touching = 0
+        totals["cpu_s"] += time.process_time() - cpu
+        totals["sim_s"] += frames_run * dt
+
+        totals["shots"] += 1
+        totals["escapes"] += escaped
+        totals["stuck"] += stuck
+        if category == "goal":
+            totals["goal_shots"] += 1
+            totals["missed_goals"] += not scored
+        if gain > ENERGY_TOLERANCE:
+            totals["energy_gain"] += 1
+        totals["energy_gain_max"] = max(totals["energy_gain_max"], gain)
+    return config, totals
+
+
+# ------------------------------------------------------
+def run_all(configs, shots, frames, dt, workers):
+    results = {config: None for config in configs}
+    tasks = [(config, shots[i:i + CHUNK]) for config in configs
+             for i in range(0, len(shots), CHUNK)]
+    # spawn: cada worker arma sus propios Games (pygame y pymunk no se heredan)
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker) as pool:
+        futures = [pool.submit(run_chunk, config, chunk, frames, dt) for config, chunk in tasks]
+        for future in futures:
+            config, part = future.result()
+            total = results[config]
+            if total is None:
+                results[config] = part
+                continue
+            for name, value in part.items():
+                total[name] = max(total[name], value) if name == "energy_gain_max" \
+                    else total[name] + value
+    return results
+
+
+def config_name(config):
+    profile, substeps, walls = config
+    return f"{profile}/{substeps or 'auto'}/{walls}"
+
+
+def compare(results, baseline):
+    """Configuraciones que empeoraron en alguna métrica de METRICS contra el baseline."""
+    regressions = []
+    print(f"\nComparación contra {baseline['env'].get('commit') or 'baseline'}:")
+    for name, r in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"  {name:<32} (nueva)")
+            continue
+        worse = [m for m in METRICS if r[m] > base[m]]
+        changes = ", ".join(f"{m} {base[m]} → {r[m]}" for m in METRICS if r[m] != base[m])
+        print(f"  {name:<32} {changes or 'igual'}{'  <-- REGRESIÓN' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    from benchmark import environment
+    parser = argparse.ArgumentParser(description="Estrés de la física: túneles, goles y energía")
+    parser.add_argument("--shots", type=int, default=2000, help="tiros por configuración")
+    parser.add_argument("--frames", type=int, default=180, help="frames máximos por tiro")
+    parser.add_argument("--stall", type=float, default=0.0,
+                        help="dt de los frames en segundos (0 = 1/60; p. ej. 0.05 simula 20 fps)")
+    parser.add_argument("--profiles", default=DEFAULT_PROFILE,
+                        help="perfiles de física separados por coma")
+    parser.add_argument("--substeps", default="auto",
+                        help="subpasos fijos a probar, separados por coma ('auto' = los del perfil)")
+    parser.add_argument("--walls", default="python", help="modos de paredes: python,solver")
+    parser.add_argument("--max-factor", type=float, default=1.5,
+                        help="rapidez máxima de los tiros en veces Puck.max_speed")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (default: núcleos)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", metavar="JSON", help="guardar resultados como baseline")
+    parser.add_argument("--compare", metavar="JSON", help="comparar contra un baseline")
+    args = parser.parse_args()
+
+    dt = args.stall or 1 / 60
+    substeps = [0 if s.strip() == "auto" else int(s) for s in args.substeps.split(",")]
+    configs = [(p.strip(), n, w.strip()) for p in args.profiles.split(",")
+               for n in substeps for w in args.walls.split(",")]
+    for profile, _, walls in configs:
+        get_profile(profile)
+        if walls not in ("python", "solver"):
+            parser.error(f"modo de paredes desconocido: {walls}")
+
+    # Geometría para generar los tiros (la misma que ven los workers)
+    _init_worker()
+    from game import Game
+    from input_providers import MouseProvider
+    game = Game(pygame.display.get_surface(), use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[MouseProvider(), MouseProvider()])
+    shots = make_shots(game.rink, (game.goal1, game.goal2), args.shots, args.seed,
+                       game.puck.max_speed, args.max_factor)
+    pygame.quit()
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{args.shots} tiros x {len(configs)} configuraciones, hasta {args.frames} frames de "
+          f"{dt * 1000:.1f} ms, hasta {args.max_factor:g}x max_speed, {workers} procesos")
+    start = time.perf_counter()
+    raw = run_all(configs, shots, args.frames, dt, workers)
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    print(f"{'configuración':<32}{'túnel':>7}{'pegado':>8}{'gol perd.':>11}{'energía':>9}"
+          f"{'máx %':>8}{'CPU ms/s':>10}")
+    for config in configs:
+        r = raw[config]
+        name = config_name(config)
+        cpu_ms = r["cpu_s"] / r["sim_s"] * 1000 if r["sim_s"] else 0.0
+        results[name] = {**{m: r[m] for m in METRICS}, "shots": r["shots"],
+                         "goal_shots": r["goal_shots"],
+                         "energy_gain_max": r["energy_gain_max"], "cpu_ms_per_sim_s": cpu_ms}
+        print(f"{name:<32}{r['escapes']:>7}{r['stuck']:>8}"
+              f"{r['missed_goals']:>6}/{r['goal_shots']:<4}{r['energy_gain']:>9}"
+              f"{r['energy_gain_max'] * 100:>8.1f}{cpu_ms:>10.1f}")
+    print(f"{elapsed:.1f} s en total")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"env": environment(), "shots": args.shots, "seed": args.seed,
+                       "dt": dt, "results": results}, f, indent=2)
+        print(f"\nBaseline guardado en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
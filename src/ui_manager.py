@@ -1,6 +1,10 @@
 import pygame
 from enum import Enum
 import math
+import logging
+from assets import ASSETS
+
+log = logging.getLogger(__name__)
 
 class GameState(Enum):
     RUNNING = 0
@@ -31,12 +35,10 @@ class UIManager:
         }.items():
             try:
                 path = f"../assets/{filename}"
-                self.warning_images[key] = pygame.transform.scale(
-                    pygame.image.load(path).convert_alpha(),
-                    (int(screen.get_width() * 0.4), int(screen.get_height() * 0.5))
-                )
+                self.warning_images[key] = ASSETS.image(
+                    path, (int(screen.get_width() * 0.4), int(screen.get_height() * 0.5)), alpha=True)
             except Exception as e:
-                print(f"[WARN] No se pudo cargar {filename}: {e}")
+                log.warning("No se pudo cargar %s: %s", filename, e)
                 self.warning_images[key] = None
 
 
@@ -44,11 +46,15 @@ class UIManager:
         self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
         self.overlay.fill((0, 0, 0, 150))  # RGBA con alpha = 150 (transparencia media)
 
+        # Caches para no crear superficies en cada frame
+        self._overlays = {}   # alpha -> Surface
+        self._texts = {}      # (texto, fuente, color) -> Surface
+
     # ------------------------------------------------------
     def set_warning(self, warning_type: str):
         """Activa una advertencia específica: 'center', 'player1', 'player2'."""
         if warning_type not in ("center", "player1", "player2"):
-            print(f"Tipo de advertencia inválido: {warning_type}")
+            log.warning("Tipo de advertencia inválido: %s", warning_type)
             return
         
         #if self.warning_type == "center" and warning_type != "center":
@@ -94,14 +100,23 @@ class UIManager:
     # ------------------------------------------------------
     def draw_overlay(self, alpha=180):
         """Dibuja un overlay semitransparente sobre la pantalla."""
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, alpha))  # alfa controla la opacidad
+        overlay = self._overlays.get(alpha)
+        if overlay is None or overlay.get_size() != self.screen.get_size():
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))  # alfa controla la opacidad
+            self._overlays[alpha] = overlay
         self.screen.blit(overlay, (0, 0))
 
     # ------------------------------------------------------
     def draw_center_text(self, text, font, color=(255, 255, 255)):
         """Dibuja texto centrado en la pantalla."""
-        surf = font.render(text, True, color)
+        key = (text, id(font), tuple(color))
+        surf = self._texts.get(key)
+        if surf is None:
+            if len(self._texts) > 512:   # p. ej. el fundido de READY? genera un color por frame
+                self._texts.clear()
+            surf = font.render(text, True, color)
+            self._texts[key] = surf
         rect = surf.get_rect(center=self.screen.get_rect().center)
         self.screen.blit(surf, rect)
 
@@ -116,37 +131,58 @@ class UIManager:
         self.screen.blit(surf, rect)
 
     # ------------------------------------------------------
-    def draw(self, continue_timer=0):
-        """Dibuja overlays y mensajes según el estado del juego."""
-        if self.state == GameState.PAUSED:
-            self.draw_overlay()
+    def draw(self, continue_timer=0, state=None, result_text=None,
+             warning_active=None, warning_type=None):
+        """
+        Dibuja overlays y mensajes según el estado del juego.
+        Los parámetros opcionales permiten dibujar desde un snapshot (modo pipelined).
+        """
+        state = self.state if state is None else state
+        result_text = self.result_text if result_text is None else result_text
+        warning_active = self.warning_active if warning_active is None else warning_active
+        warning_type = self.warning_type if warning_type is None else warning_type
+
+        self.draw_static(state, warning_active, warning_type)
+        text = self.label(continue_timer, state, result_text)
+        if text:
+            self.draw_center_text(text, self.font)
+
+    # ------------------------------------------------------
+    def label(self, continue_timer=0, state=None, result_text=None):
+        """Texto central visible en este instante (los parpadeos son la única animación)."""
+        state = self.state if state is None else state
+        result_text = self.result_text if result_text is None else result_text
+
+        if state == GameState.PAUSED:
             # --- Efecto de parpadeo para 'PAUSED' ---
             blink_speed = 2.5  # ciclos por segundo
             blink = (math.sin(pygame.time.get_ticks() * 0.005 * blink_speed) + 1) / 2
-            if blink > 0.5:
-                self.draw_center_text("PAUSED", self.font)
+            return "PAUSED" if blink > 0.5 else None
 
-        elif self.state == GameState.FINISHED:
-            self.draw_overlay()
-
-            if continue_timer > 3 and self.result_text != "GAME OVER":
+        if state == GameState.FINISHED:
+            if continue_timer > 3 and result_text != "GAME OVER":
                 # --- Efecto de parpadeo para 'CONTINUE?' ---
                 blink_speed = 3  # ciclos por segundo
                 alpha = (math.sin(continue_timer * blink_speed * math.pi) + 1) / 2  # entre 0 y 1
+                return "CONTINUE?" if alpha > 0.5 else None
+            # Mostrar resultado o Game Over normalmente
+            return result_text or "GAME OVER"
+        return None
 
-                if alpha > 0.5:
-                    self.draw_center_text("CONTINUE?", self.font)
-            else:
-                # Mostrar resultado o Game Over normalmente
-                if self.result_text:
-                    self.draw_center_text(self.result_text, self.font)
-                else:
-                    self.draw_center_text("GAME OVER", self.font)
+    # ------------------------------------------------------
+    def draw_static(self, state=None, warning_active=None, warning_type=None):
+        """Overlay e imágenes del estado, sin el texto que parpadea."""
+        state = self.state if state is None else state
+        warning_active = self.warning_active if warning_active is None else warning_active
+        warning_type = self.warning_type if warning_type is None else warning_type
+
+        if state in (GameState.PAUSED, GameState.FINISHED):
+            self.draw_overlay()
 
-        elif self.state == GameState.RESET_WARNING and self.warning_active:
+        elif state == GameState.RESET_WARNING and warning_active:
             # print(f"[UI] Mostrando warning: {self.warning_type}")
             self.draw_overlay()
-            image = self.warning_images.get(self.warning_type)
+            image = self.warning_images.get(warning_type)
             if image:
                 img_rect = image.get_rect(center=self.screen.get_rect().center)
                 self.screen.blit(image, img_rect)
@@ -0,0 +1,140 @@
+"""
+Comparación de los dos modos de paredes del puck (Game(walls=...)):
+
+    python  pymunk ignora el contacto y Puck.keep_inside_rink refleja una vez por frame
+    solver  pymunk resuelve el contacto en cada subpaso; keep_inside_rink es solo respaldo
+
+Para cada modo se lanzan los mismos tiros aleatorios (misma semilla) y se mide el costo de
+Game.update, cuántas veces el puck quedó fuera del rink (túnel), cuántas veces quedó pegado a
+una pared (quieto y tocándola) y cuántas correcciones hizo keep_inside_rink. --stall simula frames lentos.
+
+Uso (desde src/):
+    python wall_modes.py
+    python wall_modes.py --shots 400 --stall 0.05
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+import pygame
+
+STICK_FRAMES = 30        # quieto contra una pared más de esto (0.5 s) = pegado
+STICK_SPEED = 50.0       # px/s: más rápido que esto es deslizarse por la pared, no estar pegado
+CONTACT_BAND = 2.0       # px más allá de la distancia de contacto que cuentan como "tocando"
+
+
+def outside_rink(rink, x, y):
+    """True si el centro del puck quedó fuera del contorno del rink (rect con esquinas redondas)."""
+    rect, r = rink.rect, rink.corner_radius
+    if not rect.collidepoint(x, y):
+        return True
+    cx = rect.left + r if x < rect.left + r else rect.right - r if x > rect.right - r else None
+    cy = rect.top + r if y < rect.top + r else rect.bottom - r if y > rect.bottom - r else None
+    return cx is not None and cy is not None and math.hypot(x - cx, y - cy) > r
+
+
+def wall_distance(rink, x, y):
+    """Distancia del centro del puck al muro más cercano (descontando el grosor)."""
+    best = float("inf")
+    for ax, ay, abx, aby, inv_ab_len2, wall_radius in rink.segments:
+        t = min(1.0, max(0.0, ((x - ax) * abx + (y - ay) * aby) * inv_ab_len2))
+        best = min(best, math.hypot(x - ax - abx * t, y - ay - aby * t) - wall_radius)
+    return best
+
+
+def run_mode(game, mode, shots, frames_per_shot, dt, seed):
+    from ui_manager import GameState
+    game.set_wall_mode(mode)
+    rng = random.Random(seed)
+    rink = game.rink
+    puck = game.puck
+    contact = puck.radius + CONTACT_BAND
+
+    update_ms = []
+    escapes = stuck = touching = 0
+    puck.corrections = 0
+    for _ in range(shots):
+        game.ui.timer = 120          # que el reloj del partido no llegue a FINISHED
+        game.ui.state = GameState.RUNNING
+        game.pending_goal_team = None
+        # Tiro desde cerca del centro hacia una dirección cualquiera, a velocidad alta
+        puck.body.position = (rink.rect.centerx + rng.uniform(-300, 300),
+                              rink.rect.centery + rng.uniform(-200, 200))
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(400, puck.max_speed)
+        puck.body.velocity = (speed * math.cos(angle), speed * math.sin(angle))
+        puck.body.angular_velocity = 0
+
+        escaped = False
+        for _ in range(frames_per_shot):
+            game.ui.state = GameState.RUNNING
+            game.pending_goal_team = None
+            t = time.perf_counter()
+            game.update(dt)
+            update_ms.append((time.perf_counter() - t) * 1000)
+
+            x, y = puck.body.position
+            if outside_rink(rink, x, y):
+                escaped = True
+                break
+            vx, vy = puck.body.velocity
+            if math.hypot(vx, vy) < STICK_SPEED and wall_distance(rink, x, y) < contact:
+                touching += 1
+                if touching == STICK_FRAMES:
+                    stuck += 1
+            else:
+                touching = 0
+        escapes += escaped
+        touching = 0
+
+    update_ms.sort()
+    return {
+        "mode": mode,
+        "update_ms_mean": statistics.fmean(update_ms),
+        "update_ms_p99": update_ms[int(len(update_ms) * 0.99)],
+        "escapes": escapes,
+        "stuck": stuck,
+        "corrections": puck.corrections,
+        "frames": len(update_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paredes en Python vs en el solver de pymunk")
+    parser.add_argument("--shots", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=90, help="frames por tiro")
+    parser.add_argument("--stall", type=float, default=0.0,
+                        help="dt de los frames en segundos (0 = 1/60; p. ej. 0.05 simula 20 fps)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    from game import Game
+    from input_providers import MouseProvider
+    # Solo paredes y puck: los jugadores salen del espacio
+    game = Game(screen, use_mqtt=False, latency_log=None, gc_control=False,
+                inputs=[MouseProvider(), MouseProvider()])
+    for player in game.players:
+        game.space.remove(player.body, player.shape)
+    game.players = []
+    dt = args.stall or 1 / 60
+
+    print(f"{args.shots} tiros x {args.frames} frames, dt {dt * 1000:.1f} ms, "
+          f"{game.substeps} subpasos")
+    print(f"{'modo':<8}{'update ms':>11}{'p99':>8}{'túnel':>8}{'pegado':>8}{'correcc.':>10}")
+    for mode in ("python", "solver"):
+        r = run_mode(game, mode, args.shots, args.frames, dt, args.seed)
+        print(f"{r['mode']:<8}{r['update_ms_mean']:>11.3f}{r['update_ms_p99']:>8.3f}"
+              f"{r['escapes']:>8}{r['stuck']:>8}{r['corrections']:>10}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()